@@ -0,0 +1,380 @@
+import math
+from collections import Counter, deque
+from difflib import SequenceMatcher
+from functools import lru_cache
+from typing import Dict, List, Optional, Set
+
+from core.utils import stable_hash
+from core.lazy import lazy_import
+
+np = lazy_import('numpy')
+spacy = lazy_import('spacy')
+sklearn_text = lazy_import('sklearn.feature_extraction.text')
+sklearn_decomposition = lazy_import('sklearn.decomposition')
+sklearn_pairwise = lazy_import('sklearn.metrics.pairwise')
+
+
+def _ngrams(tokens: List[str], n: int) -> Set[tuple]:
+    if len(tokens) < n:
+        return {tuple(tokens)} if tokens else set()
+    return {tuple(tokens[i:i + n]) for i in range(len(tokens) - n + 1)}
+
+
+def _cosine(vec_a: Dict[str, float], vec_b: Dict[str, float]) -> float:
+    if not vec_a or not vec_b:
+        return 0.0
+    if len(vec_a) > len(vec_b):
+        vec_a, vec_b = vec_b, vec_a
+    dot = sum(weight * vec_b.get(term, 0.0) for term, weight in vec_a.items())
+    norm_a = math.sqrt(sum(w * w for w in vec_a.values()))
+    norm_b = math.sqrt(sum(w * w for w in vec_b.values()))
+    if norm_a == 0 or norm_b == 0:
+        return 0.0
+    return dot / (norm_a * norm_b)
+
+
+def cosine_count(tokens_a: List[str], tokens_b: List[str]) -> float:
+    return round(_cosine(Counter(tokens_a), Counter(tokens_b)) * 100, 2)
+
+
+def cosine_tfidf(tokens_a: List[str], tokens_b: List[str],
+                 idf: Optional[Dict[str, float]] = None) -> float:
+    tf_a, tf_b = Counter(tokens_a), Counter(tokens_b)
+    if idf is None:
+        idf = {}
+        for term in set(tf_a) | set(tf_b):
+            df = (term in tf_a) + (term in tf_b)
+            idf[term] = math.log((1 + 2) / (1 + df)) + 1
+    vec_a = {term: count * idf.get(term, 1.0) for term, count in tf_a.items()}
+    vec_b = {term: count * idf.get(term, 1.0) for term, count in tf_b.items()}
+    return round(_cosine(vec_a, vec_b) * 100, 2)
+
+
+def jaccard(tokens_a: List[str], tokens_b: List[str]) -> float:
+    set_a, set_b = set(tokens_a), set(tokens_b)
+    union = set_a | set_b
+    if not union:
+        return 0.0
+    return round(len(set_a & set_b) / len(union) * 100, 2)
+
+
+def overlap(tokens_a: List[str], tokens_b: List[str]) -> float:
+    set_a, set_b = set(tokens_a), set(tokens_b)
+    smaller = min(len(set_a), len(set_b))
+    if smaller == 0:
+        return 0.0
+    return round(len(set_a & set_b) / smaller * 100, 2)
+
+
+def dice(tokens_a: List[str], tokens_b: List[str]) -> float:
+    set_a, set_b = set(tokens_a), set(tokens_b)
+    total = len(set_a) + len(set_b)
+    if total == 0:
+        return 0.0
+    return round(2 * len(set_a & set_b) / total * 100, 2)
+
+
+def ngram_similarity(tokens_a: List[str], tokens_b: List[str], n: int = 3) -> float:
+    grams_a = _ngrams(tokens_a, n)
+    if not grams_a:
+        return 0.0
+    grams_b = _ngrams(tokens_b, n)
+    return round(len(grams_a & grams_b) / len(grams_a) * 100, 2)
+
+
+class SuffixAutomaton:
+    def __init__(self, tokens: List[str]):
+        self.vocab: Dict[str, int] = {}
+        self.transitions: List[Dict[int, int]] = [{}]
+        self.links = [-1]
+        self.lengths = [0]
+        self.first_end = [-1]
+        last = 0
+        for position, token in enumerate(tokens):
+            symbol = self.vocab.setdefault(token, len(self.vocab))
+            last = self._extend(last, symbol, position)
+
+    def _new_state(self, length: int, first_end: int, link: int = 0,
+                   transitions: Optional[Dict[int, int]] = None) -> int:
+        self.transitions.append(transitions if transitions is not None else {})
+        self.links.append(link)
+        self.lengths.append(length)
+        self.first_end.append(first_end)
+        return len(self.lengths) - 1
+
+    def _extend(self, last: int, symbol: int, position: int) -> int:
+        current = self._new_state(self.lengths[last] + 1, position)
+        state = last
+        while state != -1 and symbol not in self.transitions[state]:
+            self.transitions[state][symbol] = current
+            state = self.links[state]
+        if state == -1:
+            return current
+
+        target = self.transitions[state][symbol]
+        if self.lengths[state] + 1 == self.lengths[target]:
+            self.links[current] = target
+            return current
+
+        clone = self._new_state(self.lengths[state] + 1, self.first_end[target],
+                                self.links[target], dict(self.transitions[target]))
+        while state != -1 and self.transitions[state].get(symbol) == target:
+            self.transitions[state][symbol] = clone
+            state = self.links[state]
+        self.links[target] = clone
+        self.links[current] = clone
+        return current
+
+    def maximal_matches(self, tokens_b: List[str], min_length: int = 3) -> List[tuple]:
+        matches = []
+        state, length = 0, 0
+        previous = (0, 0)
+        for position, token in enumerate(tokens_b):
+            symbol = self.vocab.get(token)
+            if symbol is None:
+                state, length = 0, 0
+            else:
+                while state and symbol not in self.transitions[state]:
+                    state = self.links[state]
+                    length = self.lengths[state]
+                if symbol in self.transitions[state]:
+                    state = self.transitions[state][symbol]
+                    length += 1
+                else:
+                    state, length = 0, 0
+            prev_length, prev_state = previous
+            if prev_length >= min_length and length != prev_length + 1:
+                matches.append((self.first_end[prev_state] - prev_length + 1,
+                                position - prev_length, prev_length))
+            previous = (length, state)
+        prev_length, prev_state = previous
+        if prev_length >= min_length:
+            matches.append((self.first_end[prev_state] - prev_length + 1,
+                            len(tokens_b) - prev_length, prev_length))
+        return matches
+
+
+def find_matching_sequences(tokens_a: List[str], tokens_b: List[str], min_length: int = 3,
+                            automaton: Optional[SuffixAutomaton] = None) -> List[Dict]:
+    if automaton is None:
+        automaton = SuffixAutomaton(tokens_a)
+    sequences = [{
+        'text': ' '.join(tokens_a[position_a:position_a + length]),
+        'length': length,
+        'position_a': position_a,
+        'position_b': position_b
+    } for position_a, position_b, length in automaton.maximal_matches(tokens_b, min_length)]
+    sequences.sort(key=lambda seq: seq['length'], reverse=True)
+    return sequences
+
+
+def find_matching_sequences_difflib(tokens_a: List[str], tokens_b: List[str],
+                                    min_length: int = 3) -> List[Dict]:
+    matcher = SequenceMatcher(None, tokens_a, tokens_b, autojunk=False)
+    sequences = []
+    for block in matcher.get_matching_blocks():
+        if block.size >= min_length:
+            sequences.append({
+                'text': ' '.join(tokens_a[block.a:block.a + block.size]),
+                'length': block.size,
+                'position_a': block.a,
+                'position_b': block.b
+            })
+    sequences.sort(key=lambda seq: seq['length'], reverse=True)
+    return sequences
+
+
+def sequence_similarity(tokens_a: List[str], sequences: List[Dict]) -> float:
+    if not tokens_a:
+        return 0.0
+    covered = set()
+    for seq in sequences:
+        covered.update(range(seq['position_a'], seq['position_a'] + seq['length']))
+    return round(len(covered) / len(tokens_a) * 100, 2)
+
+
+def character_ngram_cosine(text_a: str, text_b: str, n: int = 4) -> float:
+    text_a, text_b = text_a.lower(), text_b.lower()
+    grams_a = Counter(text_a[i:i + n] for i in range(max(len(text_a) - n + 1, 0)))
+    grams_b = Counter(text_b[i:i + n] for i in range(max(len(text_b) - n + 1, 0)))
+    return round(_cosine(grams_a, grams_b) * 100, 2)
+
+
+def lsi_similarities(query_text: str, reference_texts: List[str],
+                     n_components: int = 100) -> List[float]:
+    if not reference_texts:
+        return []
+    try:
+        TfidfVectorizer = sklearn_text.TfidfVectorizer
+        TruncatedSVD = sklearn_decomposition.TruncatedSVD
+        cosine_similarity = sklearn_pairwise.cosine_similarity
+    except ImportError:
+        return [0.0] * len(reference_texts)
+
+    matrix = TfidfVectorizer().fit_transform([query_text] + reference_texts)
+    components = min(n_components, matrix.shape[0] - 1, matrix.shape[1] - 1)
+    if components < 1:
+        return [0.0] * len(reference_texts)
+    reduced = TruncatedSVD(n_components=components, random_state=42).fit_transform(matrix)
+    scores = cosine_similarity(reduced[0:1], reduced[1:])[0]
+    return [round(max(float(score), 0.0) * 100, 2) for score in scores]
+
+
+_SPACY_MODEL = None
+
+
+def semantic_similarity(text_a: str, text_b: str) -> float:
+    global _SPACY_MODEL
+    if _SPACY_MODEL is None:
+        try:
+            _SPACY_MODEL = spacy.load('en_core_web_md')
+        except Exception:
+            _SPACY_MODEL = False
+    if _SPACY_MODEL:
+        doc_a, doc_b = _SPACY_MODEL(text_a), _SPACY_MODEL(text_b)
+        if doc_a.vector_norm and doc_b.vector_norm:
+            return round(max(doc_a.similarity(doc_b), 0.0) * 100, 2)
+    return character_ngram_cosine(text_a, text_b)
+
+
+EMBEDDING_DIMENSIONS = 256
+
+
+@lru_cache(maxsize=1 << 16)
+def _embedding_feature(feature: str, dimensions: int) -> tuple:
+    value = stable_hash(feature)
+    return value % dimensions, 1.0 if value & (1 << 32) else -1.0
+
+
+def hashing_embeddings(token_lists: List[List[str]], dimensions: int = EMBEDDING_DIMENSIONS):
+    matrix = np.zeros((len(token_lists), dimensions), dtype=np.float32)
+    for row, tokens in enumerate(token_lists):
+        features = Counter(tokens)
+        features.update(f"{a} {b}" for a, b in zip(tokens, tokens[1:]))
+        for feature, count in features.items():
+            column, sign = _embedding_feature(feature, dimensions)
+            matrix[row, column] += sign * (1 + math.log(count))
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    return matrix / np.where(norms > 0, norms, 1.0)
+
+
+MINHASH_PRIME = (1 << 31) - 1
+
+
+@lru_cache(maxsize=8)
+def minhash_permutations(num_perm: int, seed: int = 1):
+    generator = np.random.RandomState(seed)
+    a = generator.randint(1, MINHASH_PRIME, size=num_perm, dtype=np.uint64)
+    b = generator.randint(0, MINHASH_PRIME, size=num_perm, dtype=np.uint64)
+    return a, b
+
+
+def minhash_signature(hashes: List[int], num_perm: int = 128, seed: int = 1):
+    a, b = minhash_permutations(num_perm, seed)
+    if not hashes:
+        return np.full(num_perm, MINHASH_PRIME, dtype=np.uint32)
+    values = np.fromiter((h & 0xFFFFFFFF for h in set(hashes)), dtype=np.uint64)
+    signature = np.full(num_perm, MINHASH_PRIME, dtype=np.uint64)
+    for start in range(0, len(values), 4096):
+        permuted = (np.outer(values[start:start + 4096], a) + b) % MINHASH_PRIME
+        signature = np.minimum(signature, permuted.min(axis=0))
+    return signature.astype(np.uint32)
+
+
+def estimated_jaccard(signature_a, signature_b) -> float:
+    if len(signature_a) != len(signature_b) or len(signature_a) == 0:
+        return 0.0
+    return round(float(np.mean(signature_a == signature_b)) * 100, 2)
+
+
+SIMHASH_BITS = 64
+
+
+def simhash(hashes: List[int], bits: int = SIMHASH_BITS) -> int:
+    if not hashes:
+        return 0
+    counts = Counter(hashes)
+    values = np.fromiter((h & 0xFFFFFFFFFFFFFFFF for h in counts), dtype=np.uint64, count=len(counts))
+    weights = np.fromiter(counts.values(), dtype=np.int64, count=len(counts))
+    shifts = np.arange(bits, dtype=np.uint64)
+    totals = np.zeros(bits, dtype=np.int64)
+    for start in range(0, len(values), 4096):
+        set_bits = ((values[start:start + 4096, None] >> shifts) & np.uint64(1)).astype(np.int64)
+        totals += ((set_bits * 2 - 1) * weights[start:start + 4096, None]).sum(axis=0)
+    return sum(1 << int(bit) for bit in np.flatnonzero(totals > 0))
+
+
+def simhash_blocks(fingerprint: int, blocks: int, bits: int = SIMHASH_BITS) -> List[int]:
+    values = []
+    shift = 0
+    for block in range(blocks):
+        width = bits // blocks + (1 if block < bits % blocks else 0)
+        values.append((fingerprint >> shift) & ((1 << width) - 1))
+        shift += width
+    return values
+
+
+def hamming_distance(a: int, b: int) -> int:
+    return bin(a ^ b).count('1')
+
+
+def lsh_bands(signature, bands: int) -> List[bytes]:
+    if len(signature) % bands:
+        raise ValueError(f"Signature length {len(signature)} is not divisible into {bands} bands")
+    rows = len(signature) // bands
+    return [signature[i * rows:(i + 1) * rows].tobytes() for i in range(bands)]
+
+
+def winnowing_fingerprints(tokens: List[str], k: int = 5, window: int = 4) -> List[tuple]:
+    if len(tokens) < k:
+        return []
+    hashes = [stable_hash(' '.join(tokens[i:i + k])) for i in range(len(tokens) - k + 1)]
+    if len(hashes) <= window:
+        position = min(range(len(hashes)), key=lambda i: (hashes[i], -i))
+        return [(hashes[position], position)]
+
+    fingerprints = []
+    candidates = deque()
+    last_selected = -1
+    for i, value in enumerate(hashes):
+        while candidates and hashes[candidates[-1]] >= value:
+            candidates.pop()
+        candidates.append(i)
+        if candidates[0] <= i - window:
+            candidates.popleft()
+        if i >= window - 1 and candidates[0] != last_selected:
+            last_selected = candidates[0]
+            fingerprints.append((hashes[last_selected], last_selected))
+    return fingerprints
+
+
+def winnowing_matches(query_fingerprints: List[tuple], reference_fingerprints: List[tuple],
+                      k: int = 5, window: int = 4) -> Dict:
+    positions = {}
+    for value, offset in reference_fingerprints:
+        positions.setdefault(value, []).append(offset)
+    pairs = sorted((query_pos, ref_pos) for value, query_pos in query_fingerprints
+                   for ref_pos in positions.get(value, ()))
+    shared = {value for value, _ in query_fingerprints if value in positions}
+    distinct = {value for value, _ in query_fingerprints}
+    score = round(len(shared) / len(distinct) * 100, 2) if distinct else 0.0
+
+    runs = {}
+    for query_pos, ref_pos in pairs:
+        diagonal = ref_pos - query_pos
+        run = runs.get(diagonal)
+        if run and query_pos - run[-1][1] <= window + k:
+            run[-1][1] = query_pos
+        else:
+            runs.setdefault(diagonal, []).append([query_pos, query_pos])
+
+    regions = []
+    for diagonal, spans in runs.items():
+        for start, end in spans:
+            regions.append({
+                'position_a': start,
+                'position_b': start + diagonal,
+                'length': end - start + k
+            })
+    regions.sort(key=lambda region: region['length'], reverse=True)
+    return {'score': score, 'regions': regions}
@@ -0,0 +1,71 @@
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+from typing import Dict, List
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from algorithms.similarity import (SuffixAutomaton, find_matching_sequences,
+                                   find_matching_sequences_difflib)
+
+
+def _synthetic_corpus(words: int, candidates: int, seed: int = 42) -> Dict[str, List]:
+    generator = random.Random(seed)
+    vocabulary = [f"word{i}" for i in range(5000)]
+    suspect = [generator.choice(vocabulary) for _ in range(words)]
+    references = []
+    for _ in range(candidates):
+        reference = [generator.choice(vocabulary) for _ in range(words // 2)]
+        for _ in range(10):
+            length = generator.randint(5, 60)
+            start = generator.randrange(0, max(len(suspect) - length, 1))
+            insert_at = generator.randrange(0, len(reference))
+            reference[insert_at:insert_at] = suspect[start:start + length]
+        references.append(reference)
+    return {'suspect': suspect, 'references': references}
+
+
+def run_benchmark(words: int = 20000, candidates: int = 5, min_length: int = 3,
+                  include_difflib: bool = True) -> Dict[str, float]:
+    corpus = _synthetic_corpus(words, candidates)
+    suspect, references = corpus['suspect'], corpus['references']
+    results = {'words': words, 'candidates': candidates}
+
+    start = time.perf_counter()
+    automaton = SuffixAutomaton(suspect)
+    results['automaton_build_s'] = round(time.perf_counter() - start, 4)
+    automaton_matches = 0
+    for reference in references:
+        automaton_matches += len(find_matching_sequences(suspect, reference, min_length, automaton))
+    results['automaton_total_s'] = round(time.perf_counter() - start, 4)
+    results['automaton_sequences'] = automaton_matches
+
+    if include_difflib:
+        start = time.perf_counter()
+        difflib_matches = 0
+        for reference in references:
+            difflib_matches += len(find_matching_sequences_difflib(suspect, reference, min_length))
+        results['difflib_total_s'] = round(time.perf_counter() - start, 4)
+        results['difflib_sequences'] = difflib_matches
+        if results['automaton_total_s']:
+            results['speedup'] = round(results['difflib_total_s'] / results['automaton_total_s'], 1)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark sequence matching implementations")
+    parser.add_argument('--words', type=int, default=20000)
+    parser.add_argument('--candidates', type=int, default=5)
+    parser.add_argument('--min-length', type=int, default=3)
+    parser.add_argument('--skip-difflib', action='store_true')
+    args = parser.parse_args()
+
+    results = run_benchmark(args.words, args.candidates, args.min_length, not args.skip_difflib)
+    for key, value in results.items():
+        print(f"{key:>22}: {value}")
+
+
+if __name__ == '__main__':
+    main()
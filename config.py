@@ -21,7 +21,10 @@ class Config:
                 "path": "data/database.sqlite",
                 "backup_enabled": True,
                 "backup_count": 10,
-                "auto_cleanup_days": 30
+                "auto_cleanup_days": 30,
+                "compression": "auto",
+                "compression_level": 9,
+                "duplicates": "reject"
             },
             
             "detection": {
@@ -39,13 +42,22 @@ class Config:
                 "ultimate": {
                     "algorithms": ["cosine_tfidf", "cosine_count", "jaccard", 
                                   "overlap", "dice", "ngram_3", "ngram_5", 
-                                  "sequence", "semantic", "lsi"],
+                                  "sequence", "winnowing", "semantic", "lsi"],
                     "threshold": 5.0,
                     "min_match_length": 3,
+                    "near_duplicate_distance": 3,
+                    "near_duplicate_shortcut": True,
                     "enable_ml": True,
                     "enable_nlp": True,
                     "enable_citations": True,
                     "enable_readability": True
+                },
+                "collusion": {
+                    "threshold": 30.0,
+                    "shingle_size": 3,
+                    "num_perm": 128,
+                    "lsh_bands": 0,
+                    "max_bucket_size": 500
                 }
             },
             
@@ -54,7 +66,14 @@ class Config:
                                      ".htm", ".md", ".tex", ".odt", ".epub"],
                 "max_file_size_mb": 50,
                 "encoding": "utf-8",
-                "temp_directory": "temp/"
+                "temp_directory": "temp/",
+                "pdf": {
+                    "max_pages": 0,
+                    "extract_tables": True,
+                    "extract_images": False,
+                    "ocr_enabled": False,
+                    "parallel_min_pages": 16
+                }
             },
             
             "ui": {
@@ -105,11 +124,43 @@ class Config:
                 }
             },
             
+            "indexing": {
+                "shingle_size": 5,
+                "candidate_top_k": 50,
+                "candidate_strategy": "shingles",
+                "minhash_shingle_size": 3,
+                "minhash_num_perm": 128,
+                "lsh_bands": 32,
+                "winnowing_k": 5,
+                "winnowing_window": 4,
+                "simhash_shingle_size": 2,
+                "simhash_max_distance": 4,
+                "vector_features": 1048576,
+                "lsi_components": 100,
+                "lsi_max_features": 50000,
+                "lsi_min_df": 2,
+                "lsi_fit_sample": 20000,
+                "lsi_rebuild_fraction": 0.25,
+                "lsi_drift_threshold": 0.15,
+                "lsi_rebuild_days": 30,
+                "embedding_model": "all-MiniLM-L6-v2",
+                "embedding_dimensions": 256,
+                "embedding_passage_words": 40,
+                "embedding_lists": 0,
+                "embedding_probe": 16,
+                "embedding_top_k": 10,
+                "embedding_rebuild_fraction": 0.25,
+                "build_models": True
+            },
+            
             "performance": {
                 "max_threads": 4,
                 "cache_enabled": True,
                 "cache_size_mb": 100,
-                "batch_chunk_size": 10
+                "result_cache_enabled": True,
+                "result_cache_size_mb": 200,
+                "batch_chunk_size": 10,
+                "page_prefetch": 4
             },
             
             "paths": {
@@ -117,11 +168,13 @@ class Config:
                 "reports": "reports/",
                 "templates": "data/templates/",
                 "logs": "logs/",
-                "exports": "exports/"
+                "exports": "exports/",
+                "cache": "data/cache/"
             }
         }
     
     def load_config(self) -> Dict[str, Any]:
+        config_path = Path(self.config_file)
         if config_path.exists():
             try:
                 with open(config_path, 'r', encoding='utf-8') as f:
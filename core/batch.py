@@ -0,0 +1,235 @@
+import queue
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from core.ultimate_engine import UltimatePlagiarismEngine
+
+_DONE = object()
+_worker_engine = None
+_worker_index = None
+
+
+def _init_worker(config, use_index: bool):
+    global _worker_engine, _worker_index
+    from core.database import DatabaseManager
+    _worker_engine = UltimatePlagiarismEngine(config)
+    _worker_index = DatabaseManager(config, read_only=True) if use_index else None
+
+
+def _analyze_in_worker(pages: List[Tuple[int, str]], algorithms: Optional[List[str]]) -> Dict[str, Any]:
+    start = time.perf_counter()
+    results = _worker_engine.analyze_pages(pages, None, algorithms, candidate_index=_worker_index)
+    return {'results': results, 'seconds': time.perf_counter() - start}
+
+
+class BatchPipeline:
+    def __init__(self, config, algorithms: Optional[List[str]] = None, use_index: bool = True, journal=None):
+        self.config = config
+        self.algorithms = algorithms
+        self.use_index = use_index
+        self.journal = journal
+        self.max_workers = max(1, config.get('performance.max_threads', 4))
+        self.queue_size = max(1, config.get('performance.batch_chunk_size', 10))
+        self.engine = UltimatePlagiarismEngine(config)
+        self._stop = threading.Event()
+        self._resume = threading.Event()
+        self._resume.set()
+        self._hashes = {}
+        self.skipped = 0
+
+    def stop(self):
+        self._stop.set()
+        self._resume.set()
+
+    def pause(self):
+        self._resume.clear()
+
+    def resume(self):
+        self._resume.set()
+
+    @property
+    def stopped(self) -> bool:
+        return self._stop.is_set()
+
+    @property
+    def paused(self) -> bool:
+        return not self._resume.is_set()
+
+    def _wait_if_paused(self):
+        while not self._resume.wait(0.2):
+            if self.stopped:
+                break
+
+    @staticmethod
+    def _content_hash(filepath: str) -> Optional[str]:
+        from file_handlers.extraction_cache import ExtractionCache
+        try:
+            return ExtractionCache.content_hash(filepath)
+        except OSError:
+            return None
+
+    def create_job(self, files: Iterable[str], output_dir: str = '', settings: Optional[Dict] = None) -> str:
+        entries = [{'filepath': str(filepath), 'content_hash': self._content_hash(str(filepath))}
+                   for filepath in files]
+        return self.journal.create_batch_job(entries, str(output_dir), settings)
+
+    def pending_files(self, job_id: str) -> List[str]:
+        pending = []
+        for entry in self.journal.get_batch_files(job_id):
+            if entry['status'] == 'done' and entry['content_hash'] == self._content_hash(entry['filepath']):
+                continue
+            pending.append(entry['filepath'])
+        return pending
+
+    def run_job(self, job_id: str, on_result: Callable[[str, Dict[str, Any]], Optional[str]],
+                on_progress: Optional[Callable[[int, str, Optional[str]], None]] = None) -> Dict[str, Any]:
+        job = self.journal.get_batch_job(job_id)
+        if job is None:
+            raise ValueError(f"Unknown batch job: {job_id}")
+        files = self.pending_files(job_id)
+        self.skipped = job['total'] - len(files)
+        self.journal.set_batch_job_status(job_id, 'running')
+        summary = self.run(files, on_result, on_progress, job_id)
+        if summary['stopped']:
+            status = 'stopped'
+        else:
+            status = 'completed' if summary['failed'] == 0 else 'incomplete'
+        self.journal.set_batch_job_status(job_id, status)
+        summary['job_id'] = job_id
+        summary['job_total'] = job['total']
+        summary['skipped'] = self.skipped
+        return summary
+
+    def run(self, files: Iterable[str], on_result: Callable[[str, Dict[str, Any]], Optional[str]],
+            on_progress: Optional[Callable[[int, str, Optional[str]], None]] = None,
+            job_id: Optional[str] = None) -> Dict[str, Any]:
+        files = [str(filepath) for filepath in files]
+        self._stop.clear()
+        self._resume.set()
+        self._hashes = {}
+        extracted = queue.Queue(maxsize=self.queue_size)
+        analyzed = queue.Queue(maxsize=self.queue_size)
+        timings = {'extract_s': 0.0, 'analyze_s': 0.0, 'report_s': 0.0}
+        summary = {'total': len(files), 'successful': 0, 'failed': 0, 'errors': []}
+        start = time.perf_counter()
+
+        extractor = threading.Thread(target=self._extract_stage, args=(files, extracted, timings), daemon=True)
+        reporter = threading.Thread(target=self._report_stage, args=(analyzed, on_result, on_progress,
+                                                                     timings, summary, job_id), daemon=True)
+        extractor.start()
+        reporter.start()
+        try:
+            self._analyze_stage(extracted, analyzed, timings)
+        except Exception:
+            self._stop.set()
+            raise
+        finally:
+            analyzed.put(_DONE)
+            reporter.join()
+            while extractor.is_alive():
+                try:
+                    extracted.get_nowait()
+                except queue.Empty:
+                    extractor.join(0.05)
+
+        wall = time.perf_counter() - start
+        processed = summary['successful'] + summary['failed']
+        summary['stopped'] = self.stopped and processed < len(files)
+        summary['timings'] = {key: round(value, 3) for key, value in timings.items()}
+        summary['timings']['wall_s'] = round(wall, 3)
+        summary['files_per_second'] = round(processed / wall, 2) if wall else 0.0
+        summary['workers'] = self.max_workers
+        return summary
+
+    def _extract_stage(self, files: List[str], extracted: queue.Queue, timings: Dict[str, float]):
+        try:
+            for filepath in files:
+                self._wait_if_paused()
+                if self.stopped:
+                    break
+                start = time.perf_counter()
+                if self.journal is not None:
+                    self._hashes[filepath] = self._content_hash(filepath)
+                try:
+                    item = (filepath, list(self.engine.extract_pages(filepath)), None)
+                except Exception as e:
+                    item = (filepath, None, f"Extraction failed: {e}")
+                timings['extract_s'] += time.perf_counter() - start
+                extracted.put(item)
+        finally:
+            extracted.put(_DONE)
+
+    def _analyze_stage(self, extracted: queue.Queue, analyzed: queue.Queue, timings: Dict[str, float]):
+        with ProcessPoolExecutor(max_workers=self.max_workers, initializer=_init_worker,
+                                 initargs=(self.config, self.use_index)) as pool:
+            pending = {}
+            while True:
+                item = extracted.get()
+                if item is _DONE:
+                    break
+                filepath, pages, error = item
+                self._wait_if_paused()
+                if error is not None or self.stopped:
+                    if error is not None:
+                        analyzed.put((filepath, None, error))
+                    continue
+                pending[pool.submit(_analyze_in_worker, pages, self.algorithms)] = filepath
+                if len(pending) >= self.max_workers * 2:
+                    done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                    self._collect(done, pending, analyzed, timings)
+            if pending:
+                done, _ = wait(pending)
+                self._collect(done, pending, analyzed, timings)
+
+    def _collect(self, done, pending: Dict, analyzed: queue.Queue, timings: Dict[str, float]):
+        for future in done:
+            filepath = pending.pop(future)
+            try:
+                outcome = future.result()
+                timings['analyze_s'] += outcome['seconds']
+                analyzed.put((filepath, outcome['results'], None))
+            except Exception as e:
+                analyzed.put((filepath, None, f"Analysis failed: {e}"))
+
+    def _report_stage(self, analyzed: queue.Queue, on_result: Callable, on_progress: Optional[Callable],
+                      timings: Dict[str, float], summary: Dict[str, Any], job_id: Optional[str] = None):
+        try:
+            self._report(analyzed, on_result, on_progress, timings, summary, job_id)
+        except Exception as e:
+            summary['errors'].append({'file': None, 'error': f"Reporting stopped: {e}"})
+            self.stop()
+            while analyzed.get() is not _DONE:
+                pass
+
+    def _report(self, analyzed: queue.Queue, on_result: Callable, on_progress: Optional[Callable],
+                timings: Dict[str, float], summary: Dict[str, Any], job_id: Optional[str]):
+        while True:
+            item = analyzed.get()
+            if item is _DONE:
+                break
+            filepath, results, error = item
+            report_path = None
+            if error is None:
+                start = time.perf_counter()
+                try:
+                    report_path = on_result(filepath, results)
+                except Exception as e:
+                    error = f"Report failed: {e}"
+                timings['report_s'] += time.perf_counter() - start
+            if job_id is not None and self.journal is not None:
+                self.journal.update_batch_file(job_id, filepath, 'done' if error is None else 'failed',
+                                               str(report_path) if report_path else None, error,
+                                               self._hashes.get(filepath))
+            if error is None:
+                summary['successful'] += 1
+            else:
+                summary['failed'] += 1
+                summary['errors'].append({'file': Path(filepath).name, 'error': error})
+            if on_progress is not None:
+                try:
+                    on_progress(summary['successful'] + summary['failed'], filepath, error)
+                except Exception as e:
+                    summary['errors'].append({'file': Path(filepath).name, 'error': f"Progress callback failed: {e}"})
@@ -0,0 +1,203 @@
+import time
+from collections import defaultdict
+from datetime import datetime
+from itertools import combinations
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from core.utils import tokenize, shingle_hashes
+from core.lazy import lazy_import
+from algorithms.similarity import minhash_signature, lsh_bands
+
+np = lazy_import('numpy')
+
+
+def lsh_parameters(threshold: float, num_perm: int, false_negative_weight: float = 0.8,
+                   steps: int = 200) -> Tuple[int, int]:
+    best = None
+    for rows in range(1, num_perm + 1):
+        bands = num_perm // rows
+        error = 0.0
+        for step in range(steps):
+            similarity = (step + 0.5) / steps
+            candidate = 1 - (1 - similarity ** rows) ** bands
+            if similarity < threshold:
+                error += (1 - false_negative_weight) * candidate
+            else:
+                error += false_negative_weight * (1 - candidate)
+        if best is None or error < best[0]:
+            best = (error, bands, rows)
+    return best[1], best[2]
+
+
+class CollusionDetector:
+    def __init__(self, config):
+        self.config = config
+        self.threshold = config.get('detection.collusion.threshold', 30.0)
+        self.shingle_size = config.get('detection.collusion.shingle_size', 3)
+        self.num_perm = config.get('detection.collusion.num_perm', 128)
+        self.bands = config.get('detection.collusion.lsh_bands', 0)
+        self.max_bucket_size = config.get('detection.collusion.max_bucket_size', 500)
+        if self.bands:
+            if self.num_perm % self.bands:
+                raise ValueError("detection.collusion.num_perm must be divisible by detection.collusion.lsh_bands")
+            self.rows = self.num_perm // self.bands
+        else:
+            self.bands, self.rows = lsh_parameters(self.threshold / 100, self.num_perm)
+        self.names: List[str] = []
+        self.shingles: List[frozenset] = []
+        self.word_counts: List[int] = []
+        self.signatures = []
+        self.buckets = defaultdict(list)
+        self.indexing_seconds = 0.0
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def add(self, name: str, text: str):
+        start = time.perf_counter()
+        tokens = tokenize(text)
+        hashes = frozenset(shingle_hashes(tokens, self.shingle_size))
+        signature = minhash_signature(list(hashes), self.num_perm)
+        index = len(self.names)
+        self.names.append(name)
+        self.shingles.append(hashes)
+        self.word_counts.append(len(tokens))
+        self.signatures.append(signature)
+        if hashes:
+            for band, bucket in enumerate(lsh_bands(signature[:self.bands * self.rows], self.bands)):
+                self.buckets[(band, bucket)].append(index)
+        self.indexing_seconds += time.perf_counter() - start
+
+    def add_files(self, files: Iterable[str], extract, on_error=None):
+        for filepath in files:
+            try:
+                self.add(str(filepath), extract(filepath))
+            except Exception as e:
+                if on_error is not None:
+                    on_error(filepath, e)
+
+    def candidate_pairs(self) -> Dict[str, Any]:
+        pairs = set()
+        skipped_buckets = 0
+        skipped_members = set()
+        for members in self.buckets.values():
+            if len(members) < 2:
+                continue
+            if len(members) > self.max_bucket_size:
+                skipped_buckets += 1
+                skipped_members.update(members)
+                continue
+            pairs.update(combinations(members, 2))
+        return {'pairs': pairs, 'skipped_buckets': skipped_buckets, 'skipped_members': skipped_members}
+
+    def detect(self, threshold: Optional[float] = None) -> Dict[str, Any]:
+        threshold = self.threshold if threshold is None else threshold
+        start = time.perf_counter()
+        candidates = self.candidate_pairs()
+        lsh_seconds = time.perf_counter() - start
+
+        verify_start = time.perf_counter()
+        signatures = np.vstack(self.signatures) if self.signatures else np.zeros((0, self.num_perm))
+        pairs = []
+        for a, b in candidates['pairs']:
+            estimate = float(np.mean(signatures[a] == signatures[b])) * 100
+            if estimate < threshold * 0.5:
+                continue
+            shared = len(self.shingles[a] & self.shingles[b])
+            union = len(self.shingles[a]) + len(self.shingles[b]) - shared
+            jaccard = shared / union * 100 if union else 0.0
+            if jaccard < threshold:
+                continue
+            smaller = min(len(self.shingles[a]), len(self.shingles[b]))
+            pairs.append({
+                'a': self.names[a],
+                'b': self.names[b],
+                'similarity': round(jaccard, 2),
+                'containment': round(shared / smaller * 100, 2) if smaller else 0.0,
+                'shared_shingles': shared
+            })
+        pairs.sort(key=lambda pair: pair['similarity'], reverse=True)
+        verify_seconds = time.perf_counter() - verify_start
+
+        total = len(self.names)
+        return {
+            'submissions': total,
+            'threshold': threshold,
+            'pairs': pairs,
+            'clusters': self._clusters(pairs),
+            'stats': {
+                'possible_pairs': total * (total - 1) // 2,
+                'candidate_pairs': len(candidates['pairs']),
+                'verified_pairs': len(pairs),
+                'skipped_buckets': candidates['skipped_buckets'],
+                'skipped_submissions': len(candidates['skipped_members']),
+                'bands': self.bands,
+                'rows_per_band': self.rows,
+                'indexing_s': round(self.indexing_seconds, 3),
+                'lsh_s': round(lsh_seconds, 3),
+                'verification_s': round(verify_seconds, 3)
+            },
+            'analysis_date': datetime.now().isoformat()
+        }
+
+    def _clusters(self, pairs: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        parent = {}
+
+        def find(name):
+            parent.setdefault(name, name)
+            while parent[name] != name:
+                parent[name] = parent[parent[name]]
+                name = parent[name]
+            return name
+
+        for pair in pairs:
+            root_a, root_b = find(pair['a']), find(pair['b'])
+            if root_a != root_b:
+                parent[root_b] = root_a
+
+        groups = defaultdict(lambda: {'members': set(), 'edges': []})
+        for pair in pairs:
+            group = groups[find(pair['a'])]
+            group['members'].update((pair['a'], pair['b']))
+            group['edges'].append(pair)
+        clusters = [{
+            'members': sorted(group['members']),
+            'size': len(group['members']),
+            'max_similarity': max(edge['similarity'] for edge in group['edges']),
+            'edges': group['edges']
+        } for group in groups.values()]
+        clusters.sort(key=lambda cluster: (cluster['size'], cluster['max_similarity']), reverse=True)
+        return clusters
+
+
+def format_collusion_report(report: Dict[str, Any]) -> str:
+    stats = report['stats']
+    lines = [
+        "=" * 70,
+        "COLLUSION DETECTION REPORT",
+        "=" * 70,
+        f"Date: {report['analysis_date']}",
+        f"Submissions compared: {report['submissions']}",
+        f"Similarity threshold: {report['threshold']}%",
+        f"Candidate pairs checked: {stats['candidate_pairs']} of {stats['possible_pairs']} possible",
+        f"Suspicious pairs: {stats['verified_pairs']}",
+        f"Clusters: {len(report['clusters'])}",
+        ""
+    ]
+    if stats['skipped_buckets']:
+        lines[-1:-1] = [f"WARNING: {stats['skipped_buckets']} oversized LSH buckets were skipped; "
+                        f"{stats['skipped_submissions']} submissions may have unchecked pairs "
+                        f"(raise detection.collusion.max_bucket_size to compare them)"]
+    for number, cluster in enumerate(report['clusters'], 1):
+        lines.append(f"Cluster {number}: {cluster['size']} submissions "
+                     f"(max similarity {cluster['max_similarity']}%)")
+        for member in cluster['members']:
+            lines.append(f"  - {Path(member).name}")
+        for edge in sorted(cluster['edges'], key=lambda edge: edge['similarity'], reverse=True):
+            lines.append(f"    {Path(edge['a']).name} <-> {Path(edge['b']).name}: "
+                         f"{edge['similarity']}% similar, {edge['containment']}% contained")
+        lines.append("")
+    if not report['clusters']:
+        lines.append("No suspicious pairs found.")
+    return '\n'.join(lines)
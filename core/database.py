@@ -0,0 +1,1222 @@
+import hashlib
+import json
+import math
+import re
+import sqlite3
+import time
+import uuid
+import zlib
+from collections import Counter
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Dict, List, Optional, Any, Iterable, Tuple
+
+from core.utils import tokenize, shingle_hashes, stable_hash
+from core.lazy import lazy_import, is_available
+from algorithms.similarity import (minhash_signature, estimated_jaccard, lsh_bands,
+                                   winnowing_fingerprints, simhash, simhash_blocks, hamming_distance)
+
+np = lazy_import('numpy')
+zstandard = lazy_import('zstandard')
+
+FTS_QUERY_TERM = re.compile(r'(\w+)(\*?)', re.UNICODE)
+LISTING_COLUMNS = 'd.id, d.source, d.url, d.category, d.metadata, d.added_date, d.word_count'
+DOCUMENT_COLUMNS = f'{LISTING_COLUMNS}, d.content_hash, inflate(b.codec, b.data) AS text'
+DOCUMENT_TABLES = 'documents d JOIN text_blobs b ON b.hash = d.content_hash'
+DOCUMENT_SORT_COLUMNS = {'id': 'd.id', 'source': 'd.source', 'category': 'd.category', 'url': 'd.url',
+                         'word_count': 'd.word_count', 'added_date': 'd.added_date'}
+HISTORY_SORT_COLUMNS = {'date': 'date', 'filename': 'filename', 'similarity': 'similarity',
+                        'words': 'words', 'sources': 'sources'}
+
+
+def inflate(codec: str, data: bytes) -> Optional[str]:
+    if data is None:
+        return None
+    if codec == 'zstd':
+        data = zstandard.ZstdDecompressor().decompress(data)
+    elif codec == 'zlib':
+        data = zlib.decompress(data)
+    return bytes(data).decode('utf-8')
+
+
+def compress(data: bytes, codec: str, level: int):
+    if codec == 'zstd':
+        payload = zstandard.ZstdCompressor(level=level).compress(data)
+    else:
+        payload = zlib.compress(data, level)
+    if len(payload) >= len(data):
+        return 'raw', data
+    return codec, payload
+
+
+def prepare_text(text: str, codec: str = 'zlib', level: int = 9) -> Dict[str, Any]:
+    data = text.encode('utf-8')
+    stored_codec, payload = compress(data, codec, level)
+    return {'content_hash': hashlib.sha256(data).hexdigest(), 'codec': stored_codec, 'size': len(data),
+            'data': payload, 'word_count': len(tokenize(text))}
+
+
+class DocumentStream:
+    def __init__(self, db_manager, batch_size: int = 500, category: Optional[str] = None):
+        self.db_manager = db_manager
+        self.batch_size = batch_size
+        self.category = category
+
+    def __iter__(self):
+        return self.db_manager.iter_documents(self.batch_size, self.category)
+
+    def __len__(self) -> int:
+        return self.db_manager.count_documents_matching(self.category)
+
+
+class DatabaseManager:
+    def __init__(self, config, read_only: bool = False):
+        self.config = config
+        self.read_only = read_only
+        self.db_path = Path(config.get('database.path', 'data/database.sqlite'))
+        self.shingle_size = config.get('indexing.shingle_size', 5)
+        self.minhash_shingle_size = config.get('indexing.minhash_shingle_size', 3)
+        self.minhash_num_perm = config.get('indexing.minhash_num_perm', 128)
+        self.lsh_bands = config.get('indexing.lsh_bands', 32)
+        self.winnowing_k = config.get('indexing.winnowing_k', 5)
+        self.winnowing_window = config.get('indexing.winnowing_window', 4)
+        self.simhash_shingle_size = config.get('indexing.simhash_shingle_size', 2)
+        self.simhash_max_distance = config.get('indexing.simhash_max_distance', 4)
+        if self.minhash_num_perm % self.lsh_bands:
+            raise ValueError("indexing.minhash_num_perm must be divisible by indexing.lsh_bands")
+        self.compression = config.get('database.compression', 'auto')
+        if self.compression == 'auto':
+            self.compression = 'zstd' if is_available('zstandard') else 'zlib'
+        self.compression_level = config.get('database.compression_level', 9)
+        self.duplicates = config.get('database.duplicates', 'reject')
+        self._listeners = []
+        self._legacy_text_column = False
+        self.fts_enabled = False
+        if not read_only:
+            self.db_path.parent.mkdir(parents=True, exist_ok=True)
+            self._initialize()
+
+    @contextmanager
+    def _connect(self):
+        if self.read_only:
+            conn = sqlite3.connect(f"{self.db_path.resolve().as_uri()}?mode=ro", uri=True, timeout=30)
+        else:
+            conn = sqlite3.connect(str(self.db_path), timeout=30)
+        conn.row_factory = sqlite3.Row
+        conn.create_function('inflate', 2, inflate, deterministic=True)
+        try:
+            yield conn
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        finally:
+            conn.close()
+
+    def _initialize(self):
+        with self._connect() as conn:
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.executescript('''
+                CREATE TABLE IF NOT EXISTS documents (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    source TEXT UNIQUE NOT NULL,
+                    url TEXT DEFAULT '',
+                    category TEXT DEFAULT 'General',
+                    metadata TEXT DEFAULT '{}',
+                    added_date TEXT NOT NULL,
+                    word_count INTEGER NOT NULL DEFAULT 0,
+                    content_hash TEXT
+                );
+                CREATE TABLE IF NOT EXISTS text_blobs (
+                    hash TEXT PRIMARY KEY,
+                    codec TEXT NOT NULL,
+                    size INTEGER NOT NULL,
+                    data BLOB NOT NULL,
+                    refs INTEGER NOT NULL DEFAULT 0
+                ) WITHOUT ROWID;
+                CREATE TABLE IF NOT EXISTS check_history (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    filename TEXT NOT NULL,
+                    date TEXT NOT NULL,
+                    similarity REAL DEFAULT 0,
+                    words INTEGER DEFAULT 0,
+                    sources INTEGER DEFAULT 0,
+                    algorithms TEXT DEFAULT '[]',
+                    report TEXT
+                );
+                CREATE TABLE IF NOT EXISTS shingles (
+                    hash INTEGER NOT NULL,
+                    doc_id INTEGER NOT NULL,
+                    PRIMARY KEY (hash, doc_id)
+                ) WITHOUT ROWID;
+                CREATE INDEX IF NOT EXISTS idx_shingles_doc ON shingles(doc_id);
+                CREATE TABLE IF NOT EXISTS minhash_signatures (
+                    doc_id INTEGER PRIMARY KEY,
+                    signature BLOB NOT NULL
+                );
+                CREATE TABLE IF NOT EXISTS lsh_buckets (
+                    band INTEGER NOT NULL,
+                    bucket INTEGER NOT NULL,
+                    doc_id INTEGER NOT NULL,
+                    PRIMARY KEY (band, bucket, doc_id)
+                ) WITHOUT ROWID;
+                CREATE INDEX IF NOT EXISTS idx_lsh_doc ON lsh_buckets(doc_id);
+                CREATE TABLE IF NOT EXISTS fingerprints (
+                    hash INTEGER NOT NULL,
+                    doc_id INTEGER NOT NULL,
+                    offset INTEGER NOT NULL,
+                    PRIMARY KEY (hash, doc_id, offset)
+                ) WITHOUT ROWID;
+                CREATE INDEX IF NOT EXISTS idx_fingerprints_doc ON fingerprints(doc_id);
+                CREATE TABLE IF NOT EXISTS simhashes (
+                    kind TEXT NOT NULL,
+                    item_id INTEGER NOT NULL,
+                    fingerprint INTEGER NOT NULL,
+                    PRIMARY KEY (kind, item_id)
+                ) WITHOUT ROWID;
+                CREATE TABLE IF NOT EXISTS simhash_blocks (
+                    kind TEXT NOT NULL,
+                    block INTEGER NOT NULL,
+                    value INTEGER NOT NULL,
+                    item_id INTEGER NOT NULL,
+                    PRIMARY KEY (kind, block, value, item_id)
+                ) WITHOUT ROWID;
+                CREATE INDEX IF NOT EXISTS idx_simhash_blocks_item ON simhash_blocks(kind, item_id);
+                DROP INDEX IF EXISTS idx_history_date;
+                CREATE INDEX IF NOT EXISTS idx_history_date_similarity ON check_history(date, similarity);
+                CREATE INDEX IF NOT EXISTS idx_history_filename ON check_history(filename, similarity);
+                CREATE INDEX IF NOT EXISTS idx_history_similarity ON check_history(similarity);
+                CREATE INDEX IF NOT EXISTS idx_history_words ON check_history(words, similarity);
+                CREATE INDEX IF NOT EXISTS idx_history_sources ON check_history(sources, similarity);
+                CREATE TABLE IF NOT EXISTS batch_jobs (
+                    id TEXT PRIMARY KEY,
+                    created TEXT NOT NULL,
+                    updated TEXT NOT NULL,
+                    status TEXT NOT NULL,
+                    output_dir TEXT,
+                    settings TEXT DEFAULT '{}'
+                );
+                CREATE TABLE IF NOT EXISTS batch_files (
+                    job_id TEXT NOT NULL,
+                    position INTEGER NOT NULL,
+                    filepath TEXT NOT NULL,
+                    content_hash TEXT,
+                    status TEXT NOT NULL DEFAULT 'pending',
+                    report_path TEXT,
+                    error TEXT,
+                    updated TEXT,
+                    PRIMARY KEY (job_id, position)
+                );
+                CREATE INDEX IF NOT EXISTS idx_batch_files_path ON batch_files(job_id, filepath);
+                CREATE TABLE IF NOT EXISTS term_stats (
+                    term_id INTEGER PRIMARY KEY,
+                    term TEXT UNIQUE NOT NULL,
+                    df INTEGER NOT NULL DEFAULT 0,
+                    cf INTEGER NOT NULL DEFAULT 0
+                );
+                CREATE TABLE IF NOT EXISTS meta (
+                    key TEXT PRIMARY KEY,
+                    value TEXT
+                );
+            ''')
+            columns = {row['name'] for row in conn.execute('PRAGMA table_info(documents)')}
+            if 'word_count' not in columns:
+                conn.execute('ALTER TABLE documents ADD COLUMN word_count INTEGER NOT NULL DEFAULT 0')
+            if 'content_hash' not in columns:
+                conn.execute('ALTER TABLE documents ADD COLUMN content_hash TEXT')
+            if 'text' in columns:
+                if conn.execute("SELECT 1 FROM meta WHERE key = 'text_storage'").fetchone():
+                    self._legacy_text_column = True
+                else:
+                    self._migrate_text_storage(conn)
+            conn.executescript('''
+                CREATE VIEW IF NOT EXISTS document_texts AS
+                    SELECT d.id AS id, d.source AS source, d.category AS category,
+                           inflate(b.codec, b.data) AS text
+                    FROM documents d JOIN text_blobs b ON b.hash = d.content_hash;
+                CREATE INDEX IF NOT EXISTS idx_documents_content ON documents(content_hash);
+                CREATE INDEX IF NOT EXISTS idx_documents_category ON documents(category);
+                CREATE INDEX IF NOT EXISTS idx_documents_words ON documents(word_count);
+                CREATE INDEX IF NOT EXISTS idx_documents_added ON documents(added_date);
+                INSERT OR IGNORE INTO meta (key, value) VALUES ('corpus_version', 0);
+                CREATE TRIGGER IF NOT EXISTS documents_version_insert AFTER INSERT ON documents BEGIN
+                    UPDATE meta SET value = value + 1 WHERE key = 'corpus_version';
+                END;
+                CREATE TRIGGER IF NOT EXISTS documents_version_delete AFTER DELETE ON documents BEGIN
+                    UPDATE meta SET value = value + 1 WHERE key = 'corpus_version';
+                END;
+                CREATE TRIGGER IF NOT EXISTS documents_version_update AFTER UPDATE OF source, url, content_hash
+                ON documents BEGIN
+                    UPDATE meta SET value = value + 1 WHERE key = 'corpus_version';
+                END;
+            ''')
+            conn.execute("INSERT OR IGNORE INTO meta (key, value) VALUES ('corpus_id', ?)", (uuid.uuid4().hex,))
+            self.fts_enabled = self._create_fts(conn)
+        if self._get_meta('word_count') is None:
+            self.rebuild_word_counts()
+        if self.fts_enabled and self._get_meta('fts') is None:
+            self.rebuild_fts_index()
+        if self._get_meta('shingle_size') != str(self.shingle_size):
+            self.rebuild_shingle_index()
+        if self._get_meta('minhash_params') != self._minhash_params():
+            self.rebuild_minhash_index()
+        if self._get_meta('winnowing_params') != self._winnowing_params():
+            self.rebuild_fingerprint_index()
+        if self._get_meta('simhash_params') != self._simhash_params():
+            self.rebuild_simhash_index()
+        if self._get_meta('term_stats') is None:
+            self.rebuild_term_stats()
+
+    def _migrate_text_storage(self, conn: sqlite3.Connection):
+        conn.executescript('''
+            DROP TRIGGER IF EXISTS documents_fts_insert;
+            DROP TRIGGER IF EXISTS documents_fts_delete;
+            DROP TRIGGER IF EXISTS documents_fts_update;
+            DROP TABLE IF EXISTS documents_fts;
+        ''')
+        conn.execute("DELETE FROM meta WHERE key = 'fts'")
+        last_id = 0
+        while True:
+            rows = conn.execute('SELECT id, text FROM documents WHERE id > ? AND content_hash IS NULL '
+                                'ORDER BY id LIMIT 500', (last_id,)).fetchall()
+            if not rows:
+                break
+            for row in rows:
+                conn.execute('UPDATE documents SET content_hash = ? WHERE id = ?',
+                             (self._store_text(conn, row['text']), row['id']))
+            last_id = rows[-1]['id']
+        try:
+            conn.execute('ALTER TABLE documents DROP COLUMN text')
+        except sqlite3.OperationalError:
+            conn.execute("UPDATE documents SET text = ''")
+            self._legacy_text_column = True
+        self._set_meta(conn, 'text_storage', 1)
+
+    def _compress(self, data: bytes):
+        return compress(data, self.compression, self.compression_level)
+
+    def prepare_text(self, text: str) -> Dict[str, Any]:
+        return prepare_text(text, self.compression, self.compression_level)
+
+    def _store_text(self, conn: sqlite3.Connection, text: str) -> str:
+        data = text.encode('utf-8')
+        digest = hashlib.sha256(data).hexdigest()
+        if not conn.execute('UPDATE text_blobs SET refs = refs + 1 WHERE hash = ?', (digest,)).rowcount:
+            codec, payload = self._compress(data)
+            conn.execute('INSERT INTO text_blobs (hash, codec, size, data, refs) VALUES (?, ?, ?, ?, 1)',
+                         (digest, codec, len(data), payload))
+        return digest
+
+    def _release_text(self, conn: sqlite3.Connection, digest: str):
+        conn.execute('UPDATE text_blobs SET refs = refs - 1 WHERE hash = ?', (digest,))
+        conn.execute('DELETE FROM text_blobs WHERE hash = ? AND refs <= 0', (digest,))
+
+    def _create_fts(self, conn: sqlite3.Connection) -> bool:
+        try:
+            conn.executescript('''
+                CREATE VIRTUAL TABLE IF NOT EXISTS documents_fts USING fts5(
+                    source, category, text,
+                    content='document_texts', content_rowid='id',
+                    tokenize='unicode61 remove_diacritics 2', prefix='2 3'
+                );
+                CREATE TRIGGER IF NOT EXISTS documents_fts_insert AFTER INSERT ON documents BEGIN
+                    INSERT INTO documents_fts (rowid, source, category, text)
+                    SELECT new.id, new.source, new.category, inflate(codec, data)
+                    FROM text_blobs WHERE hash = new.content_hash;
+                END;
+                CREATE TRIGGER IF NOT EXISTS documents_fts_delete AFTER DELETE ON documents BEGIN
+                    INSERT INTO documents_fts (documents_fts, rowid, source, category, text)
+                    SELECT 'delete', old.id, old.source, old.category, inflate(codec, data)
+                    FROM text_blobs WHERE hash = old.content_hash;
+                END;
+                CREATE TRIGGER IF NOT EXISTS documents_fts_update AFTER UPDATE OF source, category, content_hash
+                ON documents BEGIN
+                    INSERT INTO documents_fts (documents_fts, rowid, source, category, text)
+                    SELECT 'delete', old.id, old.source, old.category, inflate(codec, data)
+                    FROM text_blobs WHERE hash = old.content_hash;
+                    INSERT INTO documents_fts (rowid, source, category, text)
+                    SELECT new.id, new.source, new.category, inflate(codec, data)
+                    FROM text_blobs WHERE hash = new.content_hash;
+                END;
+            ''')
+            return True
+        except sqlite3.OperationalError as e:
+            print(f"Warning: Full-text search unavailable, falling back to LIKE queries: {e}")
+            return False
+
+    def rebuild_fts_index(self):
+        with self._connect() as conn:
+            conn.execute("INSERT INTO documents_fts (documents_fts) VALUES ('rebuild')")
+            self._set_meta(conn, 'fts', 1)
+
+    def rebuild_word_counts(self):
+        with self._connect() as conn:
+            rows = conn.execute('SELECT id, text FROM document_texts').fetchall()
+            conn.executemany('UPDATE documents SET word_count = ? WHERE id = ?',
+                             ((len(tokenize(row['text'])), row['id']) for row in rows))
+            self._set_meta(conn, 'word_count', 1)
+
+    def _get_meta(self, key: str, default: Optional[str] = None) -> Optional[str]:
+        with self._connect() as conn:
+            row = conn.execute('SELECT value FROM meta WHERE key = ?', (key,)).fetchone()
+        return row['value'] if row else default
+
+    def _set_meta(self, conn: sqlite3.Connection, key: str, value: Any):
+        conn.execute('INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)', (key, str(value)))
+
+    def get_corpus_version(self) -> Optional[Tuple[str, int]]:
+        try:
+            with self._connect() as conn:
+                rows = dict(conn.execute("SELECT key, value FROM meta "
+                                         "WHERE key IN ('corpus_id', 'corpus_version')").fetchall())
+        except sqlite3.Error as e:
+            print(f"Warning: Could not read corpus version: {e}")
+            return None
+        if 'corpus_id' not in rows:
+            return None
+        return rows['corpus_id'], int(rows.get('corpus_version') or 0)
+
+    def _row_to_document(self, row: sqlite3.Row) -> Dict[str, Any]:
+        doc = dict(row)
+        try:
+            doc['metadata'] = json.loads(doc.get('metadata') or '{}')
+        except (TypeError, ValueError):
+            doc['metadata'] = {}
+        return doc
+
+    def _shingle_rows(self, doc_id: int, tokens: List[str]) -> List[tuple]:
+        return [(h, doc_id) for h in set(shingle_hashes(tokens, self.shingle_size))]
+
+    def _index_shingles(self, conn: sqlite3.Connection, doc_id: int, text: str):
+        conn.executemany('INSERT OR IGNORE INTO shingles (hash, doc_id) VALUES (?, ?)',
+                         self._shingle_rows(doc_id, tokenize(text)))
+
+    def rebuild_shingle_index(self):
+        with self._connect() as conn:
+            conn.execute('DELETE FROM shingles')
+            for row in conn.execute('SELECT id, text FROM document_texts').fetchall():
+                self._index_shingles(conn, row['id'], row['text'])
+            self._set_meta(conn, 'shingle_size', self.shingle_size)
+
+    def _update_term_stats(self, conn: sqlite3.Connection, text: str, sign: int = 1):
+        counts = Counter(tokenize(text))
+        if sign > 0:
+            conn.executemany('''
+                INSERT INTO term_stats (term, df, cf) VALUES (?, 1, ?)
+                ON CONFLICT(term) DO UPDATE SET df = df + 1, cf = cf + excluded.cf
+            ''', counts.items())
+        else:
+            conn.executemany('UPDATE term_stats SET df = df - 1, cf = cf - ? WHERE term = ?',
+                             ((count, term) for term, count in counts.items()))
+            conn.execute('DELETE FROM term_stats WHERE df <= 0')
+
+    def rebuild_term_stats(self):
+        with self._connect() as conn:
+            conn.execute('DELETE FROM term_stats')
+            for row in conn.execute('SELECT text FROM document_texts').fetchall():
+                self._update_term_stats(conn, row['text'])
+            self._set_meta(conn, 'term_stats', 1)
+
+    def get_idf(self, terms: Iterable[str]) -> Dict[str, float]:
+        terms = set(terms)
+        if not terms:
+            return {}
+        with self._connect() as conn:
+            conn.execute('CREATE TEMP TABLE IF NOT EXISTS query_terms (term TEXT PRIMARY KEY)')
+            conn.execute('DELETE FROM query_terms')
+            conn.executemany('INSERT OR IGNORE INTO query_terms (term) VALUES (?)', ((t,) for t in terms))
+            rows = conn.execute('SELECT t.term, t.df FROM query_terms q '
+                                'JOIN term_stats t ON t.term = q.term').fetchall()
+            n_docs = conn.execute('SELECT COUNT(*) FROM documents').fetchone()[0]
+        df = {row['term']: row['df'] for row in rows}
+        return {term: math.log((1 + n_docs) / (1 + df.get(term, 0))) + 1 for term in terms}
+
+    def add_listener(self, listener):
+        if listener not in self._listeners:
+            self._listeners.append(listener)
+
+    def remove_listener(self, listener):
+        if listener in self._listeners:
+            self._listeners.remove(listener)
+
+    def _notify(self, event: str, *args):
+        for listener in list(self._listeners):
+            try:
+                getattr(listener, event)(*args)
+            except Exception as e:
+                print(f"Warning: Database listener failed on {event}: {e}")
+
+    def _minhash_params(self) -> str:
+        return f"{self.minhash_shingle_size}:{self.minhash_num_perm}:{self.lsh_bands}"
+
+    def compute_minhash(self, tokens: List[str]):
+        return minhash_signature(shingle_hashes(tokens, self.minhash_shingle_size),
+                                 self.minhash_num_perm)
+
+    def _lsh_buckets(self, signature) -> List[tuple]:
+        return [(band, stable_hash(band_bytes.hex()))
+                for band, band_bytes in enumerate(lsh_bands(signature, self.lsh_bands))]
+
+    def _minhash_rows(self, doc_id: int, tokens: List[str]):
+        signature = self.compute_minhash(tokens)
+        return (doc_id, signature.tobytes()), [(band, bucket, doc_id)
+                                               for band, bucket in self._lsh_buckets(signature)]
+
+    def _index_minhash(self, conn: sqlite3.Connection, doc_id: int, text: str):
+        signature, buckets = self._minhash_rows(doc_id, tokenize(text))
+        conn.execute('INSERT OR REPLACE INTO minhash_signatures (doc_id, signature) VALUES (?, ?)', signature)
+        conn.executemany('INSERT OR IGNORE INTO lsh_buckets (band, bucket, doc_id) VALUES (?, ?, ?)', buckets)
+
+    def rebuild_minhash_index(self):
+        with self._connect() as conn:
+            conn.execute('DELETE FROM minhash_signatures')
+            conn.execute('DELETE FROM lsh_buckets')
+            for row in conn.execute('SELECT id, text FROM document_texts').fetchall():
+                self._index_minhash(conn, row['id'], row['text'])
+            self._set_meta(conn, 'minhash_params', self._minhash_params())
+
+    def _simhash_params(self) -> str:
+        return f"{self.simhash_shingle_size}:{self.simhash_max_distance}"
+
+    def compute_simhash(self, tokens: List[str]) -> int:
+        return simhash(shingle_hashes(tokens, self.simhash_shingle_size))
+
+    @staticmethod
+    def _signed(value: int) -> int:
+        return value - (1 << 64) if value >= 1 << 63 else value
+
+    def _simhash_rows(self, kind: str, item_id: int, fingerprint: int):
+        blocks = simhash_blocks(fingerprint, self.simhash_max_distance + 1)
+        return (kind, item_id, self._signed(fingerprint)), [(kind, block, value, item_id)
+                                                            for block, value in enumerate(blocks)]
+
+    def _index_simhash(self, conn: sqlite3.Connection, kind: str, item_id: int, fingerprint: int):
+        row, blocks = self._simhash_rows(kind, item_id, fingerprint)
+        conn.execute('INSERT OR REPLACE INTO simhashes (kind, item_id, fingerprint) VALUES (?, ?, ?)', row)
+        conn.executemany('INSERT OR IGNORE INTO simhash_blocks (kind, block, value, item_id) VALUES (?, ?, ?, ?)',
+                         blocks)
+
+    def _remove_simhash(self, conn: sqlite3.Connection, kind: str, item_id: Optional[int] = None):
+        where, params = ('kind = ?', (kind,)) if item_id is None else ('kind = ? AND item_id = ?', (kind, item_id))
+        conn.execute(f'DELETE FROM simhashes WHERE {where}', params)
+        conn.execute(f'DELETE FROM simhash_blocks WHERE {where}', params)
+
+    def rebuild_simhash_index(self):
+        with self._connect() as conn:
+            conn.execute('DELETE FROM simhashes')
+            conn.execute('DELETE FROM simhash_blocks')
+            for row in conn.execute('SELECT id, text FROM document_texts').fetchall():
+                self._index_simhash(conn, 'document', row['id'], self.compute_simhash(tokenize(row['text'])))
+            self._set_meta(conn, 'simhash_params', self._simhash_params())
+
+    def find_near_duplicates(self, fingerprint: int, max_distance: Optional[int] = None,
+                             kind: str = 'document', limit: int = 20) -> List[Dict[str, Any]]:
+        start = time.perf_counter()
+        max_distance = self.simhash_max_distance if max_distance is None else max_distance
+        with self._connect() as conn:
+            if max_distance <= self.simhash_max_distance:
+                ids = set()
+                for block, value in enumerate(simhash_blocks(fingerprint, self.simhash_max_distance + 1)):
+                    ids.update(row[0] for row in conn.execute(
+                        'SELECT item_id FROM simhash_blocks WHERE kind = ? AND block = ? AND value = ?',
+                        (kind, block, value)))
+                ids = list(ids)
+                rows = []
+                for offset in range(0, len(ids), 500):
+                    batch = ids[offset:offset + 500]
+                    rows.extend(conn.execute(
+                        f'SELECT item_id, fingerprint FROM simhashes WHERE kind = ? '
+                        f'AND item_id IN ({",".join("?" * len(batch))})', [kind] + batch))
+            else:
+                rows = conn.execute('SELECT item_id, fingerprint FROM simhashes WHERE kind = ?', (kind,)).fetchall()
+            near = sorted((hamming_distance(fingerprint, row[1] & 0xFFFFFFFFFFFFFFFF), row[0]) for row in rows)
+            near = [(distance, item_id) for distance, item_id in near if distance <= max_distance][:limit]
+            if not near:
+                return []
+            placeholders = ','.join('?' * len(near))
+            if kind == 'history':
+                details = conn.execute(f'SELECT id, filename, date, similarity FROM check_history '
+                                       f'WHERE id IN ({placeholders})', [item_id for _, item_id in near])
+            else:
+                details = conn.execute(f'SELECT id, source, category FROM documents '
+                                       f'WHERE id IN ({placeholders})', [item_id for _, item_id in near])
+            details = {row['id']: dict(row) for row in details}
+        lookup_ms = round((time.perf_counter() - start) * 1000, 2)
+        return [dict(details[item_id], distance=distance, candidates=len(rows), lookup_ms=lookup_ms)
+                for distance, item_id in near if item_id in details]
+
+    def _winnowing_params(self) -> str:
+        return f"{self.winnowing_k}:{self.winnowing_window}"
+
+    def compute_fingerprints(self, tokens: List[str]) -> List[tuple]:
+        return winnowing_fingerprints(tokens, self.winnowing_k, self.winnowing_window)
+
+    def _fingerprint_rows(self, doc_id: int, tokens: List[str]) -> List[tuple]:
+        return [(value, doc_id, offset) for value, offset in self.compute_fingerprints(tokens)]
+
+    def _index_fingerprints(self, conn: sqlite3.Connection, doc_id: int, text: str):
+        conn.executemany('INSERT OR IGNORE INTO fingerprints (hash, doc_id, offset) VALUES (?, ?, ?)',
+                         self._fingerprint_rows(doc_id, tokenize(text)))
+
+    def rebuild_fingerprint_index(self):
+        with self._connect() as conn:
+            conn.execute('DELETE FROM fingerprints')
+            for row in conn.execute('SELECT id, text FROM document_texts').fetchall():
+                self._index_fingerprints(conn, row['id'], row['text'])
+            self._set_meta(conn, 'winnowing_params', self._winnowing_params())
+
+    def add_document(self, source: str, text: str, url: str = '', category: str = 'General',
+                     metadata: Optional[Dict] = None) -> bool:
+        try:
+            with self._connect() as conn:
+                doc_id = self._insert_document(conn, source, text, url, category, metadata)
+            self._notify('on_document_added', doc_id, text)
+            return True
+        except sqlite3.IntegrityError:
+            return False
+        except sqlite3.Error as e:
+            print(f"Warning: Could not add document: {e}")
+            return False
+
+    def _existing_values(self, conn: sqlite3.Connection, table: str, column: str, values: Iterable) -> set:
+        values = list(values)
+        found = set()
+        for start in range(0, len(values), 500):
+            batch = values[start:start + 500]
+            placeholders = ','.join('?' * len(batch))
+            found.update(row[0] for row in conn.execute(
+                f'SELECT {column} FROM {table} WHERE {column} IN ({placeholders})', batch))
+        return found
+
+    def insert_documents(self, documents: List[Dict[str, Any]]) -> Dict[str, Any]:
+        prepared = []
+        for doc in documents:
+            blob = doc.get('blob') or self.prepare_text(doc.get('text') or '')
+            prepared.append((doc.get('source') or 'Imported', doc, blob))
+        with self._connect() as conn:
+            taken_sources = self._existing_values(conn, 'documents', 'source', {source for source, _, _ in prepared})
+            stored_hashes = self._existing_values(conn, 'text_blobs', 'hash',
+                                                  {blob['content_hash'] for _, _, blob in prepared})
+            seen_hashes = set(stored_hashes)
+            new_blobs, refs, rows = {}, Counter(), []
+            now = datetime.now().isoformat()
+            for source, doc, blob in prepared:
+                digest = blob['content_hash']
+                if source in taken_sources or (self.duplicates == 'reject' and digest in seen_hashes):
+                    continue
+                taken_sources.add(source)
+                seen_hashes.add(digest)
+                if digest not in stored_hashes:
+                    new_blobs[digest] = (digest, blob['codec'], blob['size'], blob['data'])
+                refs[digest] += 1
+                row = [source, doc.get('url') or '', doc.get('category') or 'General',
+                       json.dumps(doc.get('metadata') or {}), now, blob['word_count'], digest]
+                if self._legacy_text_column:
+                    row.append('')
+                rows.append(row)
+
+            conn.executemany('INSERT INTO text_blobs (hash, codec, size, data, refs) VALUES (?, ?, ?, ?, 0)',
+                             new_blobs.values())
+            conn.executemany('UPDATE text_blobs SET refs = refs + ? WHERE hash = ?',
+                             ((count, digest) for digest, count in refs.items()))
+            last_id = conn.execute('SELECT COALESCE(MAX(id), 0) FROM documents').fetchone()[0]
+            columns = 'source, url, category, metadata, added_date, word_count, content_hash'
+            if self._legacy_text_column:
+                columns += ', text'
+            placeholders = ', '.join('?' * len(columns.split(', ')))
+            conn.executemany(f'INSERT INTO documents ({columns}) VALUES ({placeholders})', rows)
+            doc_ids = [row[0] for row in conn.execute('SELECT id FROM documents WHERE id > ? ORDER BY id',
+                                                      (last_id,))]
+        return {'doc_ids': doc_ids, 'skipped': len(prepared) - len(doc_ids),
+                'stored_bytes': sum(len(blob[3]) for blob in new_blobs.values())}
+
+    def unindexed_document_ids(self) -> List[int]:
+        with self._connect() as conn:
+            return [row[0] for row in conn.execute('SELECT d.id FROM documents d LEFT JOIN minhash_signatures m '
+                                                   'ON m.doc_id = d.id WHERE m.doc_id IS NULL ORDER BY d.id')]
+
+    def index_documents(self, doc_ids: List[int], batch_size: int = 500, on_progress=None):
+        df, cf = Counter(), Counter()
+        with self._connect() as conn:
+            for start in range(0, len(doc_ids), batch_size):
+                batch = doc_ids[start:start + batch_size]
+                placeholders = ','.join('?' * len(batch))
+                shingles, signatures, buckets, fingerprints, simhashes, blocks = [], [], [], [], [], []
+                for row in conn.execute(f'SELECT id, text FROM document_texts WHERE id IN ({placeholders})', batch):
+                    tokens = tokenize(row['text'])
+                    shingles.extend(self._shingle_rows(row['id'], tokens))
+                    signature, bands = self._minhash_rows(row['id'], tokens)
+                    signatures.append(signature)
+                    buckets.extend(bands)
+                    fingerprints.extend(self._fingerprint_rows(row['id'], tokens))
+                    fingerprint, simhash_block_rows = self._simhash_rows('document', row['id'],
+                                                                         self.compute_simhash(tokens))
+                    simhashes.append(fingerprint)
+                    blocks.extend(simhash_block_rows)
+                    counts = Counter(tokens)
+                    df.update(counts.keys())
+                    cf.update(counts)
+                conn.executemany('INSERT OR IGNORE INTO shingles (hash, doc_id) VALUES (?, ?)', shingles)
+                conn.executemany('INSERT OR REPLACE INTO minhash_signatures (doc_id, signature) VALUES (?, ?)',
+                                 signatures)
+                conn.executemany('INSERT OR IGNORE INTO lsh_buckets (band, bucket, doc_id) VALUES (?, ?, ?)',
+                                 buckets)
+                conn.executemany('INSERT OR IGNORE INTO fingerprints (hash, doc_id, offset) VALUES (?, ?, ?)',
+                                 fingerprints)
+                conn.executemany('INSERT OR REPLACE INTO simhashes (kind, item_id, fingerprint) VALUES (?, ?, ?)',
+                                 simhashes)
+                conn.executemany('INSERT OR IGNORE INTO simhash_blocks (kind, block, value, item_id) '
+                                 'VALUES (?, ?, ?, ?)', blocks)
+                if on_progress is not None:
+                    on_progress(min(start + batch_size, len(doc_ids)), len(doc_ids))
+            conn.executemany('''
+                INSERT INTO term_stats (term, df, cf) VALUES (?, ?, ?)
+                ON CONFLICT(term) DO UPDATE SET df = df + excluded.df, cf = cf + excluded.cf
+            ''', ((term, count, cf[term]) for term, count in df.items()))
+        if self._listeners:
+            for start in range(0, len(doc_ids), batch_size):
+                batch = doc_ids[start:start + batch_size]
+                placeholders = ','.join('?' * len(batch))
+                with self._connect() as conn:
+                    rows = conn.execute(f'SELECT id, text FROM document_texts WHERE id IN ({placeholders})',
+                                        batch).fetchall()
+                for row in rows:
+                    self._notify('on_document_added', row['id'], row['text'])
+
+    def _insert_document(self, conn: sqlite3.Connection, source: str, text: str, url: str = '',
+                         category: str = 'General', metadata: Optional[Dict] = None) -> int:
+        if self.duplicates == 'reject':
+            digest = hashlib.sha256(text.encode('utf-8')).hexdigest()
+            if conn.execute('SELECT 1 FROM documents WHERE content_hash = ? LIMIT 1', (digest,)).fetchone():
+                raise sqlite3.IntegrityError("A document with identical text already exists")
+        digest = self._store_text(conn, text)
+        columns = 'source, url, category, metadata, added_date, word_count, content_hash'
+        values = [source, url or '', category or 'General', json.dumps(metadata or {}),
+                  datetime.now().isoformat(), len(tokenize(text)), digest]
+        if self._legacy_text_column:
+            columns += ', text'
+            values.append('')
+        try:
+            cursor = conn.execute(f'INSERT INTO documents ({columns}) VALUES ({", ".join("?" * len(values))})',
+                                  values)
+        except sqlite3.IntegrityError:
+            self._release_text(conn, digest)
+            raise
+        doc_id = cursor.lastrowid
+        self._index_shingles(conn, doc_id, text)
+        self._index_minhash(conn, doc_id, text)
+        self._index_fingerprints(conn, doc_id, text)
+        self._index_simhash(conn, 'document', doc_id, self.compute_simhash(tokenize(text)))
+        self._update_term_stats(conn, text)
+        return doc_id
+
+    def delete_document(self, source: str) -> bool:
+        try:
+            with self._connect() as conn:
+                row = conn.execute('SELECT d.id, d.content_hash, inflate(b.codec, b.data) AS text '
+                                   f'FROM {DOCUMENT_TABLES} WHERE d.source = ?', (source,)).fetchone()
+                if row is None:
+                    return False
+                conn.execute('DELETE FROM shingles WHERE doc_id = ?', (row['id'],))
+                conn.execute('DELETE FROM minhash_signatures WHERE doc_id = ?', (row['id'],))
+                conn.execute('DELETE FROM lsh_buckets WHERE doc_id = ?', (row['id'],))
+                conn.execute('DELETE FROM fingerprints WHERE doc_id = ?', (row['id'],))
+                self._remove_simhash(conn, 'document', row['id'])
+                self._update_term_stats(conn, row['text'], -1)
+                conn.execute('DELETE FROM documents WHERE id = ?', (row['id'],))
+                self._release_text(conn, row['content_hash'])
+            self._notify('on_document_removed', row['id'])
+            return True
+        except sqlite3.Error as e:
+            print(f"Warning: Could not delete document: {e}")
+            return False
+
+    def get_all_documents(self) -> List[Dict[str, Any]]:
+        with self._connect() as conn:
+            rows = conn.execute(f'SELECT {DOCUMENT_COLUMNS} FROM {DOCUMENT_TABLES} ORDER BY d.id').fetchall()
+        return [self._row_to_document(row) for row in rows]
+
+    def list_documents(self, after_id: int = 0, limit: int = 200,
+                       category: Optional[str] = None) -> List[Dict[str, Any]]:
+        query = f'SELECT {LISTING_COLUMNS} FROM documents d WHERE d.id > ?'
+        params = [after_id]
+        if category:
+            query += ' AND d.category = ?'
+            params.append(category)
+        query += ' ORDER BY d.id LIMIT ?'
+        params.append(limit)
+        with self._connect() as conn:
+            rows = conn.execute(query, params).fetchall()
+        return [self._row_to_document(row) for row in rows]
+
+    def _document_filter(self, category: Optional[str], query: Optional[str]):
+        joins, clauses, params = '', [], []
+        if query:
+            if self._use_fts():
+                match = self._fts_query(query)
+                joins = ' JOIN documents_fts ON documents_fts.rowid = d.id'
+                clauses.append('documents_fts MATCH ?' if match else '0')
+                if match:
+                    params.append(match)
+            else:
+                pattern = f"%{query}%"
+                joins = ' JOIN text_blobs b ON b.hash = d.content_hash'
+                clauses.append('(d.source LIKE ? OR inflate(b.codec, b.data) LIKE ? OR d.category LIKE ?)')
+                params.extend((pattern, pattern, pattern))
+        if category:
+            clauses.append('d.category = ?')
+            params.append(category)
+        where = f" WHERE {' AND '.join(clauses)}" if clauses else ''
+        return joins + where, params
+
+    def query_documents(self, offset: int = 0, limit: int = 200, sort: Optional[str] = None,
+                        descending: bool = False, category: Optional[str] = None,
+                        query: Optional[str] = None) -> List[Dict[str, Any]]:
+        condition, params = self._document_filter(category, query)
+        direction = 'DESC' if descending else 'ASC'
+        if sort in DOCUMENT_SORT_COLUMNS:
+            order = f'{DOCUMENT_SORT_COLUMNS[sort]} {direction}, d.id {direction}'
+        elif query and self._use_fts():
+            order = 'bm25(documents_fts, 10.0, 5.0, 1.0)'
+        else:
+            order = f'd.id {direction}'
+        with self._connect() as conn:
+            rows = conn.execute(f'SELECT {LISTING_COLUMNS} FROM documents d{condition} '
+                                f'ORDER BY {order} LIMIT ? OFFSET ?', params + [limit, offset]).fetchall()
+        return [self._row_to_document(row) for row in rows]
+
+    def count_documents_matching(self, category: Optional[str] = None, query: Optional[str] = None) -> int:
+        condition, params = self._document_filter(category, query)
+        with self._connect() as conn:
+            return conn.execute(f'SELECT COUNT(*) FROM documents d{condition}', params).fetchone()[0]
+
+    def get_document_text(self, doc_id: int) -> Optional[str]:
+        with self._connect() as conn:
+            row = conn.execute('SELECT text FROM document_texts WHERE id = ?', (doc_id,)).fetchone()
+        return row['text'] if row else None
+
+    def stream_documents(self, batch_size: int = 500, category: Optional[str] = None) -> DocumentStream:
+        return DocumentStream(self, batch_size, category)
+
+    def iter_documents(self, batch_size: int = 500, category: Optional[str] = None):
+        last_id = 0
+        while True:
+            with self._connect() as conn:
+                if category:
+                    rows = conn.execute(f'SELECT {DOCUMENT_COLUMNS} FROM {DOCUMENT_TABLES} '
+                                        'WHERE d.id > ? AND d.category = ? ORDER BY d.id LIMIT ?',
+                                        (last_id, category, batch_size)).fetchall()
+                else:
+                    rows = conn.execute(f'SELECT {DOCUMENT_COLUMNS} FROM {DOCUMENT_TABLES} '
+                                        'WHERE d.id > ? ORDER BY d.id LIMIT ?', (last_id, batch_size)).fetchall()
+            if not rows:
+                return
+            for row in rows:
+                yield self._row_to_document(row)
+            last_id = rows[-1]['id']
+
+    def iter_document_texts(self, batch_size: int = 500, after_id: int = 0):
+        last_id = after_id
+        while True:
+            with self._connect() as conn:
+                rows = conn.execute('SELECT id, text FROM document_texts WHERE id > ? ORDER BY id LIMIT ?',
+                                    (last_id, batch_size)).fetchall()
+            if not rows:
+                return
+            for row in rows:
+                yield row['id'], row['text']
+            last_id = rows[-1]['id']
+
+    def sample_document_texts(self, limit: int) -> List[Tuple[int, str]]:
+        with self._connect() as conn:
+            total = conn.execute('SELECT COUNT(*) FROM documents').fetchone()[0]
+            step = max(1, total // max(1, limit))
+            rows = conn.execute('SELECT id, text FROM document_texts WHERE id % ? = 0 LIMIT ?',
+                                (step, limit)).fetchall()
+        return [(row['id'], row['text']) for row in rows]
+
+    def top_terms(self, min_df: int = 1, limit: int = 50000) -> List[Tuple[str, int]]:
+        with self._connect() as conn:
+            rows = conn.execute('SELECT term, df FROM term_stats WHERE df >= ? ORDER BY df DESC, term LIMIT ?',
+                                (min_df, limit)).fetchall()
+        return [(row['term'], row['df']) for row in rows]
+
+    def get_documents_by_ids(self, doc_ids: Iterable[int]) -> List[Dict[str, Any]]:
+        doc_ids = list(doc_ids)
+        if not doc_ids:
+            return []
+        documents = {}
+        with self._connect() as conn:
+            for start in range(0, len(doc_ids), 500):
+                batch = doc_ids[start:start + 500]
+                placeholders = ','.join('?' * len(batch))
+                for row in conn.execute(f'SELECT {DOCUMENT_COLUMNS} FROM {DOCUMENT_TABLES} '
+                                         f'WHERE d.id IN ({placeholders})', batch):
+                    documents[row['id']] = self._row_to_document(row)
+        return [documents[doc_id] for doc_id in doc_ids if doc_id in documents]
+
+    def count_documents(self, max_id: Optional[int] = None) -> int:
+        with self._connect() as conn:
+            if max_id is None:
+                return conn.execute('SELECT COUNT(*) FROM documents').fetchone()[0]
+            return conn.execute('SELECT COUNT(*) FROM documents WHERE id <= ?', (max_id,)).fetchone()[0]
+
+    def existing_document_ids(self, doc_ids: Iterable[int]) -> set:
+        with self._connect() as conn:
+            return self._existing_values(conn, 'documents', 'id', set(doc_ids))
+
+    def find_candidates(self, tokens: List[str], top_k: int = 50) -> Dict[str, Any]:
+        start = time.perf_counter()
+        hashes = set(shingle_hashes(tokens, self.shingle_size))
+        with self._connect() as conn:
+            conn.execute('CREATE TEMP TABLE IF NOT EXISTS query_shingles (hash INTEGER PRIMARY KEY)')
+            conn.execute('DELETE FROM query_shingles')
+            conn.executemany('INSERT OR IGNORE INTO query_shingles (hash) VALUES (?)',
+                             ((h,) for h in hashes))
+            counts = conn.execute('''
+                SELECT s.doc_id, COUNT(*) AS shared
+                FROM query_shingles q JOIN shingles s ON s.hash = q.hash
+                GROUP BY s.doc_id
+                ORDER BY shared DESC
+            ''').fetchall()
+            corpus_size = conn.execute('SELECT COUNT(*) FROM documents').fetchone()[0]
+
+        selected = counts[:top_k] if top_k > 0 else counts
+        total_shared = sum(row['shared'] for row in counts)
+        selected_shared = sum(row['shared'] for row in selected)
+        return {
+            'doc_ids': [row['doc_id'] for row in selected],
+            'shared_shingles': {row['doc_id']: row['shared'] for row in selected},
+            'stats': {
+                'corpus_size': corpus_size,
+                'query_shingles': len(hashes),
+                'documents_sharing_shingles': len(counts),
+                'candidates_selected': len(selected),
+                'shingle_recall': round(selected_shared / total_shared * 100, 2) if total_shared else 100.0,
+                'retrieval_ms': round((time.perf_counter() - start) * 1000, 2)
+            }
+        }
+
+    def query_lsh(self, tokens: List[str], top_k: int = 50) -> Dict[str, Any]:
+        start = time.perf_counter()
+        signature = self.compute_minhash(tokens)
+        with self._connect() as conn:
+            conn.execute('CREATE TEMP TABLE IF NOT EXISTS query_buckets '
+                         '(band INTEGER, bucket INTEGER, PRIMARY KEY (band, bucket))')
+            conn.execute('DELETE FROM query_buckets')
+            conn.executemany('INSERT OR IGNORE INTO query_buckets (band, bucket) VALUES (?, ?)',
+                             self._lsh_buckets(signature))
+            rows = conn.execute('''
+                SELECT m.doc_id, m.signature
+                FROM minhash_signatures m
+                WHERE m.doc_id IN (
+                    SELECT l.doc_id FROM query_buckets q
+                    JOIN lsh_buckets l ON l.band = q.band AND l.bucket = q.bucket
+                )
+            ''').fetchall()
+            corpus_size = conn.execute('SELECT COUNT(*) FROM documents').fetchone()[0]
+
+        estimates = {
+            row['doc_id']: estimated_jaccard(signature, np.frombuffer(row['signature'], dtype=np.uint32))
+            for row in rows
+        }
+        ranked = sorted(estimates.items(), key=lambda item: item[1], reverse=True)
+        selected = ranked[:top_k] if top_k > 0 else ranked
+        return {
+            'doc_ids': [doc_id for doc_id, _ in selected],
+            'estimated_jaccard': dict(selected),
+            'stats': {
+                'corpus_size': corpus_size,
+                'bands': self.lsh_bands,
+                'rows_per_band': self.minhash_num_perm // self.lsh_bands,
+                'bucket_candidates': len(rows),
+                'candidates_selected': len(selected),
+                'retrieval_ms': round((time.perf_counter() - start) * 1000, 2)
+            }
+        }
+
+    def lookup_fingerprints(self, hashes: Iterable[int],
+                            doc_ids: Optional[Iterable[int]] = None) -> Dict[int, List[tuple]]:
+        matches: Dict[int, List[tuple]] = {}
+        with self._connect() as conn:
+            conn.execute('CREATE TEMP TABLE IF NOT EXISTS query_fingerprints (hash INTEGER PRIMARY KEY)')
+            conn.execute('DELETE FROM query_fingerprints')
+            conn.executemany('INSERT OR IGNORE INTO query_fingerprints (hash) VALUES (?)',
+                             ((h,) for h in set(hashes)))
+            rows = conn.execute('''
+                SELECT f.hash, f.doc_id, f.offset
+                FROM query_fingerprints q JOIN fingerprints f ON f.hash = q.hash
+            ''').fetchall()
+        wanted = set(doc_ids) if doc_ids is not None else None
+        for row in rows:
+            if wanted is None or row['doc_id'] in wanted:
+                matches.setdefault(row['doc_id'], []).append((row['hash'], row['offset']))
+        return matches
+
+    @staticmethod
+    def _fts_query(query: str) -> str:
+        terms = []
+        for term, prefix in FTS_QUERY_TERM.findall(query):
+            terms.append(f'"{term}"{prefix}')
+        return ' '.join(terms)
+
+    def _use_fts(self) -> bool:
+        if self.read_only and not self.fts_enabled:
+            with self._connect() as conn:
+                self.fts_enabled = conn.execute("SELECT 1 FROM sqlite_master WHERE name = 'documents_fts'"
+                                                ).fetchone() is not None
+        return self.fts_enabled
+
+    def search_documents(self, query: str, limit: int = 100, offset: int = 0) -> List[Dict[str, Any]]:
+        columns = LISTING_COLUMNS
+        with self._connect() as conn:
+            if self._use_fts():
+                match = self._fts_query(query)
+                if not match:
+                    return []
+                rows = conn.execute(
+                    f"SELECT {columns}, "
+                    "snippet(documents_fts, 2, '[', ']', '...', 12) AS snippet, "
+                    "-bm25(documents_fts, 10.0, 5.0, 1.0) AS score "
+                    "FROM documents_fts JOIN documents d ON d.id = documents_fts.rowid "
+                    "WHERE documents_fts MATCH ? ORDER BY bm25(documents_fts, 10.0, 5.0, 1.0) LIMIT ? OFFSET ?",
+                    (match, limit, offset)
+                ).fetchall()
+            else:
+                pattern = f"%{query}%"
+                rows = conn.execute(
+                    f"SELECT {columns}, '' AS snippet, 0.0 AS score FROM {DOCUMENT_TABLES} "
+                    'WHERE d.source LIKE ? OR inflate(b.codec, b.data) LIKE ? OR d.category LIKE ? '
+                    'ORDER BY d.id LIMIT ? OFFSET ?',
+                    (pattern, pattern, pattern, limit, offset)
+                ).fetchall()
+        return [self._row_to_document(row) for row in rows]
+
+    def count_search_results(self, query: str) -> int:
+        with self._connect() as conn:
+            if self._use_fts():
+                match = self._fts_query(query)
+                if not match:
+                    return 0
+                return conn.execute('SELECT COUNT(*) FROM documents_fts WHERE documents_fts MATCH ?',
+                                    (match,)).fetchone()[0]
+            pattern = f"%{query}%"
+            return conn.execute(f'SELECT COUNT(*) FROM {DOCUMENT_TABLES} WHERE d.source LIKE ? '
+                                'OR inflate(b.codec, b.data) LIKE ? OR d.category LIKE ?',
+                                (pattern, pattern, pattern)).fetchone()[0]
+
+    def save_check_history(self, filename: str, results: Dict[str, Any],
+                           report_path: Optional[str] = None) -> bool:
+        try:
+            with self._connect() as conn:
+                cursor = conn.execute(
+                    'INSERT INTO check_history (filename, date, similarity, words, sources, algorithms, report) '
+                    'VALUES (?, ?, ?, ?, ?, ?, ?)',
+                    (filename, datetime.now().isoformat(),
+                     results.get('overall_similarity', 0), results.get('total_words', 0),
+                     len(results.get('matches', [])),
+                     json.dumps(results.get('metadata', {}).get('algorithms_used', [])),
+                     report_path)
+                )
+                fingerprint = results.get('metadata', {}).get('simhash')
+                if fingerprint:
+                    self._index_simhash(conn, 'history', cursor.lastrowid, int(fingerprint, 16))
+            return True
+        except sqlite3.Error as e:
+            print(f"Warning: Could not save check history: {e}")
+            return False
+
+    def get_check_history(self, limit: int = 100, start_date: Optional[str] = None) -> List[Dict[str, Any]]:
+        query = 'SELECT * FROM check_history'
+        params: List[Any] = []
+        if start_date:
+            query += ' WHERE date >= ?'
+            params.append(start_date)
+        query += ' ORDER BY date DESC LIMIT ?'
+        params.append(limit)
+        with self._connect() as conn:
+            rows = conn.execute(query, params).fetchall()
+        history = []
+        for row in rows:
+            entry = dict(row)
+            entry['algorithms'] = json.loads(entry.get('algorithms') or '[]')
+            history.append(entry)
+        return history
+
+    @staticmethod
+    def _history_filter(start_date: Optional[str], min_similarity: Optional[float], filename: Optional[str]):
+        clauses, params = [], []
+        if start_date:
+            clauses.append('date >= ?')
+            params.append(start_date)
+        if min_similarity is not None:
+            clauses.append('similarity >= ?')
+            params.append(min_similarity)
+        if filename:
+            clauses.append('filename LIKE ?')
+            params.append(f"%{filename}%")
+        return (f" WHERE {' AND '.join(clauses)}" if clauses else ''), params
+
+    def query_check_history(self, offset: int = 0, limit: int = 200, sort: str = 'date', descending: bool = True,
+                            start_date: Optional[str] = None, min_similarity: Optional[float] = None,
+                            filename: Optional[str] = None) -> List[Dict[str, Any]]:
+        condition, params = self._history_filter(start_date, min_similarity, filename)
+        direction = 'DESC' if descending else 'ASC'
+        column = HISTORY_SORT_COLUMNS.get(sort, 'date')
+        order = [column, 'id'] if column == 'similarity' else [column, 'similarity', 'id']
+        inner_order = ', '.join(f'{name} {direction}' for name in order)
+        outer_order = ', '.join(f'h.{name} {direction}' for name in order)
+        with self._connect() as conn:
+            rows = conn.execute(f'SELECT h.* FROM (SELECT id FROM check_history{condition} ORDER BY {inner_order} '
+                                f'LIMIT ? OFFSET ?) page JOIN check_history h ON h.id = page.id ORDER BY {outer_order}',
+                                params + [limit, offset]).fetchall()
+        history = []
+        for row in rows:
+            entry = dict(row)
+            entry['algorithms'] = json.loads(entry.get('algorithms') or '[]')
+            history.append(entry)
+        return history
+
+    def count_check_history(self, start_date: Optional[str] = None, min_similarity: Optional[float] = None,
+                            filename: Optional[str] = None) -> int:
+        condition, params = self._history_filter(start_date, min_similarity, filename)
+        with self._connect() as conn:
+            return conn.execute(f'SELECT COUNT(*) FROM check_history{condition}', params).fetchone()[0]
+
+    def clear_history(self) -> int:
+        with self._connect() as conn:
+            self._remove_simhash(conn, 'history')
+            return conn.execute('DELETE FROM check_history').rowcount
+
+    def create_batch_job(self, files: List[Dict[str, Any]], output_dir: str = '',
+                         settings: Optional[Dict] = None) -> str:
+        job_id = uuid.uuid4().hex
+        now = datetime.now().isoformat()
+        with self._connect() as conn:
+            conn.execute('INSERT INTO batch_jobs (id, created, updated, status, output_dir, settings) '
+                         'VALUES (?, ?, ?, ?, ?, ?)',
+                         (job_id, now, now, 'pending', output_dir, json.dumps(settings or {})))
+            conn.executemany('INSERT INTO batch_files (job_id, position, filepath, content_hash, updated) '
+                             'VALUES (?, ?, ?, ?, ?)',
+                             ((job_id, position, item['filepath'], item.get('content_hash'), now)
+                              for position, item in enumerate(files)))
+        return job_id
+
+    def get_batch_job(self, job_id: str) -> Optional[Dict[str, Any]]:
+        with self._connect() as conn:
+            row = conn.execute('SELECT * FROM batch_jobs WHERE id = ?', (job_id,)).fetchone()
+            if row is None:
+                return None
+            counts = conn.execute('SELECT status, COUNT(*) AS files FROM batch_files WHERE job_id = ? '
+                                  'GROUP BY status', (job_id,)).fetchall()
+        job = dict(row)
+        job['settings'] = json.loads(job.get('settings') or '{}')
+        job['counts'] = {count['status']: count['files'] for count in counts}
+        job['total'] = sum(job['counts'].values())
+        return job
+
+    def list_batch_jobs(self, statuses: Optional[Iterable[str]] = None, limit: int = 20) -> List[Dict[str, Any]]:
+        query = 'SELECT id FROM batch_jobs'
+        params = []
+        if statuses:
+            statuses = list(statuses)
+            query += f" WHERE status IN ({','.join('?' * len(statuses))})"
+            params.extend(statuses)
+        query += ' ORDER BY updated DESC LIMIT ?'
+        params.append(limit)
+        with self._connect() as conn:
+            job_ids = [row['id'] for row in conn.execute(query, params).fetchall()]
+        return [self.get_batch_job(job_id) for job_id in job_ids]
+
+    def get_batch_files(self, job_id: str, statuses: Optional[Iterable[str]] = None) -> List[Dict[str, Any]]:
+        query = 'SELECT * FROM batch_files WHERE job_id = ?'
+        params = [job_id]
+        if statuses:
+            statuses = list(statuses)
+            query += f" AND status IN ({','.join('?' * len(statuses))})"
+            params.extend(statuses)
+        with self._connect() as conn:
+            return [dict(row) for row in conn.execute(query + ' ORDER BY position', params).fetchall()]
+
+    def update_batch_file(self, job_id: str, filepath: str, status: str, report_path: Optional[str] = None,
+                          error: Optional[str] = None, content_hash: Optional[str] = None):
+        now = datetime.now().isoformat()
+        with self._connect() as conn:
+            conn.execute('UPDATE batch_files SET status = ?, report_path = ?, error = ?, updated = ?, '
+                         'content_hash = COALESCE(?, content_hash) WHERE job_id = ? AND filepath = ?',
+                         (status, report_path, error, now, content_hash, job_id, filepath))
+            conn.execute('UPDATE batch_jobs SET updated = ? WHERE id = ?', (now, job_id))
+
+    def set_batch_job_status(self, job_id: str, status: str):
+        with self._connect() as conn:
+            conn.execute('UPDATE batch_jobs SET status = ?, updated = ? WHERE id = ?',
+                         (status, datetime.now().isoformat(), job_id))
+
+    def get_statistics(self, days: int = 30) -> Dict[str, Any]:
+        since = (datetime.now() - timedelta(days=days)).isoformat()
+        with self._connect() as conn:
+            total_documents, total_words = conn.execute(
+                'SELECT COUNT(*), COALESCE(SUM(word_count), 0) FROM documents').fetchone()
+            total_checks, avg_similarity = conn.execute(
+                'SELECT COUNT(*), AVG(similarity) FROM check_history').fetchone()
+            storage = conn.execute('SELECT COUNT(*) AS texts, COALESCE(SUM(size), 0) AS raw_bytes, '
+                                   'COALESCE(SUM(length(data)), 0) AS stored_bytes FROM text_blobs').fetchone()
+            category_stats = [dict(row) for row in conn.execute(
+                'SELECT category, COUNT(*) AS count FROM documents GROUP BY category ORDER BY count DESC')]
+            daily_stats = [dict(row) for row in conn.execute(
+                'SELECT substr(date, 1, 10) AS date, COUNT(*) AS checks_today, '
+                'AVG(similarity) AS avg_similarity FROM check_history WHERE date >= ? '
+                'GROUP BY substr(date, 1, 10) ORDER BY date DESC', (since,))]
+        return {
+            'total_documents': total_documents,
+            'total_words': total_words,
+            'storage': {
+                'unique_texts': storage['texts'],
+                'raw_bytes': storage['raw_bytes'],
+                'stored_bytes': storage['stored_bytes'],
+                'compression_ratio': round(storage['raw_bytes'] / storage['stored_bytes'], 2)
+                if storage['stored_bytes'] else 1.0,
+                'codec': self.compression
+            },
+            'total_checks': total_checks,
+            'avg_similarity': round(avg_similarity or 0, 2),
+            'category_stats': category_stats,
+            'daily_stats': daily_stats,
+            'analysis_period_days': days
+        }
+
+    def optimize_database(self) -> bool:
+        try:
+            conn = sqlite3.connect(str(self.db_path))
+            if self.fts_enabled:
+                conn.execute("INSERT INTO documents_fts (documents_fts) VALUES ('optimize')")
+                conn.commit()
+            conn.execute('ANALYZE')
+            conn.execute('VACUUM')
+            conn.close()
+            return True
+        except sqlite3.Error as e:
+            print(f"Warning: Could not optimize database: {e}")
+            return False
+
+    def backup_database(self) -> bool:
+        if not self.config.get('database.backup_enabled', True):
+            return False
+        try:
+            backup_dir = self.db_path.parent / 'backups'
+            backup_dir.mkdir(parents=True, exist_ok=True)
+            backup_path = backup_dir / f"{self.db_path.stem}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.sqlite"
+            source = sqlite3.connect(str(self.db_path))
+            target = sqlite3.connect(str(backup_path))
+            with target:
+                source.backup(target)
+            target.close()
+            source.close()
+            backups = sorted(backup_dir.glob(f"{self.db_path.stem}_*.sqlite"))
+            for old_backup in backups[:-self.config.get('database.backup_count', 10)]:
+                old_backup.unlink()
+            return True
+        except (sqlite3.Error, OSError) as e:
+            print(f"Warning: Could not back up database: {e}")
+            return False
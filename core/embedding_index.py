@@ -0,0 +1,212 @@
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from core.utils import tokenize, passage_spans
+from core.lazy import lazy_import, is_available
+from core.persisted_index import PersistedIndex
+from algorithms import similarity
+
+np = lazy_import('numpy')
+sentence_transformers = lazy_import('sentence_transformers')
+
+KMEANS_ITERATIONS = 10
+KMEANS_SAMPLE = 50000
+
+
+class HashingEmbedder:
+    def __init__(self, dimensions: int = similarity.EMBEDDING_DIMENSIONS):
+        self.dimensions = dimensions
+        self.name = f"hashing:{dimensions}"
+
+    def encode(self, texts: List[str]):
+        return similarity.hashing_embeddings([tokenize(text) for text in texts], self.dimensions)
+
+
+class TransformerEmbedder:
+    def __init__(self, model_name: str):
+        self.model = sentence_transformers.SentenceTransformer(model_name, device='cpu', local_files_only=True)
+        self.dimensions = self.model.get_sentence_embedding_dimension()
+        self.name = f"transformer:{model_name}"
+
+    def encode(self, texts: List[str]):
+        vectors = self.model.encode(texts, batch_size=64, convert_to_numpy=True, normalize_embeddings=True,
+                                    show_progress_bar=False)
+        return vectors.astype(np.float32)
+
+
+def load_embedder(config):
+    model_name = config.get('indexing.embedding_model', 'all-MiniLM-L6-v2')
+    if model_name and model_name != 'hashing' and is_available('sentence_transformers'):
+        try:
+            return TransformerEmbedder(model_name)
+        except Exception:
+            pass
+    return HashingEmbedder(config.get('indexing.embedding_dimensions', similarity.EMBEDDING_DIMENSIONS))
+
+
+def spherical_kmeans(vectors, clusters: int, iterations: int = KMEANS_ITERATIONS, seed: int = 42):
+    rng = np.random.default_rng(seed)
+    centroids = vectors[rng.choice(len(vectors), clusters, replace=False)].copy()
+    for _ in range(iterations):
+        assignment = np.argmax(vectors @ centroids.T, axis=1)
+        sums = np.zeros_like(centroids)
+        np.add.at(sums, assignment, vectors)
+        norms = np.linalg.norm(sums, axis=1)
+        filled = norms > 0
+        centroids[filled] = sums[filled] / norms[filled, None]
+    return centroids
+
+
+class EmbeddingIndex(PersistedIndex):
+    DIRECTORY_SUFFIX = '.embeddings'
+    PATH_KEY = 'indexing.embedding_path'
+
+    def __init__(self, config, db_manager):
+        super().__init__(config, db_manager, config.get('indexing.embedding_rebuild_fraction', 0.25))
+        self.passage_words = config.get('indexing.embedding_passage_words', 40)
+        self.n_lists = config.get('indexing.embedding_lists', 0)
+        self.n_probe = config.get('indexing.embedding_probe', 16)
+        self.top_k = config.get('indexing.embedding_top_k', 10)
+        self._embedder = None
+
+    @property
+    def embedder(self):
+        if self._embedder is None:
+            self._embedder = load_embedder(self.config)
+        return self._embedder
+
+    def _row_layout(self, meta: Dict[str, Any]) -> Dict[str, Tuple[Any, tuple]]:
+        return {'docs': (np.int64, ()), 'spans': (np.int32, (2,)), 'vectors': (np.float16, (meta['dimensions'],))}
+
+    def _compatible(self, meta: Dict[str, Any]) -> bool:
+        return meta['embedder'] == self.embedder.name and meta['passage_words'] == self.passage_words
+
+    def _load_model(self, meta: Dict[str, Any]):
+        with np.load(self._model_file(meta['model_id'])) as ivf:
+            return {'centroids': ivf['centroids'], 'lists': ivf['lists'], 'offsets': ivf['offsets']}
+
+    def _fit(self, model_id: str) -> Optional[Tuple[Dict[str, Any], Any]]:
+        return {'embedder': self.embedder.name, 'dimensions': self.embedder.dimensions,
+                'passage_words': self.passage_words}, None
+
+    def _encode(self, model, documents: List[Tuple[int, str]]) -> Optional[Dict[str, Any]]:
+        doc_ids, spans, texts = [], [], []
+        for doc_id, text in documents:
+            for start, end in passage_spans(text, self.passage_words):
+                doc_ids.append(doc_id)
+                spans.append((start, end))
+                texts.append(text[start:end])
+        if not texts:
+            return None
+        return {'docs': np.array(doc_ids, dtype=np.int64), 'spans': np.array(spans, dtype=np.int32),
+                'vectors': self.embedder.encode(texts).astype(np.float16)}
+
+    def _finish(self, meta: Dict[str, Any]) -> Dict[str, Any]:
+        rows, dimensions = meta['rows'], meta['dimensions']
+        if rows:
+            vectors = np.memmap(self._file('vectors', meta['model_id']), dtype=np.float16, mode='r',
+                                shape=(rows, dimensions))
+            rng = np.random.default_rng(42)
+            sample = np.sort(rng.choice(rows, min(rows, KMEANS_SAMPLE), replace=False))
+            n_lists = min(self.n_lists or max(1, int(rows ** 0.5)), rows)
+            centroids = spherical_kmeans(np.asarray(vectors[sample], dtype=np.float32), n_lists)
+            assignment = np.concatenate([
+                np.argmax(np.asarray(vectors[offset:offset + 8192], dtype=np.float32) @ centroids.T, axis=1)
+                for offset in range(0, rows, 8192)])
+            del vectors
+        else:
+            centroids = np.zeros((1, dimensions), dtype=np.float32)
+            assignment = np.zeros(0, dtype=np.int64)
+        lists = np.argsort(assignment, kind='stable').astype(np.int64)
+        offsets = np.searchsorted(assignment[lists], np.arange(len(centroids) + 1)).astype(np.int64)
+        np.savez(self._model_file(meta['model_id']), centroids=centroids, lists=lists, offsets=offsets)
+        return {'lists': len(centroids), 'indexed_rows': rows}
+
+    def _embed_query(self, text: str):
+        spans = passage_spans(text, self.passage_words)
+        if not spans:
+            return spans, None
+        return spans, self.embedder.encode([text[start:end] for start, end in spans]).astype(np.float32)
+
+    def score(self, text: str, doc_ids: Iterable[int]) -> Dict[int, float]:
+        with self._lock:
+            if self.meta is None:
+                return {}
+            sources = self._sources()
+        _, query = self._embed_query(text)
+        if query is None:
+            return {}
+        scores = {}
+        for doc_id, block in self._doc_blocks(sources, doc_ids):
+            best = (query @ np.asarray(block, dtype=np.float32).T).max(axis=1)
+            scores[doc_id] = round(float(np.clip(best, 0.0, 1.0).mean()) * 100, 2)
+        return scores
+
+    @staticmethod
+    def _best(rows: Dict[str, Any], candidates, vector, limit: int) -> List[Tuple[float, int, int, int]]:
+        similarities = np.asarray(rows['vectors'][candidates], dtype=np.float32) @ vector
+        best = np.argsort(-similarities)[:limit]
+        return [(float(similarities[i]), int(rows['docs'][candidates[i]]), int(rows['spans'][candidates[i]][0]),
+                 int(rows['spans'][candidates[i]][1])) for i in best]
+
+    def search(self, text: str, top_k: Optional[int] = None) -> List[Dict[str, Any]]:
+        top_k = top_k or self.top_k
+        with self._lock:
+            if self.meta is None:
+                return []
+            rows, extra, ivf = self._rows, self._extra, self._model
+            indexed_rows = self.meta['indexed_rows']
+        query_spans, query = self._embed_query(text)
+        if query is None:
+            return []
+        centroids, lists, offsets = ivf['centroids'], ivf['lists'], ivf['offsets']
+        n_probe = min(self.n_probe, len(centroids))
+        probes = np.argsort(-(query @ centroids.T), axis=1)[:, :n_probe]
+        tail = np.arange(indexed_rows, len(rows['docs']), dtype=np.int64)
+        limit = top_k * 2
+        passages = []
+        for (start, end), vector, lists_probed in zip(query_spans, query, probes):
+            candidates = np.concatenate([lists[offsets[i]:offsets[i + 1]] for i in lists_probed] + [tail])
+            hits = self._best(rows, candidates, vector, limit) if len(candidates) else []
+            scanned = len(candidates)
+            if extra:
+                hits = sorted(hits + self._best(extra, np.arange(len(extra['docs'])), vector, limit),
+                              reverse=True)[:limit]
+                scanned += len(extra['docs'])
+            if hits:
+                passages.append((start, end, hits, scanned))
+        live = self.db_manager.existing_document_ids({hit[1] for _, _, hits, _ in passages for hit in hits})
+        results = []
+        for start, end, hits, scanned in passages:
+            results.append({
+                'start': start,
+                'end': end,
+                'neighbours': [{
+                    'doc_id': doc_id,
+                    'start': hit_start,
+                    'end': hit_end,
+                    'similarity': round(min(max(similarity, 0.0), 1.0) * 100, 2)
+                } for similarity, doc_id, hit_start, hit_end in hits if doc_id in live][:top_k],
+                'candidates_scanned': scanned
+            })
+        return results
+
+    def candidates(self, text: str, limit: int) -> List[int]:
+        best: Dict[int, float] = {}
+        passages = self.search(text)
+        for passage in passages:
+            seen = {}
+            for neighbour in passage['neighbours']:
+                seen[neighbour['doc_id']] = max(seen.get(neighbour['doc_id'], 0.0), neighbour['similarity'])
+            for doc_id, value in seen.items():
+                best[doc_id] = best.get(doc_id, 0.0) + value
+        return sorted(best, key=best.get, reverse=True)[:limit]
+
+    def _statistics(self) -> Dict[str, Any]:
+        extra_rows = len(self._extra.get('docs', ()))
+        return {
+            'embedder': self.meta['embedder'],
+            'dimensions': self.meta['dimensions'],
+            'lists': self.meta['lists'],
+            'passages': self.meta['rows'] + extra_rows,
+            'unindexed_passages': self.meta['rows'] - self.meta['indexed_rows'] + extra_rows
+        }
@@ -0,0 +1,220 @@
+import json
+import os
+import tempfile
+import time
+import zipfile
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from core.database import prepare_text
+from core.ultimate_engine import UltimatePlagiarismEngine
+
+DOCUMENT_LISTS = ('.json', '.jsonl')
+_worker_engine = None
+
+
+def _init_worker(config):
+    global _worker_engine
+    _worker_engine = UltimatePlagiarismEngine(config)
+
+
+def _extract_member(archive: str, member: str) -> str:
+    with zipfile.ZipFile(archive) as zf:
+        data = zf.read(member)
+    handle, path = tempfile.mkstemp(suffix=Path(member).suffix)
+    try:
+        with os.fdopen(handle, 'wb') as f:
+            f.write(data)
+        return _worker_engine.extract_text(path)
+    finally:
+        os.unlink(path)
+
+
+def _prepare_in_worker(kind: str, location, doc: Dict[str, Any], codec: str, level: int) -> Dict[str, Any]:
+    if kind == 'file':
+        doc['text'] = _worker_engine.extract_text(location)
+    elif kind == 'member':
+        doc['text'] = _extract_member(*location)
+    doc['blob'] = prepare_text(doc.get('text') or '', codec, level)
+    doc.pop('text', None)
+    return doc
+
+
+class BulkImporter:
+    def __init__(self, config, db_manager, category: str = 'General', max_workers: Optional[int] = None,
+                 chunk_size: int = 1000):
+        self.config = config
+        self.db_manager = db_manager
+        self.category = category
+        self.max_workers = max(1, max_workers or config.get('performance.max_threads', 4))
+        self.chunk_size = max(1, chunk_size)
+        self.formats = {suffix.lower() for suffix in config.get('file_handling.supported_formats', ['.txt'])}
+        self.encoding = config.get('file_handling.encoding', 'utf-8')
+
+    def _accepts(self, name: str) -> bool:
+        suffix = Path(name).suffix.lower()
+        return suffix in self.formats or suffix in DOCUMENT_LISTS
+
+    def _document(self, doc: Dict[str, Any], default_source: str) -> Dict[str, Any]:
+        if not isinstance(doc, dict) or not isinstance(doc.get('text'), str):
+            raise ValueError("Each imported document needs a 'text' field")
+        return {
+            'source': doc.get('source') or default_source,
+            'text': doc['text'],
+            'url': doc.get('url', ''),
+            'category': doc.get('category') or self.category,
+            'metadata': doc.get('metadata')
+        }
+
+    def _iter_document_list(self, name: str, lines: Iterable[str]) -> Iterator[Tuple[str, Any, Dict]]:
+        if name.lower().endswith('.jsonl'):
+            for number, line in enumerate(lines, 1):
+                if not line.strip():
+                    continue
+                try:
+                    doc = self._document(json.loads(line), f"{name}:{number}")
+                except ValueError as e:
+                    yield 'error', None, {'source': name, 'line': number, 'error': str(e)}
+                    continue
+                yield 'document', None, doc
+        else:
+            data = json.loads(''.join(lines))
+            if not isinstance(data, list):
+                raise ValueError(f"{name}: JSON import must be a list of documents")
+            for number, doc in enumerate(data, 1):
+                try:
+                    doc = self._document(doc, f"{name}:{number}")
+                except ValueError as e:
+                    yield 'error', None, {'source': name, 'item': number, 'error': str(e)}
+                    continue
+                yield 'document', None, doc
+
+    def _iter_archive(self, path: Path) -> Iterator[Tuple[str, Any, Dict]]:
+        with zipfile.ZipFile(path) as zf:
+            members = [info.filename for info in zf.infolist()
+                       if not info.is_dir() and self._accepts(info.filename)]
+            for member in members:
+                name = f"{path.name}/{member}"
+                if member.lower().endswith(DOCUMENT_LISTS):
+                    with zf.open(member) as f:
+                        lines = (line.decode(self.encoding, errors='replace') for line in f)
+                        yield from self._iter_document_list(name, lines)
+                else:
+                    yield 'member', (str(path), member), {'source': name, 'category': self.category}
+
+    def sources(self, paths: Iterable[str]) -> Iterator[Tuple[str, Any, Dict]]:
+        for path in map(Path, paths):
+            if path.is_dir():
+                for child in sorted(path.rglob('*')):
+                    if child.is_file() and (self._accepts(child.name) or child.suffix.lower() == '.zip'):
+                        yield from self._iter_guarded(child, child.relative_to(path).as_posix())
+            else:
+                yield from self._iter_guarded(path, path.name)
+
+    def _iter_guarded(self, path: Path, source: str) -> Iterator[Tuple[str, Any, Dict]]:
+        try:
+            yield from self._iter_path(path, source)
+        except (OSError, ValueError, zipfile.BadZipFile) as e:
+            yield 'error', None, {'source': source, 'error': str(e)}
+
+    def _iter_path(self, path: Path, source: str) -> Iterator[Tuple[str, Any, Dict]]:
+        suffix = path.suffix.lower()
+        if suffix == '.zip':
+            yield from self._iter_archive(path)
+        elif suffix in DOCUMENT_LISTS:
+            with open(path, 'r', encoding=self.encoding) as f:
+                yield from self._iter_document_list(source, f)
+        else:
+            yield 'file', str(path), {'source': source, 'category': self.category}
+
+    def run(self, paths: Iterable[str],
+            on_progress: Optional[Callable[[Dict[str, Any]], None]] = None) -> Dict[str, Any]:
+        start = time.perf_counter()
+        summary = {'processed': 0, 'added': 0, 'skipped': 0, 'failed': 0, 'recovered': 0, 'errors': []}
+        chunk: List[Dict[str, Any]] = []
+        index_seconds = 0.0
+
+        def index(doc_ids: List[int]):
+            nonlocal index_seconds
+            index_start = time.perf_counter()
+            self.db_manager.index_documents(doc_ids)
+            index_seconds += time.perf_counter() - index_start
+
+        pending = self.db_manager.unindexed_document_ids()
+        if pending:
+            index(pending)
+            summary['recovered'] = len(pending)
+
+        def flush():
+            if chunk:
+                inserted = self.db_manager.insert_documents(chunk)
+                index(inserted['doc_ids'])
+                summary['added'] += len(inserted['doc_ids'])
+                summary['skipped'] += inserted['skipped']
+                chunk.clear()
+            if on_progress is not None:
+                on_progress(self._progress(summary, start, 'importing'))
+
+        finished = {}
+        next_position = 0
+
+        def drain():
+            nonlocal next_position
+            while next_position in finished:
+                kind, item = finished.pop(next_position)
+                next_position += 1
+                summary['processed'] += 1
+                if kind == 'document':
+                    chunk.append(item)
+                else:
+                    summary['failed'] += 1
+                    summary['errors'].append(item)
+                if len(chunk) >= self.chunk_size:
+                    flush()
+
+        def collect(done, pending):
+            for future in done:
+                position, source = pending.pop(future)
+                try:
+                    finished[position] = ('document', future.result())
+                except Exception as e:
+                    finished[position] = ('error', {'source': source, 'error': str(e)})
+            drain()
+
+        codec, level = self.db_manager.compression, self.db_manager.compression_level
+        with ProcessPoolExecutor(max_workers=self.max_workers, initializer=_init_worker,
+                                 initargs=(self.config,)) as pool:
+            pending = {}
+            for position, (kind, location, doc) in enumerate(self.sources(paths)):
+                if kind == 'error':
+                    finished[position] = ('error', doc)
+                    drain()
+                    continue
+                pending[pool.submit(_prepare_in_worker, kind, location, doc, codec, level)] = (position, doc['source'])
+                while len(pending) + len(finished) >= self.max_workers * 4:
+                    done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                    collect(done, pending)
+            if pending:
+                done, _ = wait(pending)
+                collect(done, pending)
+        flush()
+
+        wall = time.perf_counter() - start
+        summary['timings'] = {'import_s': round(wall - index_seconds, 3), 'index_s': round(index_seconds, 3),
+                              'wall_s': round(wall, 3)}
+        summary['docs_per_second'] = round(summary['added'] / wall, 2) if wall else 0.0
+        summary['workers'] = self.max_workers
+        return summary
+
+    @staticmethod
+    def _progress(summary: Dict[str, Any], start: float, stage: str) -> Dict[str, Any]:
+        elapsed = time.perf_counter() - start
+        return {
+            'stage': stage,
+            'processed': summary['processed'],
+            'added': summary['added'],
+            'skipped': summary['skipped'],
+            'failed': summary['failed'],
+            'docs_per_second': round(summary['processed'] / elapsed, 2) if elapsed else 0.0
+        }
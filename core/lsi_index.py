@@ -0,0 +1,114 @@
+import math
+from collections import Counter
+from datetime import datetime, timedelta
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from core.utils import tokenize
+from core.lazy import lazy_import
+from core.persisted_index import PersistedIndex
+
+np = lazy_import('numpy')
+sp = lazy_import('scipy.sparse')
+sklearn_extmath = lazy_import('sklearn.utils.extmath')
+
+
+class LSIIndex(PersistedIndex):
+    DIRECTORY_SUFFIX = '.lsi'
+    PATH_KEY = 'indexing.lsi_path'
+
+    def __init__(self, config, db_manager):
+        super().__init__(config, db_manager, config.get('indexing.lsi_rebuild_fraction', 0.25))
+        self.n_components = config.get('indexing.lsi_components', 100)
+        self.max_features = config.get('indexing.lsi_max_features', 50000)
+        self.min_df = config.get('indexing.lsi_min_df', 2)
+        self.fit_sample = config.get('indexing.lsi_fit_sample', 20000)
+        self.drift_threshold = config.get('indexing.lsi_drift_threshold', 0.15)
+        self.rebuild_days = config.get('indexing.lsi_rebuild_days', 30)
+
+    def _row_layout(self, meta: Dict[str, Any]) -> Dict[str, Tuple[Any, tuple]]:
+        return {'docs': (np.int64, ()), 'vectors': (np.float32, (meta['components'],))}
+
+    def _load_model(self, meta: Dict[str, Any]):
+        with np.load(self._model_file(meta['model_id'])) as model:
+            terms = {term: column for column, term in enumerate(model['terms'].tolist())}
+            return terms, model['idf'], np.ascontiguousarray(model['components'].T)
+
+    def _vectorize(self, texts: Iterable[str], terms: Dict[str, int], idf):
+        indptr, indices, data = [0], [], []
+        for text in texts:
+            counts = Counter(term for term in tokenize(text) if term in terms)
+            weights = [(terms[term], (1 + math.log(count)) * idf[terms[term]]) for term, count in counts.items()]
+            norm = math.sqrt(sum(weight * weight for _, weight in weights)) or 1.0
+            indices.extend(column for column, _ in weights)
+            data.extend(weight / norm for _, weight in weights)
+            indptr.append(len(indices))
+        return sp.csr_matrix((np.asarray(data, dtype=np.float32), np.asarray(indices, dtype=np.int64),
+                              np.asarray(indptr, dtype=np.int64)), shape=(len(indptr) - 1, len(terms)))
+
+    @staticmethod
+    def _project(matrix, basis) -> Tuple[Any, Any]:
+        dense = np.asarray(matrix @ basis, dtype=np.float32)
+        energy = np.linalg.norm(dense, axis=1)
+        vectors = dense / np.where(energy > 0, energy, 1.0)[:, None]
+        return vectors.astype(np.float32), energy
+
+    def _fit(self, model_id: str) -> Optional[Tuple[Dict[str, Any], Any]]:
+        vocabulary = self.db_manager.top_terms(self.min_df, self.max_features)
+        sample = self.db_manager.sample_document_texts(self.fit_sample)
+        k = min(self.n_components, len(sample) - 1, len(vocabulary) - 1)
+        if k < 2:
+            return None
+        n_docs = self.db_manager.count_documents()
+        terms = {term: column for column, (term, _) in enumerate(vocabulary)}
+        idf = np.array([math.log((1 + n_docs) / (1 + df)) + 1 for _, df in vocabulary], dtype=np.float32)
+        matrix = self._vectorize((text for _, text in sample), terms, idf)
+        _, _, components = sklearn_extmath.randomized_svd(matrix, k, n_iter=5, random_state=42)
+        components = components.astype(np.float32)
+        basis = np.ascontiguousarray(components.T)
+        fit_energy = float(self._project(matrix, basis)[1].mean())
+        np.savez(self._model_file(model_id), terms=np.array([term for term, _ in vocabulary]),
+                 idf=idf, components=components)
+        return {
+            'components': k,
+            'vocabulary': len(vocabulary),
+            'fit_documents': len(sample),
+            'fit_energy': fit_energy,
+            'folded_energy': 0.0
+        }, (terms, idf, basis)
+
+    def _encode(self, model, documents: List[Tuple[int, str]]) -> Optional[Dict[str, Any]]:
+        terms, idf, basis = model
+        vectors, energy = self._project(self._vectorize((text for _, text in documents), terms, idf), basis)
+        return {'docs': np.array([doc_id for doc_id, _ in documents], dtype=np.int64), 'vectors': vectors,
+                'energy': float(energy.sum())}
+
+    def _folded(self, meta: Dict[str, Any], totals: Dict[str, Any]):
+        meta['folded_energy'] += totals.get('energy', 0.0)
+
+    def drift(self) -> float:
+        if not self.meta or self.meta['folded'] < 50 or not self.meta['fit_energy']:
+            return 0.0
+        folded_energy = self.meta['folded_energy'] / self.meta['folded']
+        return max(0.0, 1 - folded_energy / self.meta['fit_energy'])
+
+    def needs_rebuild(self) -> bool:
+        if super().needs_rebuild() or self.drift() > self.drift_threshold:
+            return True
+        built = datetime.fromisoformat(self.meta['built'])
+        return self.rebuild_days > 0 and datetime.now() - built > timedelta(days=self.rebuild_days)
+
+    def score(self, text: str, doc_ids: Iterable[int]) -> Dict[int, float]:
+        with self._lock:
+            if self.meta is None:
+                return {}
+            (terms, idf, basis), sources = self._model, self._sources()
+        query, _ = self._project(self._vectorize([text], terms, idf), basis)
+        return {doc_id: round(max(float(block[0] @ query[0]), 0.0) * 100, 2)
+                for doc_id, block in self._doc_blocks(sources, doc_ids)}
+
+    def _statistics(self) -> Dict[str, Any]:
+        return {
+            'components': self.meta['components'],
+            'vocabulary': self.meta['vocabulary'],
+            'drift': round(self.drift(), 4)
+        }
@@ -0,0 +1,314 @@
+import json
+import os
+from abc import ABC, abstractmethod
+import threading
+import time
+import uuid
+from contextlib import ExitStack
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from core.lazy import lazy_import
+
+np = lazy_import('numpy')
+
+LOCK_STALE_SECONDS = 600
+INDEX_FORMAT = 2
+
+
+class PersistedIndex(ABC):
+    DIRECTORY_SUFFIX = ''
+    PATH_KEY = ''
+
+    def __init__(self, config, db_manager, rebuild_fraction: float = 0.25):
+        self.config = config
+        self.db_manager = db_manager
+        self.path = Path(config.get(self.PATH_KEY) or db_manager.db_path.with_suffix(self.DIRECTORY_SUFFIX))
+        self.rebuild_fraction = rebuild_fraction
+        self.batch_size = 1000
+        self.writable = not db_manager.read_only
+        self.meta: Optional[Dict[str, Any]] = None
+        self._lock = threading.RLock()
+        self._meta_mtime = None
+        self._model = None
+        self._rows: Dict[str, Any] = {}
+        self._extra: Dict[str, Any] = {}
+        self._extra_documents = 0
+        self._extra_last_id = 0
+        self._synced = None
+        self._builder: Optional[threading.Thread] = None
+
+    @property
+    def model_id(self) -> Optional[str]:
+        return self.meta['model_id'] if self.meta else None
+
+    @property
+    def building(self) -> bool:
+        return self._builder is not None and self._builder.is_alive()
+
+    @abstractmethod
+    def _row_layout(self, meta: Dict[str, Any]) -> Dict[str, Tuple[Any, tuple]]:
+        pass
+
+    @abstractmethod
+    def _fit(self, model_id: str) -> Optional[Tuple[Dict[str, Any], Any]]:
+        pass
+
+    @abstractmethod
+    def _encode(self, model, documents: List[Tuple[int, str]]) -> Optional[Dict[str, Any]]:
+        pass
+
+    def _load_model(self, meta: Dict[str, Any]):
+        return None
+
+    def _finish(self, meta: Dict[str, Any]) -> Dict[str, Any]:
+        return {}
+
+    def _folded(self, meta: Dict[str, Any], totals: Dict[str, Any]):
+        pass
+
+    def _compatible(self, meta: Dict[str, Any]) -> bool:
+        return True
+
+    def _statistics(self) -> Dict[str, Any]:
+        return {}
+
+    def _file(self, name: str, model_id: str) -> Path:
+        return self.path / f"{name}-{model_id}.bin"
+
+    def _model_file(self, model_id: str) -> Path:
+        return self.path / f"model-{model_id}.npz"
+
+    def _write_meta(self, meta: Dict[str, Any]):
+        temp = self.path / 'meta.json.tmp'
+        temp.write_text(json.dumps(meta, indent=2), encoding='utf-8')
+        os.replace(temp, self.path / 'meta.json')
+
+    def _acquire(self) -> Optional[Path]:
+        lock = self.path / 'write.lock'
+        try:
+            if time.time() - lock.stat().st_mtime > LOCK_STALE_SECONDS:
+                lock.unlink()
+        except OSError:
+            pass
+        try:
+            os.close(os.open(lock, os.O_CREAT | os.O_EXCL | os.O_WRONLY))
+        except OSError:
+            return None
+        return lock
+
+    def _open_rows(self, meta: Dict[str, Any]) -> Dict[str, Any]:
+        rows = {}
+        for name, (dtype, shape) in self._row_layout(meta).items():
+            if meta['rows']:
+                rows[name] = np.memmap(self._file(name, meta['model_id']), dtype=dtype, mode='r',
+                                       shape=(meta['rows'],) + shape)
+            else:
+                rows[name] = np.zeros((0,) + shape, dtype=dtype)
+        return rows
+
+    def _load(self) -> bool:
+        meta_path = self.path / 'meta.json'
+        try:
+            mtime = meta_path.stat().st_mtime_ns
+        except OSError:
+            self.meta = None
+            return False
+        if mtime == self._meta_mtime:
+            return self.meta is not None
+        meta = json.loads(meta_path.read_text(encoding='utf-8'))
+        self._meta_mtime = mtime
+        if meta.get('format') != INDEX_FORMAT or not self._compatible(meta):
+            self.meta = None
+            return False
+        if self.meta is None or meta['model_id'] != self.meta['model_id']:
+            self._model = self._load_model(meta)
+            self._extra, self._extra_documents, self._extra_last_id = {}, 0, 0
+        self._rows = self._open_rows(meta)
+        self.meta = meta
+        self._synced = None
+        return True
+
+    def _append_rows(self, meta: Dict[str, Any], model, documents: Iterable[Tuple[int, str]]) -> Dict[str, Any]:
+        layout = self._row_layout(meta)
+        totals = {'rows': 0, 'documents': 0, 'last_id': meta['last_id']}
+        with ExitStack() as stack:
+            handles = {}
+            for name, (dtype, shape) in layout.items():
+                handles[name] = stack.enter_context(open(self._file(name, meta['model_id']), 'ab'))
+                handles[name].truncate(meta['rows'] * np.dtype(dtype).itemsize * int(np.prod(shape)))
+            batch = []
+            for document in documents:
+                batch.append(document)
+                if len(batch) >= self.batch_size:
+                    self._write_batch(model, batch, layout, handles, totals)
+                    batch = []
+            if batch:
+                self._write_batch(model, batch, layout, handles, totals)
+        return totals
+
+    def _write_batch(self, model, batch: List[Tuple[int, str]], layout: Dict[str, Tuple[Any, tuple]],
+                     handles: Dict[str, Any], totals: Dict[str, Any]):
+        encoded = self._encode(model, batch)
+        totals['documents'] += len(batch)
+        totals['last_id'] = batch[-1][0]
+        if encoded is None:
+            return
+        for name, (dtype, _) in layout.items():
+            handles[name].write(np.ascontiguousarray(encoded[name], dtype=dtype).tobytes())
+        totals['rows'] += len(encoded['docs'])
+        for key, value in encoded.items():
+            if key not in layout:
+                totals[key] = totals.get(key, 0.0) + value
+
+    def rebuild(self) -> bool:
+        self.path.mkdir(parents=True, exist_ok=True)
+        lock = self._acquire()
+        if lock is None:
+            with self._lock:
+                return self._load()
+        try:
+            built = self._rebuild()
+        finally:
+            lock.unlink()
+        with self._lock:
+            return self._load() and built
+
+    def _rebuild(self) -> bool:
+        start = time.perf_counter()
+        corpus = self.db_manager.get_corpus_version()
+        if corpus is None:
+            return False
+        model_id = uuid.uuid4().hex[:12]
+        fitted = self._fit(model_id)
+        if fitted is None:
+            return False
+        meta, model = fitted
+        meta.update(model_id=model_id, format=INDEX_FORMAT, rows=0, last_id=0)
+        totals = self._append_rows(meta, model, self.db_manager.iter_document_texts(self.batch_size))
+        meta.update(rows=totals['rows'], documents=totals['documents'], documents_at_build=totals['documents'],
+                    last_id=totals['last_id'], corpus=list(corpus), built=datetime.now().isoformat(), folded=0)
+        meta.update(self._finish(meta))
+        meta['build_s'] = round(time.perf_counter() - start, 3)
+        self._write_meta(meta)
+        for stale in self.path.glob('*-*.*'):
+            if model_id not in stale.name:
+                try:
+                    stale.unlink()
+                except OSError:
+                    pass
+        return True
+
+    def _build_in_background(self):
+        try:
+            self.rebuild()
+        except Exception as e:
+            print(f"Warning: Could not rebuild {self.path.name}: {e}")
+
+    def _request_rebuild(self, background: bool) -> bool:
+        if not background:
+            return self.rebuild()
+        if not self.building:
+            self._builder = threading.Thread(target=self._build_in_background, daemon=True)
+            self._builder.start()
+        return False
+
+    def _fold_in(self, corpus: Tuple[str, int]):
+        last_id = max(self.meta['last_id'], self._extra_last_id)
+        documents = self.db_manager.iter_document_texts(self.batch_size, after_id=last_id)
+        lock = self._acquire() if self.writable and not self._extra else None
+        if lock is None:
+            self._fold_in_memory(list(documents))
+            return
+        try:
+            meta = dict(self.meta)
+            totals = self._append_rows(meta, self._model, documents)
+            if totals['documents']:
+                meta.update(rows=meta['rows'] + totals['rows'], documents=meta['documents'] + totals['documents'],
+                            last_id=totals['last_id'], corpus=list(corpus), folded=meta['folded'] + totals['documents'])
+                self._folded(meta, totals)
+                self._write_meta(meta)
+        finally:
+            lock.unlink()
+        self._load()
+
+    def _fold_in_memory(self, documents: List[Tuple[int, str]]):
+        if not documents:
+            return
+        self._extra_documents += len(documents)
+        self._extra_last_id = documents[-1][0]
+        encoded = self._encode(self._model, documents)
+        if encoded is None:
+            return
+        for name, (dtype, _) in self._row_layout(self.meta).items():
+            part = np.asarray(encoded[name], dtype=dtype)
+            self._extra[name] = np.concatenate([self._extra[name], part]) if name in self._extra else part
+
+    def removed_documents(self) -> int:
+        if not self.meta:
+            return 0
+        return max(0, self.meta['documents'] - self.db_manager.count_documents(self.meta['last_id']))
+
+    def needs_rebuild(self) -> bool:
+        if not self.meta:
+            return True
+        changed = self.meta['folded'] + self._extra_documents + self.removed_documents()
+        return changed > self.rebuild_fraction * max(1, self.meta['documents_at_build'])
+
+    def sync(self, background: bool = False, build: bool = True) -> bool:
+        with self._lock:
+            loaded = self._load()
+            corpus = self.db_manager.get_corpus_version()
+            if corpus is None:
+                return loaded
+            build = build and self.writable
+            if not loaded or corpus[0] != self.meta['corpus'][0]:
+                return build and self._request_rebuild(background)
+            if tuple(self.meta['corpus']) == corpus or self._synced == corpus:
+                return True
+            last_id = max(self.meta['last_id'], self._extra_last_id)
+            pending = self.db_manager.count_documents() - self.db_manager.count_documents(last_id)
+            if build and pending > self.rebuild_fraction * max(1, self.meta['documents_at_build']):
+                return self._request_rebuild(background) or background
+            self._fold_in(corpus)
+            self._synced = corpus
+            if build and self.needs_rebuild():
+                self._request_rebuild(background)
+            return True
+
+    def _sources(self) -> List[Dict[str, Any]]:
+        return [self._rows, self._extra] if self._extra else [self._rows]
+
+    @staticmethod
+    def _doc_blocks(sources: List[Dict[str, Any]], doc_ids: Iterable[int],
+                    name: str = 'vectors') -> Iterator[Tuple[int, Any]]:
+        doc_ids = list(doc_ids)
+        found: Dict[int, list] = {}
+        for rows in sources:
+            starts = np.searchsorted(rows['docs'], doc_ids, side='left')
+            ends = np.searchsorted(rows['docs'], doc_ids, side='right')
+            for doc_id, start, end in zip(doc_ids, starts, ends):
+                if end > start:
+                    found.setdefault(doc_id, []).append(rows[name][start:end])
+        for doc_id, blocks in found.items():
+            yield doc_id, blocks[0] if len(blocks) == 1 else np.concatenate(blocks)
+
+    def get_statistics(self) -> Dict[str, Any]:
+        with self._lock:
+            self._load()
+            if self.meta is None:
+                return {'built': False, 'building': self.building}
+            size = sum(path.stat().st_size for path in self.path.glob(f"*-{self.meta['model_id']}.*"))
+            statistics = {
+                'built': self.meta['built'],
+                'model_id': self.meta['model_id'],
+                'documents': self.meta['documents'] + self._extra_documents,
+                'folded_in': self.meta['folded'] + self._extra_documents,
+                'removed': self.removed_documents(),
+                'needs_rebuild': self.needs_rebuild(),
+                'building': self.building,
+                'size_mb': round(size / (1024 * 1024), 2)
+            }
+            statistics.update(self._statistics())
+            return statistics
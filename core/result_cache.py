@@ -0,0 +1,139 @@
+import hashlib
+import json
+import sqlite3
+import time
+import zlib
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+from core.sqlite_cache import SQLiteCache
+
+
+class ResultCache(SQLiteCache):
+    FILENAME = 'results.sqlite'
+    ENABLED_KEY = 'performance.result_cache_enabled'
+    SIZE_KEY = 'performance.result_cache_size_mb'
+    DEFAULT_SIZE_MB = 200
+    SCHEMA = '''
+        CREATE TABLE IF NOT EXISTS results (
+            key TEXT PRIMARY KEY,
+            corpus TEXT NOT NULL,
+            corpus_version INTEGER NOT NULL,
+            data BLOB NOT NULL,
+            size INTEGER NOT NULL,
+            accessed REAL NOT NULL
+        );
+        CREATE TABLE IF NOT EXISTS pair_scores (
+            text_hash TEXT NOT NULL,
+            algorithm TEXT NOT NULL,
+            doc_id INTEGER NOT NULL,
+            settings TEXT NOT NULL,
+            scope TEXT NOT NULL,
+            reference_hash TEXT,
+            score REAL NOT NULL,
+            sequences BLOB,
+            size INTEGER NOT NULL,
+            accessed REAL NOT NULL,
+            PRIMARY KEY (text_hash, algorithm, doc_id, settings)
+        ) WITHOUT ROWID;
+        CREATE INDEX IF NOT EXISTS idx_results_accessed ON results(accessed);
+        CREATE INDEX IF NOT EXISTS idx_results_corpus ON results(corpus, corpus_version);
+        CREATE INDEX IF NOT EXISTS idx_pair_scores_accessed ON pair_scores(accessed);
+        DROP TABLE IF EXISTS algorithm_results;
+    '''
+    TABLES = {'results': ('key',), 'pair_scores': ('text_hash', 'algorithm', 'doc_id', 'settings')}
+
+    def __init__(self, config=None):
+        self.partial_hits = 0
+        self.pair_hits = 0
+        self.pair_misses = 0
+        super().__init__(config)
+
+    @staticmethod
+    def text_hash(text: str) -> str:
+        return hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+    @staticmethod
+    def digest(value: Any) -> str:
+        return hashlib.sha256(json.dumps(value, sort_keys=True).encode('utf-8')).hexdigest()[:16]
+
+    def result_key(self, text_hash: str, corpus: Tuple[str, int], algorithms: Iterable[str],
+                   settings: Dict[str, Any]) -> str:
+        descriptor = {'algorithms': sorted(algorithms), 'settings': settings}
+        return f"{text_hash}:{corpus[0]}:{corpus[1]}:{self.digest(descriptor)}"
+
+    @staticmethod
+    def _pack(value: Any) -> bytes:
+        return zlib.compress(json.dumps(value, separators=(',', ':')).encode('utf-8'), 6)
+
+    @staticmethod
+    def _unpack(data: bytes) -> Any:
+        return json.loads(zlib.decompress(data).decode('utf-8'))
+
+    def get_result(self, key: str) -> Optional[Dict[str, Any]]:
+        with self._connect() as conn:
+            row = conn.execute('SELECT data FROM results WHERE key = ?', (key,)).fetchone()
+            if row is None:
+                return None
+            conn.execute('UPDATE results SET accessed = ? WHERE key = ?', (time.time(), key))
+        return self._unpack(row[0])
+
+    def put_result(self, key: str, corpus: Tuple[str, int], results: Dict[str, Any]):
+        data = self._pack(results)
+        if len(data) > self.max_bytes:
+            return
+        with self._connect() as conn:
+            self._prune(conn, corpus)
+            conn.execute('INSERT OR REPLACE INTO results (key, corpus, corpus_version, data, size, accessed) '
+                         'VALUES (?, ?, ?, ?, ?, ?)', (key, corpus[0], corpus[1], data, len(data), time.time()))
+            self._evict(conn)
+
+    def get_pair_scores(self, text_hash: str, settings: Dict[str, str], scopes: Dict[str, str],
+                        reference_hashes: Dict[int, Optional[str]]) -> Dict[str, Dict[int, tuple]]:
+        cached = {algo: {} for algo in settings}
+        with self._connect() as conn:
+            rows = conn.execute('SELECT algorithm, doc_id, settings, scope, reference_hash, score, sequences '
+                                'FROM pair_scores WHERE text_hash = ?', (text_hash,)).fetchall()
+            used = []
+            for algo, doc_id, settings_key, scope, reference_hash, score, sequences in rows:
+                if algo not in cached or settings_key != settings[algo] or scope != scopes[algo]:
+                    continue
+                if doc_id not in reference_hashes or reference_hash != reference_hashes[doc_id]:
+                    continue
+                cached[algo][doc_id] = (score, self._unpack(sequences) if sequences is not None else None)
+                used.append((time.time(), text_hash, algo, doc_id, settings_key))
+            conn.executemany('UPDATE pair_scores SET accessed = ? '
+                             'WHERE text_hash = ? AND algorithm = ? AND doc_id = ? AND settings = ?', used)
+        return cached
+
+    def put_pair_scores(self, text_hash: str, settings: Dict[str, str], scopes: Dict[str, str],
+                        scores: Iterable[tuple]):
+        now = time.time()
+        rows = []
+        for algo, doc_id, reference_hash, score, sequences in scores:
+            data = self._pack(sequences) if sequences is not None else None
+            rows.append((text_hash, algo, doc_id, settings[algo], scopes[algo], reference_hash, score, data,
+                         48 + (len(data) if data else 0), now))
+        if not rows:
+            return
+        with self._connect() as conn:
+            conn.executemany('INSERT OR REPLACE INTO pair_scores (text_hash, algorithm, doc_id, settings, scope, '
+                             'reference_hash, score, sequences, size, accessed) '
+                             'VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)', rows)
+            self._evict(conn)
+
+    def _prune(self, conn: sqlite3.Connection, corpus: Tuple[str, int]):
+        conn.execute('DELETE FROM results WHERE corpus = ? AND corpus_version < ?', corpus)
+
+    def _lookups(self) -> int:
+        return self.hits + self.partial_hits + self.misses
+
+    def get_statistics(self) -> Dict[str, Any]:
+        statistics = super().get_statistics()
+        pair_lookups = self.pair_hits + self.pair_misses
+        statistics.update({
+            'partial_hits': self.partial_hits,
+            'pair_hits': self.pair_hits,
+            'pair_misses': self.pair_misses,
+            'pair_hit_ratio': round(self.pair_hits / pair_lookups * 100, 2) if pair_lookups else 0.0
+        })
+        return statistics
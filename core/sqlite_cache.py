@@ -0,0 +1,92 @@
+import sqlite3
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, Tuple
+
+
+class SQLiteCache:
+    FILENAME = ''
+    ENABLED_KEY = ''
+    SIZE_KEY = ''
+    DEFAULT_SIZE_MB = 100
+    SCHEMA = ''
+    TABLES: Dict[str, Tuple[str, ...]] = {}
+
+    def __init__(self, config=None):
+        config = config or {}
+        self.enabled = config.get(self.ENABLED_KEY, True)
+        self.max_bytes = int(config.get(self.SIZE_KEY, self.DEFAULT_SIZE_MB) * 1024 * 1024)
+        self.path = Path(config.get('paths.cache', 'data/cache/')) / self.FILENAME
+        self.hits = 0
+        self.misses = 0
+        if self.enabled:
+            self._initialize()
+
+    @contextmanager
+    def _connect(self):
+        conn = sqlite3.connect(str(self.path), timeout=30)
+        try:
+            yield conn
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        finally:
+            conn.close()
+
+    def _initialize(self):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with self._connect() as conn:
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.executescript(self.SCHEMA)
+
+    def _evict(self, conn: sqlite3.Connection):
+        total = sum(conn.execute(f'SELECT COALESCE(SUM(size), 0) FROM {table}').fetchone()[0]
+                    for table in self.TABLES)
+        if total <= self.max_bytes:
+            return
+        excess = total - self.max_bytes
+        tables = list(self.TABLES)
+        width = max(len(keys) for keys in self.TABLES.values())
+        query = ' UNION ALL '.join(
+            f"SELECT {position}, {', '.join(list(keys) + ['NULL'] * (width - len(keys)))}, size, accessed "
+            f"FROM {table}" for position, (table, keys) in enumerate(self.TABLES.items()))
+        evicted = {table: [] for table in tables}
+        for row in conn.execute(query + ' ORDER BY accessed'):
+            table = tables[row[0]]
+            evicted[table].append(row[1:1 + len(self.TABLES[table])])
+            excess -= row[-2]
+            if excess <= 0:
+                break
+        for table, rows in evicted.items():
+            condition = ' AND '.join(f'{column} = ?' for column in self.TABLES[table])
+            conn.executemany(f'DELETE FROM {table} WHERE {condition}', rows)
+
+    def clear(self) -> int:
+        if not self.enabled:
+            return 0
+        with self._connect() as conn:
+            return sum(conn.execute(f'DELETE FROM {table}').rowcount for table in self.TABLES)
+
+    def _lookups(self) -> int:
+        return self.hits + self.misses
+
+    def get_statistics(self) -> Dict[str, Any]:
+        counts = {table: 0 for table in self.TABLES}
+        size = 0
+        if self.enabled:
+            with self._connect() as conn:
+                for table in self.TABLES:
+                    counts[table], table_size = conn.execute(
+                        f'SELECT COUNT(*), COALESCE(SUM(size), 0) FROM {table}').fetchone()
+                    size += table_size
+        lookups = self._lookups()
+        statistics = dict(counts)
+        statistics.update({
+            'size_mb': round(size / (1024 * 1024), 2),
+            'max_size_mb': round(self.max_bytes / (1024 * 1024), 2),
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_ratio': round(self.hits / lookups * 100, 2) if lookups else 0.0
+        })
+        return statistics
@@ -0,0 +1,585 @@
+import sqlite3
+import time
+from collections import Counter
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional, Any, Iterable, Iterator, Tuple
+
+from core.utils import tokenize, tokenize_with_offsets, split_sentences, prefetch
+from algorithms import similarity
+
+DEFAULT_ALGORITHMS = ['cosine_tfidf', 'jaccard', 'ngram_3', 'sequence']
+CORPUS_DEPENDENT_ALGORITHMS = ('cosine_tfidf', 'lsi')
+MODEL_ALGORITHMS = ('lsi', 'semantic')
+
+
+class UltimatePlagiarismEngine:
+    def __init__(self, config):
+        self.config = config
+        self.threshold = config.get('detection.ultimate.threshold', 5.0)
+        self.min_match_length = config.get('detection.ultimate.min_match_length', 3)
+        self.enable_readability = config.get('detection.ultimate.enable_readability', True)
+        self.enable_nlp = config.get('detection.ultimate.enable_nlp', True)
+        self.candidate_top_k = config.get('indexing.candidate_top_k', 50)
+        self.candidate_strategy = config.get('indexing.candidate_strategy', 'shingles')
+        self.winnowing_k = config.get('indexing.winnowing_k', 5)
+        self.winnowing_window = config.get('indexing.winnowing_window', 4)
+        self.page_prefetch = config.get('performance.page_prefetch', 4)
+        self.near_duplicate_distance = config.get('detection.ultimate.near_duplicate_distance', 3)
+        self.near_duplicate_shortcut = config.get('detection.ultimate.near_duplicate_shortcut', True)
+        self.result_cache_enabled = config.get('performance.result_cache_enabled', True)
+        self.build_models = config.get('indexing.build_models', True)
+        self.vector_index = None
+        self.lsi_index = None
+        self.embedding_index = None
+        self.result_cache = None
+
+    def tokenize(self, text: str) -> List[str]:
+        return tokenize(text)
+
+    def extract_text(self, filepath: str) -> str:
+        suffix = Path(filepath).suffix.lower()
+        if suffix == '.pdf':
+            from file_handlers.pdf_handler import PDFHandler
+            return PDFHandler(self.config).extract_text(filepath)
+        if suffix == '.docx':
+            from file_handlers.docx_handler import DOCXHandler
+            return DOCXHandler(self.config).extract_text(filepath)
+        if suffix in ('.odt', '.epub'):
+            raise ValueError(f"No text extractor available for {suffix} files")
+        encoding = self.config.get('file_handling.encoding', 'utf-8')
+        return Path(filepath).read_text(encoding=encoding, errors='replace')
+
+    def extract_pages(self, filepath: str) -> Iterator[Tuple[int, str]]:
+        if Path(filepath).suffix.lower() == '.pdf':
+            from file_handlers.pdf_handler import PDFHandler
+            yield from PDFHandler(self.config).iter_pages(filepath)
+        else:
+            yield 1, self.extract_text(filepath)
+
+    def analyze_pages(self, pages: Iterable[Tuple[int, str]], database: Optional[List[Dict]],
+                      algorithms: Optional[List[str]] = None, candidate_index=None) -> Dict[str, Any]:
+        start = time.perf_counter()
+        parts = []
+        offsets = []
+        position = 0
+        page_count = 0
+        for _, page_text in prefetch(pages, self.page_prefetch):
+            if parts:
+                parts.append('\n')
+                position += 1
+            offsets.extend((token, begin + position, end + position)
+                           for token, begin, end in tokenize_with_offsets(page_text))
+            parts.append(page_text)
+            position += len(page_text)
+            page_count += 1
+        streaming_ms = round((time.perf_counter() - start) * 1000, 2)
+        results = self.analyze_comprehensive(''.join(parts), database, algorithms, candidate_index, offsets)
+        results['metadata']['pages'] = page_count
+        results['metadata']['timings']['extraction_ms'] = streaming_ms
+        results['metadata']['timings']['total_ms'] = round((time.perf_counter() - start) * 1000, 2)
+        return results
+
+    def attach_database(self, db_manager):
+        from core.vector_index import CorpusVectorIndex
+        if self.vector_index is not None:
+            db_manager.remove_listener(self.vector_index)
+        self.vector_index = CorpusVectorIndex(self.config)
+        db_manager.add_listener(self.vector_index)
+        self.vector_index.build_in_background(db_manager.iter_document_texts())
+
+    @property
+    def vector_index_ready(self) -> bool:
+        return self.vector_index is not None and self.vector_index.ready
+
+    def select_candidates(self, tokens: List[str], candidate_index,
+                          text: Optional[str] = None) -> Dict[str, Any]:
+        start = time.perf_counter()
+        doc_ids = []
+        stats = {}
+        estimated = {}
+        if self.candidate_strategy in ('shingles', 'both'):
+            shingle_candidates = candidate_index.find_candidates(tokens, self.candidate_top_k)
+            doc_ids.extend(shingle_candidates['doc_ids'])
+            stats.update(shingle_candidates['stats'])
+        if self.candidate_strategy in ('lsh', 'both'):
+            lsh_candidates = candidate_index.query_lsh(tokens, self.candidate_top_k)
+            doc_ids.extend(doc_id for doc_id in lsh_candidates['doc_ids'] if doc_id not in doc_ids)
+            estimated = lsh_candidates['estimated_jaccard']
+            stats['corpus_size'] = lsh_candidates['stats']['corpus_size']
+            stats['lsh'] = lsh_candidates['stats']
+        if self.candidate_strategy == 'cosine' and self.vector_index_ready:
+            vector_start = time.perf_counter()
+            cosine_candidates = self.vector_index.score(text or ' '.join(tokens), 'tfidf',
+                                                        top_k=self.candidate_top_k)
+            doc_ids.extend(cosine_candidates)
+            stats['corpus_size'] = len(self.vector_index)
+            stats['cosine'] = {'retrieval_ms': round((time.perf_counter() - vector_start) * 1000, 2)}
+        elif self.candidate_strategy == 'cosine':
+            shingle_candidates = candidate_index.find_candidates(tokens, self.candidate_top_k)
+            doc_ids.extend(shingle_candidates['doc_ids'])
+            stats.update(shingle_candidates['stats'])
+            stats['cosine'] = {'fallback': 'shingles'}
+        if self.candidate_strategy == 'semantic' and self._sync_embedding_index(candidate_index):
+            semantic_start = time.perf_counter()
+            doc_ids.extend(self.embedding_index.candidates(text or ' '.join(tokens), self.candidate_top_k))
+            stats['corpus_size'] = self.embedding_index.meta['documents']
+            stats['semantic'] = {'retrieval_ms': round((time.perf_counter() - semantic_start) * 1000, 2)}
+        elif self.candidate_strategy == 'semantic':
+            shingle_candidates = candidate_index.find_candidates(tokens, self.candidate_top_k)
+            doc_ids.extend(shingle_candidates['doc_ids'])
+            stats.update(shingle_candidates['stats'])
+            stats['semantic'] = {'fallback': 'shingles'}
+        if not stats:
+            raise ValueError(f"Unknown candidate strategy: {self.candidate_strategy}")
+
+        stats['strategy'] = self.candidate_strategy
+        stats['candidates_selected'] = len(doc_ids)
+        stats['retrieval_ms'] = round((time.perf_counter() - start) * 1000, 2)
+        return {
+            'documents': candidate_index.get_documents_by_ids(doc_ids),
+            'estimated_jaccard': estimated,
+            'stats': stats
+        }
+
+    def _algorithm_settings(self, algo: str) -> Dict[str, Any]:
+        if algo == 'sequence':
+            return {'min_match_length': self.min_match_length}
+        if algo == 'winnowing':
+            return {'k': self.winnowing_k, 'window': self.winnowing_window}
+        if algo in ('cosine_tfidf', 'cosine_count'):
+            return {'vector_index': self.vector_index_ready}
+        return {}
+
+    def _cache_context(self, text: str, algorithms: List[str], candidate_index,
+                       models: Dict[str, str]) -> Optional[Dict[str, Any]]:
+        if candidate_index is None or not self.result_cache_enabled:
+            return None
+        corpus = candidate_index.get_corpus_version()
+        if corpus is None:
+            return None
+        if self.result_cache is None:
+            from core.result_cache import ResultCache
+            self.result_cache = ResultCache(self.config)
+        text_hash = self.result_cache.text_hash(text)
+        return {
+            'text_hash': text_hash,
+            'corpus': corpus,
+            'result_key': self.result_cache.result_key(text_hash, corpus, algorithms, {
+                'algorithms': {algo: self._algorithm_settings(algo) for algo in algorithms},
+                'candidate_strategy': self.candidate_strategy,
+                'candidate_top_k': self.candidate_top_k,
+                'threshold': self.threshold,
+                'near_duplicate_distance': self.near_duplicate_distance,
+                'near_duplicate_shortcut': self.near_duplicate_shortcut,
+                'models': models
+            })
+        }
+
+    def find_near_duplicates(self, tokens: List[str], candidate_index) -> Optional[Dict[str, Any]]:
+        if not tokens or self.near_duplicate_distance < 0:
+            return None
+        fingerprint = candidate_index.compute_simhash(tokens)
+        return {
+            'simhash': f"{fingerprint:016x}",
+            'max_distance': self.near_duplicate_distance,
+            'documents': candidate_index.find_near_duplicates(fingerprint, self.near_duplicate_distance),
+            'history': candidate_index.find_near_duplicates(fingerprint, self.near_duplicate_distance,
+                                                            kind='history'),
+            'short_circuit': False
+        }
+
+    def _sync_lsi_index(self, candidate_index) -> bool:
+        if self.lsi_index is None or self.lsi_index.db_manager is not candidate_index:
+            from core.lsi_index import LSIIndex
+            self.lsi_index = LSIIndex(self.config, candidate_index)
+        try:
+            return self.lsi_index.sync(background=True, build=self.build_models)
+        except (OSError, ValueError, KeyError, sqlite3.Error) as e:
+            print(f"Warning: LSI index unavailable: {e}")
+            return False
+
+    def _sync_embedding_index(self, candidate_index) -> bool:
+        if self.embedding_index is None or self.embedding_index.db_manager is not candidate_index:
+            from core.embedding_index import EmbeddingIndex
+            self.embedding_index = EmbeddingIndex(self.config, candidate_index)
+        try:
+            return self.embedding_index.sync(background=True, build=self.build_models)
+        except (OSError, ValueError, KeyError, sqlite3.Error) as e:
+            print(f"Warning: Embedding index unavailable: {e}")
+            return False
+
+    def _sync_models(self, algorithms: List[str], candidate_index) -> Dict[str, str]:
+        models = {}
+        if candidate_index is None:
+            return models
+        if 'lsi' in algorithms and self._sync_lsi_index(candidate_index):
+            models['lsi'] = self.lsi_index.model_id
+        if 'semantic' in algorithms and self._sync_embedding_index(candidate_index):
+            models['semantic'] = self.embedding_index.model_id
+        return models
+
+    def _pair_scopes(self, algorithms: List[str], corpus: Tuple[str, int],
+                     reference_ids: List[int], models: Optional[Dict[str, str]] = None) -> Dict[str, str]:
+        corpus_scope = f"{corpus[0]}:{corpus[1]}"
+        models = models or {}
+        scopes = {}
+        for algo in algorithms:
+            if algo in models:
+                scopes[algo] = f"{algo}:{models[algo]}"
+            elif algo == 'lsi':
+                scopes[algo] = f"{corpus_scope}:{self.result_cache.digest(reference_ids)}"
+            elif algo in CORPUS_DEPENDENT_ALGORITHMS or (algo == 'cosine_count' and self.vector_index_ready):
+                scopes[algo] = corpus_scope
+            else:
+                scopes[algo] = ''
+        return scopes
+
+    def analyze_comprehensive(self, text: str, database: Optional[List[Dict]],
+                              algorithms: Optional[List[str]] = None,
+                              candidate_index=None,
+                              offsets: Optional[List[Tuple[str, int, int]]] = None) -> Dict[str, Any]:
+        start = time.perf_counter()
+        algorithms = list(algorithms or DEFAULT_ALGORITHMS)
+        models = self._sync_models(algorithms, candidate_index)
+        cache = self._cache_context(text, algorithms, candidate_index, models)
+        if cache is not None:
+            try:
+                results = self.result_cache.get_result(cache['result_key'])
+            except sqlite3.Error as e:
+                print(f"Warning: Result cache unavailable: {e}")
+                results, cache = None, None
+            if results is not None:
+                self.result_cache.hits += 1
+                near_duplicates = results['metadata'].get('near_duplicates')
+                if near_duplicates:
+                    near_duplicates['history'] = candidate_index.find_near_duplicates(
+                        int(near_duplicates['simhash'], 16), near_duplicates['max_distance'], kind='history')
+                results['metadata']['analysis_date'] = datetime.now().isoformat()
+                results['metadata']['timings'] = {
+                    'scoring_ms': 0.0,
+                    'total_ms': round((time.perf_counter() - start) * 1000, 2)
+                }
+                self._record_result_hit(results, algorithms)
+                return results
+        if offsets is None:
+            offsets = tokenize_with_offsets(text)
+        tokens = [token for token, _, _ in offsets]
+
+        retrieval_stats = None
+        estimated_jaccard = {}
+        near_duplicates = self.find_near_duplicates(tokens, candidate_index) if candidate_index is not None else None
+        if near_duplicates and near_duplicates['documents'] and self.near_duplicate_shortcut:
+            references = candidate_index.get_documents_by_ids([doc['id'] for doc in near_duplicates['documents']])
+            near_duplicates['short_circuit'] = True
+            retrieval_stats = {
+                'strategy': 'simhash',
+                'candidates_selected': len(references),
+                'retrieval_ms': near_duplicates['documents'][0]['lookup_ms']
+            }
+        elif candidate_index is not None:
+            candidates = self.select_candidates(tokens, candidate_index, text)
+            references = candidates['documents']
+            retrieval_stats = candidates['stats']
+            estimated_jaccard = candidates['estimated_jaccard']
+        else:
+            references = database or []
+
+        cached = {}
+        if cache is not None:
+            reference_hashes = {doc['id']: doc.get('content_hash') for doc in references}
+            cache['pair_settings'] = {algo: self.result_cache.digest(self._algorithm_settings(algo))
+                                      for algo in algorithms}
+            cache['scopes'] = self._pair_scopes(algorithms, cache['corpus'], list(reference_hashes), models)
+            try:
+                cached = self.result_cache.get_pair_scores(cache['text_hash'], cache['pair_settings'],
+                                                           cache['scopes'], reference_hashes)
+            except sqlite3.Error as e:
+                print(f"Warning: Result cache unavailable: {e}")
+                cache = None
+        missing = {algo: [doc.get('id') for doc in references if doc.get('id') not in cached.get(algo, {})]
+                   for algo in algorithms}
+
+        scoring_start = time.perf_counter()
+        query_fingerprints = []
+        reference_fingerprints = None
+        if missing.get('winnowing'):
+            query_fingerprints = similarity.winnowing_fingerprints(tokens, self.winnowing_k,
+                                                                   self.winnowing_window)
+            if candidate_index is not None:
+                reference_fingerprints = candidate_index.lookup_fingerprints(
+                    [value for value, _ in query_fingerprints], missing['winnowing'])
+
+        vector_scores = {}
+        if self.vector_index_ready and candidate_index is not None:
+            for algo, kind in (('cosine_tfidf', 'tfidf'), ('cosine_count', 'count')):
+                if missing.get(algo):
+                    vector_scores[algo] = self.vector_index.score(text, kind, doc_ids=missing[algo])
+        if 'lsi' in models and missing.get('lsi'):
+            vector_scores['lsi'] = self.lsi_index.score(text, missing['lsi'])
+        if 'semantic' in models and missing.get('semantic'):
+            vector_scores['semantic'] = self.embedding_index.score(text, missing['semantic'])
+
+        computed = []
+        matches = self._score_references(text, tokens, references, algorithms,
+                                         query_fingerprints, reference_fingerprints, vector_scores,
+                                         candidate_index, cached, computed)
+        for match in matches:
+            self._describe_sequences(match['matched_sequences'], text, offsets)
+        for match in matches:
+            if match['doc_id'] in estimated_jaccard:
+                match['estimated_jaccard'] = estimated_jaccard[match['doc_id']]
+        scoring_ms = round((time.perf_counter() - scoring_start) * 1000, 2)
+
+        results = self._build_results(text, tokens, matches, algorithms)
+        results['metadata']['timings'] = {
+            'scoring_ms': scoring_ms,
+            'total_ms': round((time.perf_counter() - start) * 1000, 2)
+        }
+        if retrieval_stats is not None:
+            results['metadata']['candidate_retrieval'] = retrieval_stats
+        results['metadata']['documents_scored'] = len(references)
+        if near_duplicates is not None:
+            results['metadata']['simhash'] = near_duplicates['simhash']
+            results['metadata']['near_duplicates'] = near_duplicates
+        if candidate_index is not None:
+            fallbacks = [algo for algo in algorithms if algo in MODEL_ALGORITHMS and algo not in models]
+            if fallbacks:
+                results['metadata']['model_fallbacks'] = fallbacks
+        if cache is not None:
+            self._record_cache_use(results, algorithms, cached, computed)
+            try:
+                self.result_cache.put_pair_scores(cache['text_hash'], cache['pair_settings'], cache['scopes'],
+                                                  computed)
+                self.result_cache.put_result(cache['result_key'], cache['corpus'], results)
+            except sqlite3.Error as e:
+                print(f"Warning: Could not cache analysis results: {e}")
+        return results
+
+    @staticmethod
+    def _record_result_hit(results: Dict[str, Any], algorithms: List[str]):
+        usage = results['metadata'].get('score_cache', {})
+        for algo, entry in usage.items():
+            lookups = entry['hits'] + entry['computed']
+            usage[algo] = {'hits': lookups, 'computed': 0, 'hit_ratio': 100.0 if lookups else 0.0}
+            if algo in results['algorithm_scores']:
+                results['algorithm_scores'][algo]['cache_hit_ratio'] = usage[algo]['hit_ratio']
+        results['metadata']['result_cache'] = {'hit': True, 'algorithms_reused': algorithms,
+                                               'algorithms_computed': []}
+
+    def _record_cache_use(self, results: Dict[str, Any], algorithms: List[str],
+                          cached: Dict[str, Dict], computed: List[tuple]):
+        fresh = Counter(algo for algo, *_ in computed)
+        usage = {}
+        for algo in algorithms:
+            hits = len(cached.get(algo, {}))
+            lookups = hits + fresh[algo]
+            usage[algo] = {
+                'hits': hits,
+                'computed': fresh[algo],
+                'hit_ratio': round(hits / lookups * 100, 2) if lookups else 0.0
+            }
+            if algo in results['algorithm_scores']:
+                results['algorithm_scores'][algo]['cache_hit_ratio'] = usage[algo]['hit_ratio']
+        hits = sum(entry['hits'] for entry in usage.values())
+        self.result_cache.pair_hits += hits
+        self.result_cache.pair_misses += len(computed)
+        if hits:
+            self.result_cache.partial_hits += 1
+        else:
+            self.result_cache.misses += 1
+        results['metadata']['score_cache'] = usage
+        results['metadata']['result_cache'] = {
+            'hit': False,
+            'algorithms_reused': [algo for algo in algorithms if usage[algo]['hits'] and not fresh[algo]],
+            'algorithms_computed': [algo for algo in algorithms if fresh[algo]]
+        }
+
+    @staticmethod
+    def _restore_sequences(algo: str, tokens: List[str], spans: Optional[List[list]]) -> List[Dict]:
+        sequences = []
+        for position_a, position_b, length in spans or []:
+            seq = {'length': length, 'position_a': position_a, 'position_b': position_b}
+            if algo == 'sequence':
+                seq['text'] = ' '.join(tokens[position_a:position_a + length])
+            sequences.append(seq)
+        return sequences
+
+    def _score_references(self, text: str, tokens: List[str], references: List[Dict],
+                          algorithms: List[str], query_fingerprints: Optional[List[tuple]] = None,
+                          reference_fingerprints: Optional[Dict[int, List[tuple]]] = None,
+                          vector_scores: Optional[Dict[str, Dict[int, float]]] = None,
+                          term_index=None, cached: Optional[Dict[str, Dict[int, tuple]]] = None,
+                          computed: Optional[List[tuple]] = None) -> List[Dict[str, Any]]:
+        vector_scores = vector_scores or {}
+        cached = cached or {}
+        if not tokens or not references:
+            return []
+        missing = {algo: {doc.get('id') for doc in references if doc.get('id') not in cached.get(algo, {})}
+                   for algo in algorithms}
+        reference_tokens = [self.tokenize(doc['text'])
+                            if any(doc.get('id') in missing[algo] for algo in algorithms) else None
+                            for doc in references]
+        idf = None
+        if missing.get('cosine_tfidf') and term_index is not None and \
+                len(vector_scores.get('cosine_tfidf', {})) < len(missing['cosine_tfidf']):
+            vocabulary = set(tokens)
+            for doc, ref_tokens in zip(references, reference_tokens):
+                if doc.get('id') in missing['cosine_tfidf']:
+                    vocabulary.update(ref_tokens)
+            idf = term_index.get_idf(vocabulary)
+        lsi_scores = []
+        if missing.get('lsi') and 'lsi' not in vector_scores:
+            lsi_scores = similarity.lsi_similarities(text, [doc['text'] for doc in references])
+
+        automaton = similarity.SuffixAutomaton(tokens) if missing.get('sequence') else None
+        matches = []
+        for idx, doc in enumerate(references):
+            ref_tokens = reference_tokens[idx]
+            if ref_tokens is not None and not ref_tokens:
+                continue
+            sequences = []
+            scores = {}
+            for algo in algorithms:
+                hit = cached.get(algo, {}).get(doc.get('id'))
+                if hit is not None:
+                    scores[algo] = hit[0]
+                    if algo == 'sequence' or (algo == 'winnowing' and 'sequence' not in algorithms):
+                        sequences = self._restore_sequences(algo, tokens, hit[1])
+                    continue
+                found = None
+                if algo == 'sequence':
+                    sequences = similarity.find_matching_sequences(tokens, ref_tokens, self.min_match_length,
+                                                                   automaton)
+                    scores[algo] = similarity.sequence_similarity(tokens, sequences)
+                    found = sequences
+                elif algo == 'winnowing':
+                    if reference_fingerprints is not None:
+                        ref_fingerprints = reference_fingerprints.get(doc.get('id'), [])
+                    else:
+                        ref_fingerprints = similarity.winnowing_fingerprints(
+                            ref_tokens, self.winnowing_k, self.winnowing_window)
+                    winnowed = similarity.winnowing_matches(query_fingerprints or [], ref_fingerprints,
+                                                            self.winnowing_k, self.winnowing_window)
+                    scores[algo] = winnowed['score']
+                    found = winnowed['regions']
+                    if 'sequence' not in algorithms:
+                        sequences = found
+                elif algo in MODEL_ALGORITHMS and algo in vector_scores:
+                    scores[algo] = vector_scores[algo].get(doc.get('id'), 0.0)
+                elif algo == 'lsi':
+                    scores[algo] = lsi_scores[idx] if lsi_scores else 0.0
+                elif algo in vector_scores and doc.get('id') in vector_scores[algo]:
+                    scores[algo] = vector_scores[algo][doc['id']]
+                elif algo == 'semantic':
+                    scores[algo] = similarity.semantic_similarity(text, doc['text'])
+                elif algo == 'cosine_tfidf':
+                    scores[algo] = similarity.cosine_tfidf(tokens, ref_tokens, idf)
+                else:
+                    scores[algo] = self._score_pair(algo, tokens, ref_tokens)
+                if computed is not None:
+                    spans = None if found is None else [(seq['position_a'], seq['position_b'], seq['length'])
+                                                        for seq in found]
+                    computed.append((algo, doc.get('id'), doc.get('content_hash'), scores[algo], spans))
+
+            overall = round(sum(scores.values()) / len(scores), 2) if scores else 0.0
+            if overall < self.threshold:
+                continue
+            agreeing = sum(1 for score in scores.values() if score >= self.threshold)
+            matches.append({
+                'doc_id': doc.get('id'),
+                'source': doc.get('source', 'Unknown'),
+                'url': doc.get('url', ''),
+                'similarity': overall,
+                'confidence': self._get_confidence(agreeing, len(scores)),
+                'risk_level': self._get_risk_level(overall),
+                'algorithm_scores': scores,
+                'matched_sequences': sequences,
+                'total_sequences': len(sequences)
+            })
+
+        matches.sort(key=lambda match: match['similarity'], reverse=True)
+        return matches
+
+    def _describe_sequences(self, sequences: List[Dict], text: str, offsets: List[tuple]):
+        for seq in sequences:
+            first = offsets[seq['position_a']]
+            last = offsets[min(seq['position_a'] + seq['length'], len(offsets)) - 1]
+            seq['start_char'] = first[1]
+            seq['end_char'] = last[2]
+            seq.setdefault('text', text[first[1]:last[2]])
+
+    def _score_pair(self, algo: str, tokens: List[str], ref_tokens: List[str]) -> float:
+        if algo == 'cosine_tfidf':
+            return similarity.cosine_tfidf(tokens, ref_tokens)
+        if algo == 'cosine_count':
+            return similarity.cosine_count(tokens, ref_tokens)
+        if algo == 'jaccard':
+            return similarity.jaccard(tokens, ref_tokens)
+        if algo == 'overlap':
+            return similarity.overlap(tokens, ref_tokens)
+        if algo == 'dice':
+            return similarity.dice(tokens, ref_tokens)
+        if algo.startswith('ngram_'):
+            return similarity.ngram_similarity(tokens, ref_tokens, int(algo.split('_')[1]))
+        raise ValueError(f"Unknown algorithm: {algo}")
+
+    def _build_results(self, text: str, tokens: List[str], matches: List[Dict],
+                       algorithms: List[str]) -> Dict[str, Any]:
+        covered = set()
+        all_sequences = []
+        for match in matches:
+            for seq in match['matched_sequences']:
+                covered.update(range(seq['position_a'], seq['position_a'] + seq['length']))
+                all_sequences.append(seq['length'])
+
+        total_words = len(tokens)
+        unique_words = total_words - len(covered)
+        algorithm_scores = {}
+        for algo in algorithms:
+            values = [match['algorithm_scores'][algo] for match in matches if algo in match['algorithm_scores']]
+            if values:
+                algorithm_scores[algo] = {
+                    'average': round(sum(values) / len(values), 2),
+                    'max': max(values),
+                    'min': min(values)
+                }
+
+        return {
+            'overall_similarity': max((match['similarity'] for match in matches), default=0.0),
+            'total_words': total_words,
+            'total_sentences': len(split_sentences(text)),
+            'total_characters': len(text),
+            'matches': matches,
+            'statistics': {
+                'matched_words': len(covered),
+                'unique_words': unique_words,
+                'unique_percentage': round(unique_words / total_words * 100, 2) if total_words else 100.0,
+                'high_risk_sources': sum(1 for match in matches if match['similarity'] >= 30),
+                'total_sequences': len(all_sequences),
+                'average_sequence_length': round(sum(all_sequences) / len(all_sequences), 2) if all_sequences else 0,
+                'longest_sequence': max(all_sequences, default=0)
+            },
+            'algorithm_scores': algorithm_scores,
+            'metadata': {
+                'algorithms_used': algorithms,
+                'analysis_date': datetime.now().isoformat()
+            }
+        }
+
+    def _get_confidence(self, agreeing: int, total: int) -> str:
+        ratio = agreeing / total if total else 0
+        if ratio >= 0.7:
+            return 'High'
+        elif ratio >= 0.4:
+            return 'Medium'
+        return 'Low'
+
+    def _get_risk_level(self, similarity_score: float) -> str:
+        if similarity_score < 15:
+            return 'Low'
+        elif similarity_score < 30:
+            return 'Moderate'
+        elif similarity_score < 50:
+            return 'High'
+        return 'Critical'
@@ -0,0 +1,85 @@
+import re
+import hashlib
+import queue
+import threading
+from typing import List, Iterable, Iterator, Tuple
+
+WORD_PATTERN = re.compile(r"\b\w+\b", re.UNICODE)
+SENTENCE_PATTERN = re.compile(r'(?<=[.!?])\s+')
+
+
+def tokenize(text: str) -> List[str]:
+    if not text:
+        return []
+    return WORD_PATTERN.findall(text.lower())
+
+
+def tokenize_with_offsets(text: str) -> List[Tuple[str, int, int]]:
+    if not text:
+        return []
+    return [(m.group(0).lower(), m.start(), m.end()) for m in WORD_PATTERN.finditer(text)]
+
+
+def split_sentences(text: str) -> List[str]:
+    if not text:
+        return []
+    return [s.strip() for s in SENTENCE_PATTERN.split(text.strip()) if s.strip()]
+
+
+def passage_spans(text: str, words: int = 40) -> List[Tuple[int, int]]:
+    tokens = tokenize_with_offsets(text)
+    boundaries = [m.start() for m in SENTENCE_PATTERN.finditer(text)]
+    spans = []
+    first = 0
+    boundary = 0
+    for i, (_, start, end) in enumerate(tokens):
+        while boundary < len(boundaries) and boundaries[boundary] < end:
+            boundary += 1
+        count = i - first + 1
+        at_sentence_end = i + 1 == len(tokens) or \
+            (boundary < len(boundaries) and boundaries[boundary] <= tokens[i + 1][1])
+        if (count >= words and at_sentence_end) or count >= 2 * words:
+            spans.append((tokens[first][1], end))
+            first = i + 1
+    if first < len(tokens):
+        spans.append((tokens[first][1], tokens[-1][2]))
+    return spans
+
+
+def stable_hash(value: str) -> int:
+    digest = hashlib.blake2b(value.encode('utf-8'), digest_size=8).digest()
+    return int.from_bytes(digest, 'big', signed=True)
+
+
+def word_shingles(tokens: List[str], size: int) -> List[str]:
+    if len(tokens) < size:
+        return [' '.join(tokens)] if tokens else []
+    return [' '.join(tokens[i:i + size]) for i in range(len(tokens) - size + 1)]
+
+
+def shingle_hashes(tokens: List[str], size: int) -> List[int]:
+    return [stable_hash(shingle) for shingle in word_shingles(tokens, size)]
+
+
+def prefetch(items: Iterable, depth: int = 4) -> Iterator:
+    buffer = queue.Queue(maxsize=max(1, depth))
+    done = object()
+    failure = []
+
+    def produce():
+        try:
+            for item in items:
+                buffer.put(item)
+        except BaseException as e:
+            failure.append(e)
+        finally:
+            buffer.put(done)
+
+    threading.Thread(target=produce, daemon=True).start()
+    while True:
+        item = buffer.get()
+        if item is done:
+            break
+        yield item
+    if failure:
+        raise failure[0]
@@ -0,0 +1,171 @@
+import threading
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from core.utils import tokenize
+from core.lazy import lazy_import
+
+np = lazy_import('numpy')
+sp = lazy_import('scipy.sparse')
+sklearn_text = lazy_import('sklearn.feature_extraction.text')
+
+
+class CorpusVectorIndex:
+    def __init__(self, config):
+        self.config = config
+        self.n_features = config.get('indexing.vector_features', 2 ** 20)
+        self._lock = threading.RLock()
+        self._vectorizer = None
+        self._rows = []
+        self._doc_ids: List[int] = []
+        self._positions: Dict[int, int] = {}
+        self._removed = set()
+        self._tf = None
+        self._df = None
+        self._norms: List[float] = []
+        self._count_norms = None
+        self._tfidf_norms = None
+        self._idf = None
+        self._dirty = True
+        self._discarded = set()
+        self._builder: Optional[threading.Thread] = None
+
+    @property
+    def building(self) -> bool:
+        return self._builder is not None and self._builder.is_alive()
+
+    @property
+    def ready(self) -> bool:
+        return self._df is not None and not self.building
+
+    def _get_vectorizer(self):
+        if self._vectorizer is None:
+            self._vectorizer = sklearn_text.HashingVectorizer(analyzer=tokenize, n_features=self.n_features,
+                                                              alternate_sign=False, norm=None)
+        return self._vectorizer
+
+    def build(self, documents: Iterable[Tuple[int, str]]):
+        with self._lock:
+            self._rows = []
+            self._doc_ids = []
+            self._positions = {}
+            self._removed = set()
+            self._discarded = set()
+            self._norms = []
+            self._tf = None
+            self._df = np.zeros(self.n_features, dtype=np.int64)
+            self._dirty = True
+        for doc_id, text in documents:
+            row = self._get_vectorizer().transform([text])
+            with self._lock:
+                if doc_id not in self._positions and doc_id not in self._discarded:
+                    self._append(doc_id, row)
+        with self._lock:
+            self._discarded = set()
+            self._dirty = True
+
+    def build_in_background(self, documents: Iterable[Tuple[int, str]]):
+        self._builder = threading.Thread(target=self._build_in_background, args=(documents,), daemon=True)
+        self._builder.start()
+
+    def _build_in_background(self, documents: Iterable[Tuple[int, str]]):
+        try:
+            self.build(documents)
+        except Exception as e:
+            print(f"Warning: Could not build the corpus vector index: {e}")
+
+    def _append(self, doc_id: int, row):
+        self._positions[doc_id] = len(self._doc_ids)
+        self._doc_ids.append(doc_id)
+        self._rows.append(row)
+        self._norms.append(float(np.sqrt(row.data @ row.data)))
+        self._df[row.indices] += 1
+
+    def on_document_added(self, doc_id: int, text: str):
+        with self._lock:
+            if self._df is None:
+                self.build([])
+            if doc_id in self._positions:
+                self.on_document_removed(doc_id)
+            self._append(doc_id, self._get_vectorizer().transform([text]))
+            self._dirty = True
+
+    def on_document_removed(self, doc_id: int):
+        with self._lock:
+            position = self._positions.pop(doc_id, None)
+            if position is None:
+                if self.building:
+                    self._discarded.add(doc_id)
+                return
+            self._materialize_tf()
+            row = self._tf.getrow(position)
+            self._df[row.indices] -= 1
+            self._removed.add(position)
+            self._dirty = True
+
+    def _materialize_tf(self):
+        if self._rows:
+            blocks = ([self._tf] if self._tf is not None else []) + self._rows
+            self._tf = sp.vstack(blocks, format='csr')
+            self._rows = []
+        elif self._tf is None:
+            self._tf = sp.csr_matrix((0, self.n_features))
+
+    def _compact(self):
+        if not self._removed:
+            return
+        keep = np.array([i for i in range(len(self._doc_ids)) if i not in self._removed], dtype=np.int64)
+        self._tf = self._tf[keep]
+        self._doc_ids = [self._doc_ids[i] for i in keep]
+        self._norms = [self._norms[i] for i in keep]
+        self._positions = {doc_id: i for i, doc_id in enumerate(self._doc_ids)}
+        self._removed = set()
+
+    def _refresh(self):
+        if not self._dirty:
+            return
+        if self._df is None:
+            self.build([])
+        self._materialize_tf()
+        self._compact()
+        n_docs = len(self._doc_ids)
+        self._idf = np.log((1 + n_docs) / (1 + self._df)) + 1
+        weights = self._tf.data * self._idf[self._tf.indices]
+        squares = sp.csr_matrix((weights * weights, self._tf.indices, self._tf.indptr), shape=self._tf.shape)
+        self._tfidf_norms = np.sqrt(np.asarray(squares.sum(axis=1)).ravel())
+        self._count_norms = np.asarray(self._norms)
+        self._dirty = False
+
+    def __len__(self) -> int:
+        return len(self._positions)
+
+    def score(self, text: str, kind: str = 'tfidf', doc_ids: Optional[Iterable[int]] = None,
+              top_k: Optional[int] = None) -> Dict[int, float]:
+        with self._lock:
+            self._refresh()
+            if not self._doc_ids:
+                return {}
+            query = self._get_vectorizer().transform([text])
+            if kind == 'tfidf':
+                weighted = query.multiply(self._idf).tocsr()
+                query = weighted.multiply(self._idf).tocsr() / (np.linalg.norm(weighted.data) or 1.0)
+                norms = self._tfidf_norms
+            elif kind == 'count':
+                query = query / (np.linalg.norm(query.data) or 1.0)
+                norms = self._count_norms
+            else:
+                raise ValueError(f"Unknown vector kind: {kind}")
+            matrix = self._tf
+            if doc_ids is not None:
+                requested = [(doc_id, self._positions[doc_id]) for doc_id in doc_ids if doc_id in self._positions]
+            else:
+                doc_id_array = list(self._doc_ids)
+
+        scores = (matrix @ query.T).toarray().ravel() / np.where(norms > 0, norms, 1.0)
+        if doc_ids is not None:
+            return {doc_id: round(float(scores[position]) * 100, 2) for doc_id, position in requested}
+        if top_k is not None and 0 < top_k < len(scores):
+            selected = np.argpartition(-scores, top_k - 1)[:top_k]
+        else:
+            selected = np.arange(len(scores))
+        selected = selected[np.argsort(-scores[selected])]
+        return {doc_id_array[i]: round(float(scores[i]) * 100, 2) for i in selected if scores[i] > 0}
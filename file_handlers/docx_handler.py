@@ -7,7 +7,11 @@ from datetime import datetime
 import tempfile
 import os
 
+from file_handlers.extraction_cache import ExtractionCache
+
 class DOCXHandler:
+    EXTRACTOR_VERSION = '2'
+    RELATIONSHIPS_NS = 'http://schemas.openxmlformats.org/package/2006/relationships'
     NAMESPACES = {
         'w': 'http://schemas.openxmlformats.org/wordprocessingml/2006/main',
         'wp': 'http://schemas.openxmlformats.org/drawingml/2006/wordprocessingDrawing',
@@ -20,6 +24,8 @@ class DOCXHandler:
     
     def __init__(self, config=None):
         self.config = config or {}
+        self.cache = ExtractionCache(self.config)
+        self.warnings: List[str] = []
         self._register_namespaces()
     
     def _register_namespaces(self):
@@ -27,107 +33,106 @@ class DOCXHandler:
             ET.register_namespace(prefix, uri)
     
     def extract_text(self, filepath: str) -> str:
-        try:
-            return self._extract_with_docx(filepath)
-        except ImportError:
-            return self._extract_manual(filepath)
-        except Exception as e:
-            try:
-                return self._extract_manual(filepath)
-            except Exception as e2:
-                raise Exception(f"Failed to extract text from DOCX: {e2}")
+        return self.cache.get_or_extract(filepath, 'docx', self.EXTRACTOR_VERSION, None,
+                                         lambda: self._extract_text_uncached(filepath))
     
-    def _extract_with_docx(self, filepath: str) -> str:
-        from docx import Document
-        from docx.enum.style import WD_STYLE_TYPE
-        from docx.oxml.ns import qn
-        
-        doc = Document(filepath)
-        text_parts = []
-        for paragraph in doc.paragraphs:
-            if paragraph.text.strip():
-                text_parts.append(paragraph.text)
-        for table in doc.tables:
-            for row in table.rows:
-                for cell in row.cells:
-                    if cell.text.strip():
-                        text_parts.append(cell.text)
-        for section in doc.sections:
-            header = section.header
-            for paragraph in header.paragraphs:
-                if paragraph.text.strip():
-                    text_parts.append(paragraph.text)
-        footer = section.footer
-        for paragraph in footer.paragraphs:
-            if paragraph.text.strip():
-                text_parts.append(paragraph.text)
-        text_boxes = self._extract_text_boxes_from_docx(filepath)
-        text_parts.extend(text_boxes)
-        
-        return '\n'.join(text_parts)
-
-    def _extract_text_boxes_from_docx(self, filepath: str) -> List[str]:
-        text_boxes = []
+    def _extract_text_uncached(self, filepath: str) -> str:
         try:
             with zipfile.ZipFile(filepath) as docx:
-                if 'word/document.xml' not in docx.namelist():
-                    return text_boxes
-                xml_content = docx.read('word/document.xml').decode('utf-8')
-                
-                root = ET.fromstring(xml_content)
-                for shape in root.findall('.//w:txbxContent', self.NAMESPACES):
-                    for paragraph in shape.findall('.//w:p', self.NAMESPACES):
-                        text = self._extract_text_from_paragraph(paragraph)
-                        if text.strip():
-                            text_boxes.append(text)
-                
+                return self._extract_from_archive(docx)
         except Exception as e:
-            print(f"Warning: Could not extract text boxes: {e}")
-        
-        return text_boxes
+            raise Exception(f"Failed to extract text from DOCX: {e}")
     
-    def _extract_manual(self, filepath: str) -> str:
-        text_parts = []
-        
-        with zipfile.ZipFile(filepath) as docx:
-            if 'word/document.xml' in docx.namelist():
-                xml_content = docx.read('word/document.xml').decode('utf-8')
-                text_parts.append(self._parse_document_xml(xml_content))
-            header_texts = self._extract_headers_manual(docx)
-            text_parts.extend(header_texts)
-            footer_texts = self._extract_footers_manual(docx)
-            text_parts.extend(footer_texts)
-            footnote_texts = self._extract_footnotes_manual(docx)
-            text_parts.extend(footnote_texts)
-            endnote_texts = self._extract_endnotes_manual(docx)
-            text_parts.extend(endnote_texts)
+    def _extract_from_archive(self, docx: zipfile.ZipFile) -> str:
+        self.warnings = []
+        names = set(docx.namelist())
+        relationships = self._read_relationships(docx, names)
+        body, text_boxes = [], []
+        if 'word/document.xml' in names:
+            self._stream_part(docx, 'word/document.xml', body, text_boxes)
+        text_parts = ['\n'.join(body), '\n'.join(text_boxes)]
+        part_names = relationships.get('header', []) + relationships.get('footer', [])
+        part_names += [name for name in ('word/footnotes.xml', 'word/endnotes.xml') if name not in part_names]
+        for part_name in part_names:
+            if part_name in names:
+                paragraphs = []
+                self._stream_part(docx, part_name, paragraphs, paragraphs)
+                text_parts.append('\n'.join(paragraphs))
         return '\n'.join(filter(None, text_parts))
-
-    def _parse_document_xml(self, xml_content: str) -> str:
+    
+    def _read_relationships(self, docx: zipfile.ZipFile, names: set) -> Dict[str, List[str]]:
+        relationships = {}
+        if 'word/_rels/document.xml.rels' not in names:
+            return relationships
         try:
-            root = ET.fromstring(xml_content)
-            paragraphs = []
-            for para in root.findall('.//w:p', self.NAMESPACES):
-                para_text = self._extract_text_from_paragraph(para)
-                if para_text.strip():
-                    paragraphs.append(para_text)
-            
-            return '\n'.join(paragraphs)
-        except Exception as e:
-            print(f"Warning: Error parsing document XML: {e}")
-            return self._extract_text_regex(xml_content)
-
-    def _extract_text_from_paragraph(self, paragraph: ET.Element) -> str:
-        text_parts = []
-        for run in paragraph.findall('.//w:t', self.NAMESPACES):
-            if run.text:
-                text_parts.append(run.text)
-        for tab in paragraph.findall('.//w:tab', self.NAMESPACES):
-            text_parts.append('\t')
-        for br in paragraph.findall('.//w:br', self.NAMESPACES):
-            text_parts.append('\n')
-        
-        return ''.join(text_parts)
+            with docx.open('word/_rels/document.xml.rels') as stream:
+                root = ET.parse(stream).getroot()
+            for rel in root.iter(f"{{{self.RELATIONSHIPS_NS}}}Relationship"):
+                rel_type = rel.attrib.get('Type', '').rsplit('/', 1)[-1]
+                target = rel.attrib.get('Target', '')
+                if rel.attrib.get('TargetMode') == 'External' or not target:
+                    continue
+                path = target.lstrip('/') if target.startswith('/') else f"word/{target}"
+                relationships.setdefault(rel_type, []).append(path)
+        except ET.ParseError as e:
+            self.warnings.append(f"Could not parse document relationships: {e}")
+        return relationships
+    
+    def _stream_part(self, docx: zipfile.ZipFile, part_name: str, paragraphs: List[str], text_boxes: List[str]):
+        w = f"{{{self.NAMESPACES['w']}}}"
+        paragraph_tag, text_tag, tab_tag, br_tag = f"{w}p", f"{w}t", f"{w}tab", f"{w}br"
+        text_box_tag = f"{w}txbxContent"
+        fallback_tag = f"{{{self.NAMESPACES['mc']}}}Fallback"
+        buffers = []
+        depth = 0
+        text_box_depth = 0
+        fallback_depth = 0
+        parents = []
+        paragraph_count, text_box_count = len(paragraphs), len(text_boxes)
+        try:
+            with docx.open(part_name) as stream:
+                for event, elem in ET.iterparse(stream, events=('start', 'end')):
+                    tag = elem.tag
+                    if event == 'start':
+                        parents.append(elem)
+                        depth += 1
+                        if tag == fallback_tag:
+                            fallback_depth += 1
+                        elif fallback_depth:
+                            continue
+                        elif tag == paragraph_tag:
+                            buffers.append([])
+                        elif tag == text_box_tag:
+                            text_box_depth += 1
+                        continue
+                    parents.pop()
+                    depth -= 1
+                    if tag == fallback_tag:
+                        fallback_depth -= 1
+                    elif not fallback_depth:
+                        if tag == text_tag and buffers and elem.text:
+                            buffers[-1].append(elem.text)
+                        elif tag == tab_tag and buffers:
+                            buffers[-1].append('\t')
+                        elif tag == br_tag and buffers:
+                            buffers[-1].append('\n')
+                        elif tag == text_box_tag:
+                            text_box_depth -= 1
+                        elif tag == paragraph_tag:
+                            text = ''.join(buffers.pop())
+                            if text.strip():
+                                (text_boxes if text_box_depth else paragraphs).append(text)
+                    if tag == paragraph_tag:
+                        elem.clear()
+                    if depth <= 2:
+                        elem.clear()
+                        if parents:
+                            parents[-1].remove(elem)
+        except ET.ParseError as e:
+            self.warnings.append(f"Error parsing {part_name}, used plain-text fallback: {e}")
+            del paragraphs[paragraph_count:]
+            del text_boxes[text_box_count:]
+            paragraphs.append(self._extract_text_regex(docx.read(part_name).decode('utf-8', errors='replace')))
     
     def _extract_text_regex(self, xml_content: str) -> str:
         text = re.sub(r'<[^>]+>', ' ', xml_content)
@@ -137,78 +142,6 @@ class DOCXHandler:
         
         return text.strip()
     
-    def _extract_headers_manual(self, docx: zipfile.ZipFile) -> List[str]:
-        header_texts = []
-        try:
-            if 'word/_rels/document.xml.rels' in docx.namelist():
-                rels_content = docx.read('word/_rels/document.xml.rels').decode('utf-8')
-                rels_root = ET.fromstring(rels_content)
-                
-                for rel in rels_root.findall('.//Relationship', {'Type': 'http://schemas.openxmlformats.org/officeDocument/2006/relationships/header'}):
-                    header_path = f"word/{rel.attrib['Target']}"
-                    
-                    if header_path in docx.namelist():
-                        header_xml = docx.read(header_path).decode('utf-8')
-                        header_text = self._parse_document_xml(header_xml)
-                        if header_text.strip():
-                            header_texts.append(header_text)
-        
-        except Exception as e:
-            print(f"Warning: Could not extract headers: {e}")
-        
-        return header_texts
-    
-    def _extract_footers_manual(self, docx: zipfile.ZipFile) -> List[str]:
-        footer_texts = []
-        try:
-            if 'word/_rels/document.xml.rels' in docx.namelist():
-                rels_content = docx.read('word/_rels/document.xml.rels').decode('utf-8')
-                rels_root = ET.fromstring(rels_content)
-                
-                for rel in rels_root.findall('.//Relationship', {'Type': 'http://schemas.openxmlformats.org/officeDocument/2006/relationships/footer'}):
-                    footer_path = f"word/{rel.attrib['Target']}"
-                    
-                    if footer_path in docx.namelist():
-                        footer_xml = docx.read(footer_path).decode('utf-8')
-                        footer_text = self._parse_document_xml(footer_xml)
-                        if footer_text.strip():
-                            footer_texts.append(footer_text)
-        
-        except Exception as e:
-            print(f"Warning: Could not extract footers: {e}")
-        
-        return footer_texts
-    
-    def _extract_footnotes_manual(self, docx: zipfile.ZipFile) -> List[str]:
-        footnote_texts = []
-        
-        try:
-            if 'word/footnotes.xml' in docx.namelist():
-                footnotes_xml = docx.read('word/footnotes.xml').decode('utf-8')
-                footnote_text = self._parse_document_xml(footnotes_xml)
-                if footnote_text.strip():
-                    footnote_texts.append(footnote_text)
-        
-        except Exception as e:
-            print(f"Warning: Could not extract footnotes: {e}")
-        
-        return footnote_texts
-    
-    def _extract_endnotes_manual(self, docx: zipfile.ZipFile) -> List[str]:
-        endnote_texts = []
-        
-        try:
-            if 'word/endnotes.xml' in docx.namelist():
-                endnotes_xml = docx.read('word/endnotes.xml').decode('utf-8')
-                endnote_text = self._parse_document_xml(endnotes_xml)
-                if endnote_text.strip():
-                    endnote_texts.append(endnote_text)
-        
-        except Exception as e:
-            print(f"Warning: Could not extract endnotes: {e}")
-        
-        return endnote_texts
-    
     def extract_metadata(self, filepath: str) -> Dict[str, Any]:
         metadata = {
             'filename': Path(filepath).name,
@@ -479,20 +412,21 @@ class DOCXHandler:
                     if corrupted_files:
                         validation['errors'].append(f'Corrupted files: {corrupted_files[:5]}')
                     
+                    try:
+                        text = self._extract_from_archive(docx)
+                        validation['file_info']['extracted_text_length'] = len(text)
+                        validation['warnings'].extend(self.warnings)
+                        
+                        if len(text.strip()) == 0:
+                            validation['warnings'].append('No text content extracted')
+                        
+                    except Exception as e:
+                        validation['errors'].append(f'Failed to extract text: {str(e)}')
+                    
             except zipfile.BadZipFile:
                 validation['errors'].append('File is not a valid ZIP archive')
                 return validation
             
-            try:
-                text = self.extract_text(filepath)
-                validation['file_info']['extracted_text_length'] = len(text)
-                
-                if len(text.strip()) == 0:
-                    validation['warnings'].append('No text content extracted')
-                
-            except Exception as e:
-                validation['errors'].append(f'Failed to extract text: {str(e)}')
-            
             validation['is_valid'] = len(validation['errors']) == 0
         
         except Exception as e:
@@ -0,0 +1,90 @@
+import hashlib
+import json
+import sqlite3
+import time
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from core.sqlite_cache import SQLiteCache
+
+
+class ExtractionCache(SQLiteCache):
+    FILENAME = 'extraction.sqlite'
+    ENABLED_KEY = 'performance.cache_enabled'
+    SIZE_KEY = 'performance.cache_size_mb'
+    DEFAULT_SIZE_MB = 100
+    SCHEMA = '''
+        CREATE TABLE IF NOT EXISTS extractions (
+            key TEXT PRIMARY KEY,
+            text TEXT NOT NULL,
+            size INTEGER NOT NULL,
+            accessed REAL NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS idx_extractions_accessed ON extractions(accessed);
+    '''
+    TABLES = {'extractions': ('key',)}
+
+    @staticmethod
+    def content_hash(filepath: str) -> str:
+        digest = hashlib.sha256()
+        with open(filepath, 'rb') as f:
+            for block in iter(lambda: f.read(1024 * 1024), b''):
+                digest.update(block)
+        return digest.hexdigest()
+
+    def make_key(self, filepath: str, extractor: str, version: str,
+                 options: Optional[Dict[str, Any]] = None) -> str:
+        descriptor = json.dumps({'extractor': extractor, 'version': version, 'options': options or {}},
+                                sort_keys=True)
+        return f"{self.content_hash(filepath)}:{hashlib.sha256(descriptor.encode('utf-8')).hexdigest()[:16]}"
+
+    def get(self, key: str) -> Optional[str]:
+        with self._connect() as conn:
+            row = conn.execute('SELECT text FROM extractions WHERE key = ?', (key,)).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            conn.execute('UPDATE extractions SET accessed = ? WHERE key = ?', (time.time(), key))
+        self.hits += 1
+        return row[0]
+
+    def put(self, key: str, text: str):
+        size = len(text.encode('utf-8'))
+        if size > self.max_bytes:
+            return
+        with self._connect() as conn:
+            conn.execute('INSERT OR REPLACE INTO extractions (key, text, size, accessed) VALUES (?, ?, ?, ?)',
+                         (key, text, size, time.time()))
+            self._evict(conn)
+
+    def lookup(self, filepath: str, extractor: str, version: str,
+               options: Optional[Dict[str, Any]]) -> Tuple[Optional[str], Optional[str]]:
+        if not self.enabled:
+            return None, None
+        try:
+            key = self.make_key(filepath, extractor, version, options)
+            return key, self.get(key)
+        except (OSError, sqlite3.Error) as e:
+            print(f"Warning: Extraction cache unavailable: {e}")
+            return None, None
+
+    def store(self, key: Optional[str], text: str):
+        if key is None:
+            return
+        try:
+            self.put(key, text)
+        except sqlite3.Error as e:
+            print(f"Warning: Could not cache extracted text: {e}")
+
+    def get_or_extract(self, filepath: str, extractor: str, version: str, options: Optional[Dict[str, Any]],
+                       extract: Callable[[], str]) -> str:
+        key, cached = self.lookup(filepath, extractor, version, options)
+        if cached is not None:
+            return cached
+        text = extract()
+        self.store(key, text)
+        return text
+
+    def get_statistics(self) -> Dict[str, Any]:
+        statistics = super().get_statistics()
+        statistics['entries'] = statistics.pop('extractions')
+        return statistics
@@ -2,16 +2,42 @@ import re
 import io
 import hashlib
 from pathlib import Path
-from typing import Dict, List, Tuple, Optional, Any, BinaryIO
+from typing import Dict, List, Tuple, Optional, Any, BinaryIO, Iterator
 from datetime import datetime
 import tempfile
 import os
 import warnings
 
+from file_handlers.extraction_cache import ExtractionCache
+
 class PDFHandler:
+    EXTRACTOR_VERSION = '1'
+    
+    def __init__(self, config=None):
+        self.config = config or {}
+        self.extraction_methods = ['pdfplumber', 'pypdf', 'pdfminer']
+        self.max_pages = self.config.get('file_handling.pdf.max_pages', 0)
+        self.include_tables = self.config.get('file_handling.pdf.extract_tables', True)
+        self.include_images = self.config.get('file_handling.pdf.extract_images', False)
+        self.ocr_enabled = self.config.get('file_handling.pdf.ocr_enabled', False)
+        self.max_workers = self.config.get('performance.max_threads', 4)
+        self.parallel_min_pages = self.config.get('file_handling.pdf.parallel_min_pages', 16)
+        self.cache = ExtractionCache(self.config)
     
+    def _cache_options(self, method: Optional[str]) -> Dict[str, Any]:
+        return {
+            'method': method,
+            'max_pages': self.max_pages,
+            'extract_tables': self.include_tables,
+            'extract_images': self.include_images,
+            'ocr_enabled': self.ocr_enabled
+        }
     
     def extract_text(self, filepath: str, method: str = None) -> str:
+        return self.cache.get_or_extract(filepath, 'pdf', self.EXTRACTOR_VERSION, self._cache_options(method),
+                                         lambda: self._extract_text_uncached(filepath, method))
+    
+    def _extract_text_uncached(self, filepath: str, method: str = None) -> str:
         if method is None:
             for extraction_method in self.extraction_methods:
                 try:
@@ -25,10 +51,6 @@ class PDFHandler:
             return self._extract_with_method(filepath, method)
     
     def _extract_with_method(self, filepath: str, method: str) -> str:
-        cache_key = f"{filepath}_{method}"
-        if cache_key in self._extraction_cache:
-            return self._extraction_cache[cache_key]
-        
         try:
             if method == 'pdfplumber':
                 text = self._extract_with_pdfplumber(filepath)
@@ -40,7 +62,6 @@ class PDFHandler:
                 text = self._extract_fallback(filepath)
             else:
                 raise ValueError(f"Unknown extraction method: {method}")
-            self._extraction_cache[cache_key] = text
             return text
             
         except ImportError:
@@ -49,58 +70,149 @@ class PDFHandler:
             raise Exception(f"Failed to extract text with {method}: {str(e)}")
     
     def _extract_with_pdfplumber(self, filepath: str) -> str:
+        page_count = self._page_limit(self._count_pages('pdfplumber', filepath))
+        return '\n'.join(self._extract_pages('pdfplumber', filepath, page_count))
+    
+    def _extract_with_pypdf(self, filepath: str) -> str:
+        page_count = self._page_limit(self._count_pages('pypdf', filepath))
+        return '\n'.join(self._extract_pages('pypdf', filepath, page_count))
+    
+    def _page_limit(self, total_pages: int) -> int:
+        if self.max_pages > 0:
+            return min(self.max_pages, total_pages)
+        return total_pages
+    
+    def _page_ranges(self, page_count: int) -> List[Tuple[int, int]]:
+        chunk = max(1, -(-page_count // (self.max_workers * 2)))
+        return [(start, min(start + chunk, page_count)) for start in range(0, page_count, chunk)]
+    
+    def _worker_options(self) -> Dict[str, Any]:
+        return {
+            'performance.cache_enabled': False,
+            'performance.max_threads': 1,
+            'file_handling.pdf.extract_tables': self.include_tables,
+            'file_handling.pdf.extract_images': self.include_images,
+            'file_handling.pdf.ocr_enabled': self.ocr_enabled
+        }
+    
+    def _extract_pages(self, method: str, filepath: str, page_count: int) -> List[str]:
+        text_parts = []
+        for _, parts in self._iter_pages_parallel(method, filepath, page_count):
+            text_parts.extend(parts)
+        return text_parts
+    
+    def _iter_pages_parallel(self, method: str, filepath: str, page_count: int) -> Iterator[Tuple[int, List[str]]]:
+        if self.max_workers <= 1 or page_count < self.parallel_min_pages:
+            yield from self._iter_page_range(method, filepath, 0, page_count)
+            return
+        from concurrent.futures import ProcessPoolExecutor
+        
+        ranges = self._page_ranges(page_count)
+        with ProcessPoolExecutor(max_workers=min(self.max_workers, len(ranges))) as executor:
+            futures = [executor.submit(_extract_page_range_worker, self._worker_options(), method, filepath,
+                                       start, end) for start, end in ranges]
+            for (start, _), future in zip(ranges, futures):
+                for offset, parts in enumerate(future.result()):
+                    yield start + offset, parts
+    
+    def iter_pages(self, filepath: str, method: str = None) -> Iterator[Tuple[int, str]]:
+        key, cached = self.cache.lookup(filepath, 'pdf', self.EXTRACTOR_VERSION, self._cache_options(method))
+        if cached is not None:
+            yield 1, cached
+            return
+        pages = []
+        for page_number, page_text in self._iter_pages_uncached(filepath, method):
+            pages.append(page_text)
+            yield page_number, page_text
+        self.cache.store(key, '\n'.join(page_text for page_text in pages if page_text))
+    
+    def _iter_pages_uncached(self, filepath: str, method: str = None) -> Iterator[Tuple[int, str]]:
+        for candidate in [method] if method else self.extraction_methods:
+            if candidate not in ('pdfplumber', 'pypdf'):
+                try:
+                    text = self._extract_with_method(filepath, candidate)
+                except Exception:
+                    if method:
+                        raise
+                    continue
+                if method or text.strip():
+                    yield 1, text
+                    return
+                continue
+            try:
+                page_count = self._page_limit(self._count_pages(candidate, filepath))
+            except Exception:
+                if method:
+                    raise
+                continue
+            found = yielded = False
+            try:
+                for page_index, parts in self._iter_pages_parallel(candidate, filepath, page_count):
+                    page_text = '\n'.join(parts)
+                    found = found or bool(page_text.strip())
+                    yielded = True
+                    yield page_index + 1, page_text
+            except Exception:
+                if method or yielded:
+                    raise
+                continue
+            if method or found:
+                return
+        yield 1, self._extract_fallback(filepath)
+    
+    def _count_pages(self, method: str, filepath: str) -> int:
+        if method == 'pdfplumber':
+            import pdfplumber
+            with pdfplumber.open(filepath) as pdf:
+                return len(pdf.pages)
+        if method == 'pypdf':
+            from pypdf import PdfReader
+            with open(filepath, 'rb') as file:
+                return len(PdfReader(file).pages)
+        raise ValueError(f"Page extraction not supported for {method}")
+    
+    def _iter_page_range(self, method: str, filepath: str, start: int, end: int) -> Iterator[Tuple[int, List[str]]]:
+        if method == 'pdfplumber':
+            return self._iter_pdfplumber_pages(filepath, start, end)
+        if method == 'pypdf':
+            return self._iter_pypdf_pages(filepath, start, end)
+        raise ValueError(f"Page extraction not supported for {method}")
+    
+    def _iter_pdfplumber_pages(self, filepath: str, start: int, end: int) -> Iterator[Tuple[int, List[str]]]:
         import pdfplumber
         
-        text_parts = []
         with pdfplumber.open(filepath) as pdf:
-            total_pages = len(pdf.pages)
-            pages_to_process = range(total_pages)
-            
-            if self.max_pages > 0:
-                pages_to_process = range(min(self.max_pages, total_pages))
-        for i in pages_to_process:
+            for i in range(start, end):
                 page = pdf.pages[i]
+                text_parts = []
                 page_text = page.extract_text()
                 if page_text:
                     text_parts.append(page_text)
-                if self.extract_tables:
+                if self.include_tables:
                     tables = page.extract_tables()
                     for table in tables:
                         if table:
                             table_text = self._format_table_text(table)
                             if table_text:
                                 text_parts.append(table_text)
-                if self.extract_images:
+                if self.include_images:
                     images = page.images
                     for img in images:
                         if self.ocr_enabled:
                             ocr_text = self._extract_text_from_image(img)
                             if ocr_text:
                                 text_parts.append(f"[Image Text: {ocr_text}]")
-        
-        return '\n'.join(text_parts)
+                page.flush_cache()
+                yield i, text_parts
     
-    def _extract_with_pypdf(self, filepath: str) -> str:
+    def _iter_pypdf_pages(self, filepath: str, start: int, end: int) -> Iterator[Tuple[int, List[str]]]:
         from pypdf import PdfReader
         
-        text_parts = []
-        
         with open(filepath, 'rb') as file:
             reader = PdfReader(file)
-            total_pages = len(reader.pages)
-            pages_to_process = range(total_pages)
-            
-            if self.max_pages > 0:
-                pages_to_process = range(min(self.max_pages, total_pages))
-            
-            for i in pages_to_process:
-                page = reader.pages[i]
-                page_text = page.extract_text()
-                if page_text:
-                    page_text = self._clean_pdf_text(page_text)
-                    text_parts.append(page_text)
-        
-        return '\n'.join(text_parts)
+            for i in range(start, end):
+                page_text = reader.pages[i].extract_text()
+                yield i, [self._clean_pdf_text(page_text)] if page_text else []
     
     def _extract_with_pdfminer(self, filepath: str) -> str:
         from pdfminer.high_level import extract_text
@@ -577,4 +689,8 @@ class PDFHandler:
         except Exception as e:
             print(f"❌ Failed to optimize PDF: {e}")
             return False
-                            
\ No newline at end of file
+                            
+
+def _extract_page_range_worker(options: Dict[str, Any], method: str, filepath: str,
+                               start: int, end: int) -> List[List[str]]:
+    return [parts for _, parts in PDFHandler(options)._iter_page_range(method, filepath, start, end)]
@@ -0,0 +1,421 @@
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+EXIT_OK = 0
+EXIT_FLAGGED = 1
+EXIT_ERROR = 2
+EXIT_PARTIAL = 3
+
+STARTUP_MODULES = ['core.utils', 'core.database', 'core.ultimate_engine', 'core.batch', 'core.collusion',
+                   'core.vector_index', 'algorithms.similarity', 'file_handlers.pdf_handler',
+                   'file_handlers.docx_handler']
+HEAVY_MODULES = ['numpy', 'scipy', 'sklearn', 'spacy', 'nltk', 'pandas', 'matplotlib', 'seaborn',
+                 'textblob', 'tkinter']
+
+
+def _load_config(args):
+    from config import Config
+    cfg = Config(args.config)
+    if args.db:
+        _override(cfg, 'database.path', args.db)
+    if getattr(args, 'workers', None):
+        _override(cfg, 'performance.max_threads', args.workers)
+    return cfg
+
+
+def _override(cfg, key: str, value: Any):
+    section = cfg.config
+    keys = key.split('.')
+    for k in keys[:-1]:
+        section = section.setdefault(k, {})
+    section[keys[-1]] = value
+
+
+def _emit(data: Dict[str, Any], output: Optional[str] = None):
+    payload = json.dumps(data, indent=2, ensure_ascii=False, default=str)
+    if output:
+        Path(output).write_text(payload, encoding='utf-8')
+    else:
+        print(payload)
+
+
+def _error(message: str, output: Optional[str] = None) -> int:
+    _emit({'status': 'error', 'error': message}, output)
+    return EXIT_ERROR
+
+
+def _algorithms(args, cfg) -> List[str]:
+    if args.algorithms:
+        return [algo.strip() for algo in args.algorithms.split(',') if algo.strip()]
+    return cfg.get('detection.ultimate.algorithms', None)
+
+
+def cmd_check(args) -> int:
+    from core.database import DatabaseManager
+    from core.ultimate_engine import UltimatePlagiarismEngine
+
+    cfg = _load_config(args)
+    engine = UltimatePlagiarismEngine(cfg)
+    engine.build_models = False
+    if args.threshold is not None:
+        engine.threshold = args.threshold
+    if args.no_cache:
+        engine.result_cache_enabled = False
+    if args.text is not None:
+        text, name = args.text, 'text'
+    elif args.file == '-':
+        text, name = sys.stdin.read(), 'stdin'
+    elif args.file:
+        if not Path(args.file).exists():
+            return _error(f"File not found: {args.file}", args.output)
+        try:
+            text, name = engine.extract_text(args.file), Path(args.file).name
+        except Exception as e:
+            return _error(f"Failed to read {args.file}: {e}", args.output)
+    else:
+        return _error("Provide a file, '-' for stdin, or --text", args.output)
+
+    db_manager = DatabaseManager(cfg)
+    results = engine.analyze_comprehensive(text, None, _algorithms(args, cfg), candidate_index=db_manager)
+    if args.save_history:
+        db_manager.save_check_history(name, results, args.output)
+    if not args.include_text:
+        for match in results['matches']:
+            for seq in match['matched_sequences']:
+                seq.pop('text', None)
+    flagged = args.fail_above is not None and results['overall_similarity'] >= args.fail_above
+    _emit({'status': 'flagged' if flagged else 'ok', 'source': name, 'results': results}, args.output)
+    return EXIT_FLAGGED if flagged else EXIT_OK
+
+
+def cmd_batch(args) -> int:
+    from core.database import DatabaseManager
+    from core.batch import BatchPipeline
+
+    cfg = _load_config(args)
+    db_manager = DatabaseManager(cfg)
+    output_dir = Path(args.output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    pipeline = BatchPipeline(cfg, _algorithms(args, cfg), journal=db_manager)
+    if args.resume:
+        job_id = args.resume
+        if db_manager.get_batch_job(job_id) is None:
+            return _error(f"Unknown batch job: {job_id}", args.output)
+        files = [entry['filepath'] for entry in db_manager.get_batch_files(job_id)]
+    else:
+        files = [str(path) for path in args.files]
+        if not files:
+            return _error("No files given", args.output)
+        job_id = pipeline.create_job(files, str(output_dir), {'algorithms': pipeline.algorithms})
+
+    flagged = []
+
+    def write_result(filepath, results):
+        report_path = output_dir / f"{Path(filepath).stem}_{job_id[:8]}.json"
+        report_path.write_text(json.dumps(results, indent=2, ensure_ascii=False, default=str), encoding='utf-8')
+        if args.save_history:
+            db_manager.save_check_history(Path(filepath).name, results, str(report_path))
+        if args.fail_above is not None and results['overall_similarity'] >= args.fail_above:
+            flagged.append(filepath)
+        return report_path
+
+    summary = pipeline.run_job(job_id, write_result)
+    if args.collusion:
+        from core.collusion import CollusionDetector
+        detector = CollusionDetector(cfg)
+        detector.add_files(files, pipeline.engine.extract_text)
+        report = detector.detect()
+        collusion_path = output_dir / f"collusion_{job_id[:8]}.json"
+        collusion_path.write_text(json.dumps(report, indent=2, default=str), encoding='utf-8')
+        summary['collusion'] = {'report': str(collusion_path), 'pairs': len(report['pairs']),
+                                'clusters': len(report['clusters']), 'stats': report['stats']}
+    summary['flagged'] = flagged
+    _emit({'status': 'ok' if summary['failed'] == 0 else 'partial', 'summary': summary}, args.output)
+    if summary['failed']:
+        return EXIT_PARTIAL
+    return EXIT_FLAGGED if flagged else EXIT_OK
+
+
+def cmd_index(args) -> int:
+    from core.database import DatabaseManager
+    from core.lsi_index import LSIIndex
+    from core.embedding_index import EmbeddingIndex
+
+    cfg = _load_config(args)
+    db_manager = DatabaseManager(cfg)
+    lsi_index = LSIIndex(cfg, db_manager)
+    embedding_index = EmbeddingIndex(cfg, db_manager)
+    result = {'status': 'ok'}
+    if args.action == 'rebuild':
+        timings = {}
+        for name, rebuild in (('shingles', db_manager.rebuild_shingle_index),
+                              ('minhash', db_manager.rebuild_minhash_index),
+                              ('fingerprints', db_manager.rebuild_fingerprint_index),
+                              ('simhash', db_manager.rebuild_simhash_index),
+                              ('term_stats', db_manager.rebuild_term_stats),
+                              ('word_counts', db_manager.rebuild_word_counts)):
+            start = time.perf_counter()
+            rebuild()
+            timings[name] = round(time.perf_counter() - start, 3)
+        if db_manager.fts_enabled:
+            start = time.perf_counter()
+            db_manager.rebuild_fts_index()
+            timings['fts'] = round(time.perf_counter() - start, 3)
+        start = time.perf_counter()
+        lsi_index.rebuild()
+        timings['lsi'] = round(time.perf_counter() - start, 3)
+        start = time.perf_counter()
+        embedding_index.rebuild()
+        timings['embeddings'] = round(time.perf_counter() - start, 3)
+        result['rebuild_s'] = timings
+    elif args.action == 'optimize':
+        result['status'] = 'ok' if db_manager.optimize_database() else 'error'
+    elif args.action == 'backup':
+        result['status'] = 'ok' if db_manager.backup_database() else 'error'
+    result['statistics'] = db_manager.get_statistics(days=args.days)
+    result['statistics']['lsi'] = lsi_index.get_statistics()
+    result['statistics']['embeddings'] = embedding_index.get_statistics()
+    _emit(result, args.output)
+    return EXIT_OK if result['status'] == 'ok' else EXIT_ERROR
+
+
+def cmd_cache(args) -> int:
+    from core.result_cache import ResultCache
+    from file_handlers.extraction_cache import ExtractionCache
+
+    cfg = _load_config(args)
+    caches = {'results': ResultCache(cfg), 'extraction': ExtractionCache(cfg)}
+    result = {'status': 'ok'}
+    if args.action == 'clear':
+        result['cleared'] = {name: cache.clear() for name, cache in caches.items()}
+    result['statistics'] = {name: cache.get_statistics() for name, cache in caches.items()}
+    _emit(result, args.output)
+    return EXIT_OK
+
+
+def cmd_search(args) -> int:
+    from core.database import DatabaseManager
+
+    cfg = _load_config(args)
+    db_manager = DatabaseManager(cfg)
+    start = time.perf_counter()
+    if args.semantic:
+        from core.embedding_index import EmbeddingIndex
+
+        embedding_index = EmbeddingIndex(cfg, db_manager)
+        if not embedding_index.sync():
+            return _error("Semantic index is not built; run 'index rebuild' first", args.output)
+        _emit({
+            'status': 'ok',
+            'query': args.query,
+            'passages': embedding_index.search(args.query, top_k=args.limit),
+            'elapsed_s': round(time.perf_counter() - start, 4)
+        }, args.output)
+        return EXIT_OK
+    results = db_manager.search_documents(args.query, limit=args.limit, offset=args.offset)
+    _emit({
+        'status': 'ok',
+        'query': args.query,
+        'total': db_manager.count_search_results(args.query),
+        'offset': args.offset,
+        'results': results,
+        'elapsed_s': round(time.perf_counter() - start, 4)
+    }, args.output)
+    return EXIT_OK
+
+
+def cmd_import(args) -> int:
+    from core.database import DatabaseManager
+    from core.ingest import BulkImporter
+
+    cfg = _load_config(args)
+    importer = BulkImporter(cfg, DatabaseManager(cfg), category=args.category,
+                            max_workers=args.workers, chunk_size=args.chunk_size)
+
+    def report(progress):
+        if not args.quiet:
+            print(f"{progress['stage']}: {progress['processed']} processed, {progress['added']} added, "
+                  f"{progress['docs_per_second']} docs/s", file=sys.stderr)
+
+    summary = importer.run(args.paths, on_progress=report)
+    summary['status'] = 'ok' if not summary['failed'] else 'partial'
+    _emit(summary, args.output)
+    return EXIT_PARTIAL if summary['failed'] else EXIT_OK
+
+
+def cmd_export(args) -> int:
+    from core.database import DatabaseManager
+
+    cfg = _load_config(args)
+    db_manager = DatabaseManager(cfg)
+    count = 0
+    with open(args.destination, 'w', encoding='utf-8') as f:
+        f.write('[\n')
+        for doc in db_manager.iter_documents(category=args.category):
+            entry = {key: doc.get(key) for key in ('source', 'url', 'category', 'added_date', 'metadata')}
+            entry['text'] = doc['text']
+            f.write((',\n' if count else '') + json.dumps(entry, ensure_ascii=False))
+            count += 1
+        f.write('\n]\n')
+    _emit({'status': 'ok', 'exported': count, 'destination': args.destination}, args.output)
+    return EXIT_OK
+
+
+def cmd_bench(args) -> int:
+    from benchmarks.bench_sequence import run_benchmark
+
+    results = {'sequence': run_benchmark(args.words, args.candidates, args.min_length, not args.skip_difflib)}
+    _emit({'status': 'ok', 'benchmarks': results}, args.output)
+    return EXIT_OK
+
+
+def measure_startup(modules: Optional[List[str]] = None, top: int = 15) -> Dict[str, Any]:
+    import subprocess
+
+    modules = modules or STARTUP_MODULES
+    code = ("import sys, time\n"
+            "start = time.perf_counter()\n"
+            f"import {', '.join(modules)}\n"
+            "elapsed = (time.perf_counter() - start) * 1000\n"
+            "import json\n"
+            f"print(json.dumps({{'import_ms': elapsed, 'heavy': [m for m in {HEAVY_MODULES!r} if m in sys.modules]}}))")
+    start = time.perf_counter()
+    process = subprocess.run([sys.executable, '-X', 'importtime', '-c', code], capture_output=True, text=True,
+                             cwd=str(Path(__file__).parent))
+    wall_ms = (time.perf_counter() - start) * 1000
+    if process.returncode != 0:
+        raise RuntimeError(process.stderr.strip().splitlines()[-1] if process.stderr.strip() else "Import failed")
+
+    imports = []
+    packages = {}
+    for line in process.stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        self_us, cumulative_us, name = line[len('import time:'):].split('|', 2)
+        depth = (len(name) - len(name.lstrip())) // 2
+        name = name.strip()
+        imports.append({'module': name, 'self_ms': int(self_us) / 1000, 'cumulative_ms': int(cumulative_us) / 1000,
+                        'depth': depth})
+        package = name.split('.')[0]
+        packages[package] = packages.get(package, 0) + int(self_us) / 1000
+    summary = json.loads(process.stdout.strip().splitlines()[-1])
+    return {
+        'wall_ms': round(wall_ms, 2),
+        'import_ms': round(summary['import_ms'], 2),
+        'heavy_modules_loaded': summary['heavy'],
+        'modules': modules,
+        'slowest_imports': sorted(imports, key=lambda item: item['cumulative_ms'], reverse=True)[:top],
+        'by_package_ms': dict(sorted(((name, round(ms, 2)) for name, ms in packages.items()),
+                                     key=lambda item: item[1], reverse=True)[:top])
+    }
+
+
+def cmd_startup(args) -> int:
+    report = measure_startup(args.modules, args.top)
+    if args.budget_ms is not None:
+        report['budget_ms'] = args.budget_ms
+        report['within_budget'] = report['import_ms'] <= args.budget_ms
+    _emit({'status': 'ok', 'startup': report}, args.output)
+    return EXIT_OK if report.get('within_budget', True) else EXIT_FLAGGED
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog='plagiarism-checker',
+                                     description="Headless plagiarism checker. All commands print JSON.")
+    parser.add_argument('--config', default='config.json', help="Configuration file (default: config.json)")
+    parser.add_argument('--db', help="Override the database path")
+    parser.add_argument('--output', '-o', help="Write JSON output to a file instead of stdout")
+    subparsers = parser.add_subparsers(dest='command')
+
+    check = subparsers.add_parser('check', help="Check one document against the reference database")
+    check.add_argument('file', nargs='?', help="File to check, or '-' to read stdin")
+    check.add_argument('--text', help="Check this text instead of a file")
+    check.add_argument('--algorithms', help="Comma-separated algorithm list")
+    check.add_argument('--threshold', type=float, help="Minimum per-source similarity to report")
+    check.add_argument('--fail-above', type=float, help="Exit with status 1 if overall similarity reaches this")
+    check.add_argument('--include-text', action='store_true', help="Include matched passage text in the output")
+    check.add_argument('--save-history', action='store_true', help="Record the check in the history table")
+    check.add_argument('--no-cache', action='store_true', help="Recompute even if a cached result exists")
+    check.set_defaults(func=cmd_check)
+
+    batch = subparsers.add_parser('batch', help="Check many files with the multi-process pipeline")
+    batch.add_argument('files', nargs='*', type=Path)
+    batch.add_argument('--output-dir', default='reports/batch', help="Directory for per-file JSON results")
+    batch.add_argument('--resume', metavar='JOB_ID', help="Resume an unfinished batch job")
+    batch.add_argument('--algorithms', help="Comma-separated algorithm list")
+    batch.add_argument('--workers', type=int, help="Number of analysis processes")
+    batch.add_argument('--collusion', action='store_true', help="Also compare submissions with each other")
+    batch.add_argument('--fail-above', type=float, help="Exit with status 1 if any file reaches this similarity")
+    batch.add_argument('--save-history', action='store_true', help="Record each check in the history table")
+    batch.set_defaults(func=cmd_batch)
+
+    index = subparsers.add_parser('index', help="Inspect or maintain the reference index")
+    index.add_argument('action', choices=['stats', 'rebuild', 'optimize', 'backup'])
+    index.add_argument('--days', type=int, default=30, help="Statistics window in days")
+    index.set_defaults(func=cmd_index)
+
+    cache = subparsers.add_parser('cache', help="Inspect or clear the result and extraction caches")
+    cache.add_argument('action', choices=['stats', 'clear'])
+    cache.set_defaults(func=cmd_cache)
+
+    search = subparsers.add_parser('search', help="Full-text search of the reference database")
+    search.add_argument('query', help="Search terms; end a term with * for a prefix match")
+    search.add_argument('--limit', type=int, default=20)
+    search.add_argument('--offset', type=int, default=0)
+    search.add_argument('--semantic', action='store_true',
+                        help="Find the closest reference passages for each passage of the query")
+    search.set_defaults(func=cmd_search)
+
+    importer = subparsers.add_parser('import', help="Add documents to the reference database")
+    importer.add_argument('paths', nargs='+',
+                          help="Files, directories, zip archives or JSON/JSONL document lists")
+    importer.add_argument('--category', default='General')
+    importer.add_argument('--workers', type=int, help="Extraction processes (default performance.max_threads)")
+    importer.add_argument('--chunk-size', type=int, default=1000, help="Documents per insert transaction")
+    importer.add_argument('--quiet', action='store_true', help="Do not print progress to stderr")
+    importer.set_defaults(func=cmd_import)
+
+    export = subparsers.add_parser('export', help="Export reference documents as JSON")
+    export.add_argument('destination')
+    export.add_argument('--category', help="Only export this category")
+    export.set_defaults(func=cmd_export)
+
+    bench = subparsers.add_parser('bench', help="Run the sequence matching benchmark")
+    bench.add_argument('--words', type=int, default=20000)
+    bench.add_argument('--candidates', type=int, default=5)
+    bench.add_argument('--min-length', type=int, default=3)
+    bench.add_argument('--skip-difflib', action='store_true')
+    bench.set_defaults(func=cmd_bench)
+
+    startup = subparsers.add_parser('startup', help="Report an import-time breakdown of headless startup")
+    startup.add_argument('--modules', nargs='+', help="Modules to import (default: the headless core)")
+    startup.add_argument('--top', type=int, default=15, help="Number of slowest imports to list")
+    startup.add_argument('--budget-ms', type=float, help="Exit with status 1 if imports take longer than this")
+    startup.set_defaults(func=cmd_startup)
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    if not getattr(args, 'func', None):
+        parser.print_help()
+        return EXIT_ERROR
+    try:
+        return args.func(args)
+    except KeyboardInterrupt:
+        return _error("Interrupted", args.output)
+    except BrokenPipeError:
+        return EXIT_ERROR
+    except Exception as e:
+        return _error(f"{type(e).__name__}: {e}", args.output)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
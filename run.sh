@@ -0,0 +1,2 @@
+#!/usr/bin/env bash
+exec "${PYTHON:-python3}" "$(dirname "$0")/main.py" "$@"
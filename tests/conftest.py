@@ -0,0 +1,23 @@
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from helpers import DictConfig
+
+
+@pytest.fixture
+def config(tmp_path):
+    return DictConfig({
+        'database.path': str(tmp_path / 'corpus.sqlite'),
+        'paths.cache': str(tmp_path / 'cache'),
+        'performance.max_threads': 2
+    })
+
+
+@pytest.fixture
+def db(config):
+    from core.database import DatabaseManager
+    return DatabaseManager(config)
@@ -0,0 +1,31 @@
+import random
+import string
+
+VOCABULARY = [''.join(random.Random(i).choices(string.ascii_lowercase, k=8)) for i in range(5000)]
+
+
+def random_words(count: int, seed: int):
+    return random.Random(seed).choices(VOCABULARY, k=count)
+
+
+def edited(words, fraction, seed):
+    generator = random.Random(seed)
+    words = list(words)
+    for position in generator.sample(range(len(words)), int(len(words) * fraction)):
+        words[position] = random_words(1, seed * 1000 + position)[0]
+    return words
+
+
+def add_corpus(db, texts, prefix='doc'):
+    documents = [{'source': f"{prefix}-{i}", 'text': text} for i, text in enumerate(texts)]
+    doc_ids = db.insert_documents(documents)['doc_ids']
+    db.index_documents(doc_ids)
+    return doc_ids
+
+
+class DictConfig:
+    def __init__(self, values):
+        self.values = values
+
+    def get(self, key, default=None):
+        return self.values.get(key, default)
@@ -0,0 +1,116 @@
+import pytest
+
+from helpers import add_corpus, edited, random_words
+
+
+def test_near_duplicate_shortcut_scores_requested_algorithms_on_near_duplicates_only(config, db):
+    from core.ultimate_engine import UltimatePlagiarismEngine
+
+    originals = [random_words(300, seed) for seed in range(20)]
+    doc_ids = add_corpus(db, [' '.join(words) for words in originals])
+    engine = UltimatePlagiarismEngine(config)
+    algorithms = ['jaccard', 'cosine_tfidf', 'sequence']
+    query = ' '.join(edited(originals[3], 0.004, 3))
+
+    results = engine.analyze_comprehensive(query, None, algorithms, candidate_index=db)
+
+    metadata = results['metadata']
+    assert metadata['near_duplicates']['short_circuit']
+    assert metadata['candidate_retrieval']['strategy'] == 'simhash'
+    assert metadata['documents_scored'] == 1
+    assert metadata['algorithms_used'] == algorithms
+    assert list(results['algorithm_scores']) == algorithms
+    assert [match['doc_id'] for match in results['matches']] == [doc_ids[3]]
+    assert all(score > 90 for score in results['matches'][0]['algorithm_scores'].values())
+    again = engine.analyze_comprehensive(query, None, algorithms, candidate_index=db)
+    assert again['metadata']['result_cache']['hit']
+
+
+def test_model_algorithms_fall_back_to_per_check_scoring_until_their_index_is_built(config, db):
+    from core.ultimate_engine import UltimatePlagiarismEngine
+
+    config.values.update({'detection.ultimate.near_duplicate_shortcut': False, 'indexing.lsi_components': 10,
+                          'indexing.embedding_model': 'hashing'})
+    originals = [random_words(300, seed) for seed in range(30)]
+    add_corpus(db, [' '.join(words) for words in originals])
+    engine = UltimatePlagiarismEngine(config)
+    engine.build_models = False
+    algorithms = ['cosine_tfidf', 'lsi', 'semantic']
+    query = ' '.join(edited(originals[5], 0.3, 5))
+
+    fallback = engine.analyze_comprehensive(query, None, algorithms, candidate_index=db)
+    assert fallback['metadata']['model_fallbacks'] == ['lsi', 'semantic']
+    scores = fallback['matches'][0]['algorithm_scores']
+    assert len(set(scores.values())) == 3
+
+    engine.build_models = True
+    engine.analyze_comprehensive(query, None, algorithms, candidate_index=db)
+    engine.lsi_index._builder.join()
+    engine.embedding_index._builder.join()
+    built = engine.analyze_comprehensive(query, None, algorithms, candidate_index=db)
+    assert 'model_fallbacks' not in built['metadata']
+    assert built['metadata']['result_cache']['algorithms_reused'] == ['cosine_tfidf']
+    assert built['metadata']['result_cache']['algorithms_computed'] == ['lsi', 'semantic']
+    assert built['matches'][0]['source'] == 'doc-5'
+
+
+def test_only_the_top_shingle_candidates_are_scored(config, db):
+    from core.ultimate_engine import UltimatePlagiarismEngine
+
+    config.values.update({'indexing.candidate_top_k': 5, 'detection.ultimate.near_duplicate_shortcut': False})
+    originals = [random_words(200, seed) for seed in range(60)]
+    add_corpus(db, [' '.join(words) for words in originals])
+    query = ' '.join(originals[42][:100] + [word for seed in range(8) for word in originals[seed][:20]])
+
+    results = UltimatePlagiarismEngine(config).analyze_comprehensive(query, None, ['jaccard', 'sequence'],
+                                                                     candidate_index=db)
+
+    retrieval = results['metadata']['candidate_retrieval']
+    assert (retrieval['strategy'], retrieval['candidates_selected']) == ('shingles', 5)
+    assert results['metadata']['documents_scored'] == 5
+    assert results['matches'][0]['source'] == 'doc-42'
+
+
+def test_streamed_pages_are_scored_like_the_joined_text(config, db):
+    from core.ultimate_engine import UltimatePlagiarismEngine
+
+    config.values['performance.result_cache_enabled'] = False
+    originals = [random_words(200, seed) for seed in range(10)]
+    add_corpus(db, [' '.join(words) for words in originals])
+    pages = [' '.join(originals[4][:100]), ' '.join(random_words(50, 99)), ' '.join(originals[7][50:150])]
+    engine = UltimatePlagiarismEngine(config)
+    algorithms = ['jaccard', 'sequence']
+
+    streamed = engine.analyze_pages(enumerate(pages, start=1), None, algorithms, candidate_index=db)
+    joined = engine.analyze_comprehensive('\n'.join(pages), None, algorithms, candidate_index=db)
+
+    assert streamed['metadata']['pages'] == 3
+    assert streamed['matches'] == joined['matches']
+    assert streamed['algorithm_scores'] == joined['algorithm_scores']
+
+
+def test_prefetch_keeps_order_stays_bounded_and_reraises():
+    import time
+    from core.utils import prefetch
+
+    produced = []
+
+    def pages():
+        for number in range(1, 21):
+            produced.append(number)
+            yield number
+
+    stream = prefetch(pages(), 2)
+    assert next(stream) == 1
+    time.sleep(0.2)
+    assert len(produced) <= 4
+    assert list(stream) == list(range(2, 21))
+
+    def failing():
+        yield 1
+        raise ValueError('page 2 is damaged')
+
+    stream = prefetch(failing(), 2)
+    assert next(stream) == 1
+    with pytest.raises(ValueError, match='page 2 is damaged'):
+        next(stream)
@@ -0,0 +1,66 @@
+from helpers import add_corpus, random_words
+
+
+def write_files(tmp_path, count):
+    files = []
+    for i in range(count):
+        path = tmp_path / f"essay-{i}.txt"
+        path.write_text(' '.join(random_words(120, 100 + i)), encoding='utf-8')
+        files.append(str(path))
+    return files
+
+
+def test_resumed_job_skips_finished_files_unless_they_changed(tmp_path, config, db):
+    from core.batch import BatchPipeline
+
+    files = write_files(tmp_path, 4)
+    pipeline = BatchPipeline(config, ['jaccard'], use_index=False, journal=db)
+    job_id = pipeline.create_job(files)
+
+    def report(filepath, results):
+        if filepath == files[2]:
+            raise RuntimeError('disk full')
+        return filepath + '.html'
+
+    first = pipeline.run_job(job_id, report)
+    assert (first['successful'], first['failed'], first['skipped']) == (3, 1, 0)
+    assert db.get_batch_job(job_id)['status'] == 'incomplete'
+    assert pipeline.pending_files(job_id) == [files[2]]
+
+    with open(files[0], 'a', encoding='utf-8') as handle:
+        handle.write(' revised')
+    assert pipeline.pending_files(job_id) == [files[0], files[2]]
+
+    reported = []
+    second = pipeline.run_job(job_id, lambda filepath, results: reported.append(filepath))
+    assert sorted(reported) == [files[0], files[2]]
+    assert (second['successful'], second['failed'], second['skipped']) == (2, 0, 2)
+    assert db.get_batch_job(job_id)['status'] == 'completed'
+    assert pipeline.pending_files(job_id) == []
+
+
+def test_pipeline_scores_every_file_against_the_shared_index_and_reports_stage_timings(tmp_path, config, db):
+    from core.batch import BatchPipeline
+
+    files = write_files(tmp_path, 6)
+    add_corpus(db, [' '.join(random_words(120, 100 + i)) for i in (1, 4)])
+    unsupported = tmp_path / 'essay.odt'
+    unsupported.write_text('not really an odt file', encoding='utf-8')
+    results, progress = {}, []
+
+    def report(filepath, analysis):
+        results[filepath] = analysis
+        return filepath + '.html'
+
+    summary = BatchPipeline(config, ['jaccard']).run(files + [str(unsupported)], report,
+                                                     lambda done, filepath, error: progress.append(done))
+
+    assert (summary['total'], summary['successful'], summary['failed']) == (7, 6, 1)
+    assert summary['errors'][0]['file'] == 'essay.odt'
+    assert 'Extraction failed' in summary['errors'][0]['error']
+    assert progress == list(range(1, 8))
+    assert sorted(results) == sorted(files)
+    assert [filepath for filepath in files if results[filepath]['matches']] == [files[1], files[4]]
+    assert results[files[4]]['matches'][0]['source'] == 'doc-1'
+    assert set(summary['timings']) == {'extract_s', 'analyze_s', 'report_s', 'wall_s'}
+    assert summary['workers'] == 2 and not summary['stopped']
@@ -0,0 +1,47 @@
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+from helpers import random_words
+
+MAIN = Path(__file__).resolve().parent.parent / 'main.py'
+
+
+def run_cli(tmp_path, *args, stdin=None):
+    completed = subprocess.run([sys.executable, str(MAIN), '--config', str(tmp_path / 'config.json'),
+                                '--db', str(tmp_path / 'corpus.sqlite'), *args],
+                               cwd=tmp_path, input=stdin, capture_output=True, text=True, timeout=120)
+    output = json.loads(completed.stdout) if completed.stdout.startswith('{') else completed.stdout
+    return completed.returncode, output
+
+
+def test_exit_codes_report_ok_flagged_partial_and_error(tmp_path):
+    sources = tmp_path / 'sources'
+    sources.mkdir()
+    for i in range(3):
+        (sources / f"source-{i}.txt").write_text(' '.join(random_words(150, 300 + i)), encoding='utf-8')
+
+    code, summary = run_cli(tmp_path, 'import', str(sources), '--quiet', '--workers', '1')
+    assert (code, summary['status'], summary['added']) == (0, 'ok', 3)
+
+    copied = ' '.join(random_words(150, 301))
+    code, output = run_cli(tmp_path, 'check', '-', '--algorithms', 'jaccard', '--fail-above', '50', stdin=copied)
+    assert (code, output['status'], output['source']) == (1, 'flagged', 'stdin')
+    assert output['results']['matches'][0]['source'].startswith('source-1')
+    code, output = run_cli(tmp_path, 'check', '--text', ' '.join(random_words(150, 900)), '--fail-above', '50')
+    assert (code, output['status']) == (0, 'ok')
+
+    code, output = run_cli(tmp_path, 'check', str(tmp_path / 'missing.txt'))
+    assert (code, output['status']) == (2, 'error')
+    assert 'File not found' in output['error']
+
+    unsupported = tmp_path / 'essay.odt'
+    unsupported.write_text('not really an odt file', encoding='utf-8')
+    code, output = run_cli(tmp_path, 'batch', str(sources / 'source-0.txt'), str(unsupported),
+                           '--algorithms', 'jaccard', '--output-dir', str(tmp_path / 'reports'))
+    assert (code, output['status']) == (3, 'partial')
+    assert (output['summary']['successful'], output['summary']['failed']) == (1, 1)
+
+    code, output = run_cli(tmp_path)
+    assert code == 2 and output.startswith('usage:')
@@ -0,0 +1,45 @@
+from helpers import edited, random_words
+
+
+def test_copy_chains_form_one_cluster_and_unrelated_work_stays_out(config):
+    from core.collusion import CollusionDetector, format_collusion_report
+
+    detector = CollusionDetector(config)
+    original = random_words(300, 1)
+    copy = edited(original, 0.1, 2)
+    for seed in range(40):
+        detector.add(f"student-{seed}", ' '.join(random_words(300, 1000 + seed)))
+    detector.add('alice', ' '.join(original))
+    detector.add('bob', ' '.join(copy))
+    detector.add('carol', ' '.join(edited(copy, 0.1, 3)))
+    detector.add('dave', ' '.join(random_words(300, 5)))
+    detector.add('erin', ' '.join(random_words(300, 5)[:200]))
+
+    report = detector.detect()
+
+    assert [cluster['members'] for cluster in report['clusters']] == [['alice', 'bob', 'carol'], ['dave', 'erin']]
+    assert {(pair['a'], pair['b']) for pair in report['pairs']} >= {('alice', 'bob'), ('bob', 'carol')}
+    dave_erin = next(pair for pair in report['pairs'] if pair['a'] == 'dave')
+    assert dave_erin['containment'] == 100.0
+    assert report['stats']['candidate_pairs'] < report['stats']['possible_pairs'] / 10
+    assert (report['stats']['bands'], report['stats']['rows_per_band']) == (42, 3)
+    assert report['stats']['skipped_buckets'] == 0
+    assert 'WARNING' not in format_collusion_report(report)
+
+
+def test_oversized_buckets_are_reported(config):
+    from core.collusion import CollusionDetector, format_collusion_report
+
+    config.values['detection.collusion.max_bucket_size'] = 2
+    detector = CollusionDetector(config)
+    text = ' '.join(random_words(100, 1))
+    for name in ('a', 'b', 'c'):
+        detector.add(name, text)
+    detector.add('other', ' '.join(random_words(100, 2)))
+
+    report = detector.detect()
+
+    assert report['pairs'] == []
+    assert report['stats']['skipped_buckets'] == detector.bands
+    assert report['stats']['skipped_submissions'] == 3
+    assert 'WARNING: 42 oversized LSH buckets were skipped; 3 submissions' in format_collusion_report(report)
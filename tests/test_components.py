@@ -0,0 +1,44 @@
+import pytest
+
+tk = pytest.importorskip('tkinter')
+
+
+@pytest.fixture
+def root():
+    try:
+        root = tk.Tk()
+    except tk.TclError:
+        pytest.skip('no display available')
+    root.withdraw()
+    yield root
+    root.destroy()
+
+
+def test_virtual_table_fetches_only_the_blocks_it_shows(root):
+    from ui.components import VirtualTable
+
+    rows = [{'id': i, 'name': f"row-{i}"} for i in range(1_000_000)]
+    requests = []
+
+    def fetch(offset, limit, sort_key, descending, filters):
+        requests.append((offset, sort_key, descending))
+        ordered = rows[::-1] if descending else rows
+        return ordered[offset:offset + limit]
+
+    table = VirtualTable(root, [{'id': 'id', 'text': 'ID'}, {'id': 'name', 'text': 'Name'}], fetch,
+                         lambda filters: len(rows), sort_key='id', block_size=100, cache_blocks=4, height=20)
+    table.refresh()
+    assert len(table.tree.get_children()) == 20
+    assert requests == [(0, 'id', False)]
+
+    table.scroll(500_000)
+    assert [str(value) for value in table.tree.item('0')['values']] == ['500000', 'row-500000']
+    assert requests[1:] == [(500_000, 'id', False)]
+    for index in range(0, 1000, 50):
+        assert table.row(index)['id'] == index
+    assert len(table._blocks) == 4
+
+    table.sort_by('id')
+    assert table.descending and table.top == 0
+    assert table.row(0)['id'] == 999_999
+    assert requests[-1] == (0, 'id', True)
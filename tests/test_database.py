@@ -0,0 +1,188 @@
+import random
+
+from helpers import add_corpus, edited, random_words
+
+
+def test_lsh_recalls_near_copies_and_ignores_unrelated_text(db):
+    originals = [random_words(300, seed) for seed in range(200)]
+    doc_ids = add_corpus(db, [' '.join(words) for words in originals])
+
+    found = 0
+    for seed in range(0, 200, 10):
+        candidates = db.query_lsh(edited(originals[seed], 0.03, seed), top_k=10)
+        found += doc_ids[seed] in candidates['doc_ids']
+    assert found == 20
+
+    unrelated = db.query_lsh(random_words(300, 10 ** 6))
+    assert unrelated['doc_ids'] == []
+
+
+def test_simhash_blocks_find_every_fingerprint_within_four_bits(db):
+    from core.utils import tokenize
+
+    texts = [' '.join(random_words(200, seed)) for seed in range(50)]
+    doc_ids = add_corpus(db, texts)
+    generator = random.Random(1)
+    for doc_id, text in zip(doc_ids, texts):
+        fingerprint = db.compute_simhash(tokenize(text))
+        for distance in range(5):
+            flipped = fingerprint
+            for bit in generator.sample(range(64), distance):
+                flipped ^= 1 << bit
+            matches = {match['id']: match['distance'] for match in db.find_near_duplicates(flipped, 4)}
+            assert matches.get(doc_id) == distance
+        assert doc_id not in {match['id'] for match in db.find_near_duplicates(fingerprint ^ 0x1F, 4)}
+
+
+def test_full_text_search_ranks_matches_and_highlights_snippets(db):
+    texts = [' '.join(random_words(80, seed)) for seed in range(30)]
+    texts[4] = ' '.join(random_words(40, 4) + ['photosynthesis', 'converts', 'light'] + random_words(40, 44))
+    texts[9] = ' '.join(random_words(40, 9) + ['photosynthetic', 'bacteria'] + random_words(40, 49))
+    doc_ids = add_corpus(db, texts)
+
+    results = db.search_documents('photosynthesis light')
+    assert [result['id'] for result in results] == [doc_ids[4]]
+    assert '[photosynthesis]' in results[0]['snippet'] and '[light]' in results[0]['snippet']
+    assert {result['id'] for result in db.search_documents('photosynth*')} == {doc_ids[4], doc_ids[9]}
+    assert db.count_search_results('photosynth*') == 2
+    assert db.search_documents('doc-7')[0]['id'] == doc_ids[7]
+
+    db.delete_document('doc-4')
+    assert db.search_documents('photosynthesis') == []
+    assert db.count_search_results('photosynth*') == 1
+
+
+def test_identical_texts_share_one_compressed_blob(config, db):
+    from core.database import DatabaseManager
+
+    config.values['database.duplicates'] = 'allow'
+    shared = DatabaseManager(config)
+    text = 'Ünïcode résumé — ' + ' '.join(random_words(400, 1))
+    doc_ids = add_corpus(shared, [text, text, 'tiny'])
+    assert shared.add_document('late', text)
+
+    def blobs():
+        with shared._connect() as conn:
+            return {row['size']: (row['codec'], row['refs']) for row in conn.execute('SELECT * FROM text_blobs')}
+
+    size = len(text.encode('utf-8'))
+    assert blobs() == {size: ('zlib', 3), 4: ('raw', 1)}
+    assert [shared.get_document_text(doc_id) for doc_id in doc_ids] == [text, text, 'tiny']
+    storage = shared.get_statistics()['storage']
+    assert storage['unique_texts'] == 2 and storage['stored_bytes'] < storage['raw_bytes']
+
+    assert shared.delete_document('doc-0') and shared.delete_document('late')
+    assert blobs() == {size: ('zlib', 1), 4: ('raw', 1)}
+    assert shared.get_document_text(doc_ids[1]) == text
+    assert shared.delete_document('doc-1')
+    assert blobs() == {4: ('raw', 1)}
+
+    assert not db.add_document('again', 'tiny')
+
+
+def test_document_stream_reads_the_corpus_in_batches_on_every_pass(db):
+    add_corpus(db, [' '.join(random_words(20, seed)) for seed in range(12)])
+    stream = db.stream_documents(batch_size=5)
+
+    assert len(stream) == 12
+    assert [doc['source'] for doc in stream] == [f"doc-{i}" for i in range(12)]
+    add_corpus(db, ['a late arrival'], prefix='late')
+    assert len(stream) == 13 and [doc['source'] for doc in stream][-1] == 'late-0'
+
+
+def test_shingle_candidates_rank_by_shared_shingles_and_report_recall(db):
+    from core.utils import shingle_hashes
+
+    originals = [random_words(200, seed) for seed in range(100)]
+    doc_ids = add_corpus(db, [' '.join(words) for words in originals])
+    query = originals[10][:120] + random_words(30, 500) + originals[20][50:130] + originals[30][:40]
+
+    everything = db.find_candidates(query, top_k=0)
+    query_shingles = set(shingle_hashes(query, db.shingle_size))
+    expected = {doc_id: len(query_shingles & set(shingle_hashes(words, db.shingle_size)))
+                for doc_id, words in zip(doc_ids, originals)}
+    assert everything['shared_shingles'] == {doc_id: shared for doc_id, shared in expected.items() if shared}
+    assert everything['stats']['shingle_recall'] == 100.0
+
+    top = db.find_candidates(query, top_k=2)
+    assert top['doc_ids'] == [doc_ids[10], doc_ids[20]]
+    shared = sum(everything['shared_shingles'].values())
+    assert top['stats']['shingle_recall'] == round((expected[doc_ids[10]] + expected[doc_ids[20]]) / shared * 100, 2)
+    assert top['stats']['documents_sharing_shingles'] >= 3
+
+
+def test_term_stats_track_document_and_collection_frequency_through_adds_and_deletes(db):
+    import math
+    from collections import Counter
+
+    texts = [' '.join(random_words(80, seed)) for seed in range(12)]
+    add_corpus(db, texts[:8])
+    for i, text in enumerate(texts[8:], start=8):
+        assert db.add_document(f"doc-{i}", text)
+    for i in (2, 9):
+        assert db.delete_document(f"doc-{i}")
+
+    remaining = [text.split() for i, text in enumerate(texts) if i not in (2, 9)]
+    df = Counter(term for words in remaining for term in set(words))
+    cf = Counter(term for words in remaining for term in words)
+
+    def stored_stats():
+        with db._connect() as conn:
+            return {row['term']: (row['df'], row['cf']) for row in conn.execute('SELECT term, df, cf FROM term_stats')}
+
+    assert stored_stats() == {term: (df[term], cf[term]) for term in df}
+    db.rebuild_term_stats()
+    assert stored_stats() == {term: (df[term], cf[term]) for term in df}
+
+    common = df.most_common(1)[0][0]
+    idf = db.get_idf([common, 'unseenterm'])
+    assert idf[common] == math.log(11 / (1 + df[common])) + 1
+    assert idf['unseenterm'] == math.log(11) + 1
+
+
+def test_keyset_pages_list_metadata_only_and_text_loads_on_demand(db):
+    texts = [' '.join(random_words(20 + i, 700 + i)) for i in range(25)]
+    db.insert_documents([{'source': f"doc-{i}", 'text': text, 'category': 'Essays' if i % 3 else 'Books'}
+                         for i, text in enumerate(texts)])
+
+    pages, after_id = [], 0
+    while True:
+        page = db.list_documents(after_id, limit=10)
+        if not page:
+            break
+        pages.append(page)
+        after_id = page[-1]['id']
+    assert [len(page) for page in pages] == [10, 10, 5]
+    listed = [doc for page in pages for doc in page]
+    assert [doc['source'] for doc in listed] == [f"doc-{i}" for i in range(25)]
+    assert all('text' not in doc for doc in listed)
+    assert [doc['word_count'] for doc in listed] == [20 + i for i in range(25)]
+    assert db.get_document_text(listed[7]['id']) == texts[7]
+
+    books = db.list_documents(0, limit=3, category='Books')
+    books += db.list_documents(books[-1]['id'], limit=10, category='Books')
+    assert [doc['source'] for doc in books] == [f"doc-{i}" for i in range(0, 25, 3)]
+
+
+def test_sorted_and_filtered_pages_match_a_full_sort(db):
+    generator = random.Random(5)
+    documents = [{'source': f"doc-{i:02d}", 'text': ' '.join(random_words(generator.randint(5, 60), 800 + i)),
+                  'category': generator.choice(['Essays', 'Books'])} for i in range(40)]
+    db.insert_documents(documents)
+    for i in range(30):
+        db.save_check_history(f"essay-{i}.txt", {'overall_similarity': generator.randint(0, 5) * 10,
+                                                 'total_words': 100 + i, 'matches': []})
+
+    essays = [doc for doc in db.list_documents(limit=100) if doc['category'] == 'Essays']
+    expected = sorted(essays, key=lambda doc: (doc['word_count'], doc['id']), reverse=True)
+    pages = [db.query_documents(offset, 7, 'word_count', True, 'Essays') for offset in range(0, len(essays), 7)]
+    assert [doc['id'] for page in pages for doc in page] == [doc['id'] for doc in expected]
+    assert db.count_documents_matching('Essays') == len(essays)
+
+    history = db.query_check_history(0, 100, 'similarity', False)
+    flagged = [entry for entry in history if entry['similarity'] >= 30]
+    assert [entry['similarity'] for entry in history] == sorted(entry['similarity'] for entry in history)
+    pages = [db.query_check_history(offset, 4, 'similarity', False, min_similarity=30)
+             for offset in range(0, len(flagged), 4)]
+    assert [entry['id'] for page in pages for entry in page] == [entry['id'] for entry in flagged]
+    assert db.count_check_history(min_similarity=30) == len(flagged)
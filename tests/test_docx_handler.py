@@ -0,0 +1,55 @@
+import zipfile
+
+from file_handlers.docx_handler import DOCXHandler
+
+W = 'http://schemas.openxmlformats.org/wordprocessingml/2006/main'
+MC = 'http://schemas.openxmlformats.org/markup-compatibility/2006'
+RELATIONSHIPS = 'http://schemas.openxmlformats.org/package/2006/relationships'
+HEADER_TYPE = 'http://schemas.openxmlformats.org/officeDocument/2006/relationships/header'
+
+
+def paragraph(text):
+    return f"<w:p><w:r><w:t>{text}</w:t></w:r></w:p>"
+
+
+def text_box(text):
+    content = f"<w:txbxContent>{paragraph(text)}</w:txbxContent>"
+    return (f"<w:p><w:r><mc:AlternateContent><mc:Choice Requires=\"wps\"><w:drawing>{content}</w:drawing></mc:Choice>"
+            f"<mc:Fallback><w:pict>{content}</w:pict></mc:Fallback></mc:AlternateContent></w:r></w:p>")
+
+
+def write_docx(path, body, parts=None):
+    parts = parts or {}
+    relationships = ''.join(f"<Relationship Id=\"rId{i}\" Type=\"{HEADER_TYPE}\" Target=\"{name}\"/>"
+                            for i, name in enumerate(parts, start=1))
+    with zipfile.ZipFile(path, 'w') as docx:
+        docx.writestr('word/document.xml', f"<w:document xmlns:w=\"{W}\" xmlns:mc=\"{MC}\"><w:body>{body}"
+                                           f"</w:body></w:document>")
+        docx.writestr('word/_rels/document.xml.rels', f"<Relationships xmlns=\"{RELATIONSHIPS}\">{relationships}"
+                                                      f"</Relationships>")
+        for name, xml in parts.items():
+            docx.writestr(f"word/{name}", xml)
+    return str(path)
+
+
+def test_text_boxes_are_extracted_once_after_the_body(config, tmp_path):
+    body = paragraph('First body paragraph') + text_box('Boxed quotation') + paragraph('Second body paragraph')
+    header = f"<w:hdr xmlns:w=\"{W}\">{paragraph('Running header')}</w:hdr>"
+    filepath = write_docx(tmp_path / 'boxes.docx', body, {'header1.xml': header})
+    handler = DOCXHandler(config)
+
+    text = handler.extract_text(filepath)
+
+    assert text.split('\n') == ['First body paragraph', 'Second body paragraph', 'Boxed quotation', 'Running header']
+    assert handler.warnings == []
+
+
+def test_damaged_part_falls_back_to_plain_text_without_partial_paragraphs(config, tmp_path):
+    header = f"<w:hdr xmlns:w=\"{W}\">{paragraph('Header words')}<w:p><w:r><w:t>cut off"
+    filepath = write_docx(tmp_path / 'damaged.docx', paragraph('Body text'), {'header1.xml': header})
+    handler = DOCXHandler(config)
+
+    text = handler.extract_text(filepath)
+
+    assert text.split('\n') == ['Body text', 'Header words cut off']
+    assert len(handler.warnings) == 1 and 'word/header1.xml' in handler.warnings[0]
@@ -0,0 +1,82 @@
+import random
+
+import numpy as np
+
+from helpers import VOCABULARY, add_corpus, edited
+
+TOPICS = 8
+
+
+def topic_words(count, seed):
+    topic = seed % TOPICS
+    return random.Random(seed).choices(VOCABULARY[topic * 200:(topic + 1) * 200], k=count)
+
+
+def sentences(words, length=20):
+    return ' '.join(' '.join(words[i:i + length]) + '.' for i in range(0, len(words), length))
+
+
+def build_index(config, db, probe):
+    from core.embedding_index import EmbeddingIndex
+
+    config.values.update({'indexing.embedding_model': 'hashing', 'indexing.embedding_passage_words': 20,
+                          'indexing.embedding_probe': probe})
+    originals = [topic_words(200, seed) for seed in range(80)]
+    add_corpus(db, [sentences(words) for words in originals])
+    index = EmbeddingIndex(config, db)
+    assert index.sync()
+    return index, originals
+
+
+def exhaustive(index, text, top_k):
+    rows = index._rows
+    vectors = np.asarray(rows['vectors'], dtype=np.float32)
+    _, query = index._embed_query(text)
+    for vector in query:
+        similarities = vectors @ vector
+        best = np.argsort(-similarities)[:top_k]
+        yield [(int(rows['docs'][i]), int(rows['spans'][i][0]), float(similarities[i])) for i in best]
+
+
+def test_ivf_search_recalls_the_exhaustive_nearest_passage_while_scanning_a_fraction(config, db):
+    index, originals = build_index(config, db, 4)
+    statistics = index.get_statistics()
+    assert (statistics['passages'], statistics['lists']) == (800, 28)
+
+    found, scanned, passages = 0, 0, 0
+    for seed in range(40):
+        text = sentences(edited(originals[seed * 2][:40], 0.3, seed))
+        for passage, truth in zip(index.search(text, 10), exhaustive(index, text, 1)):
+            found += (truth[0][0], truth[0][1]) in {(hit['doc_id'], hit['start']) for hit in passage['neighbours']}
+            scanned += passage['candidates_scanned']
+            passages += 1
+
+    assert passages == 80
+    assert found / passages >= 0.9
+    assert scanned / passages < 0.3 * statistics['passages']
+
+
+def test_probing_every_list_matches_exhaustive_search(config, db):
+    index, originals = build_index(config, db, 1000)
+
+    for seed in range(10):
+        text = sentences(edited(originals[seed * 7][:40], 0.3, seed))
+        for passage, truth in zip(index.search(text, 10), exhaustive(index, text, 10)):
+            assert passage['candidates_scanned'] == 800
+            assert [hit['similarity'] for hit in passage['neighbours']] == \
+                [round(min(max(similarity, 0.0), 1.0) * 100, 2) for _, _, similarity in truth]
+
+
+def test_a_fresh_instance_reopens_the_float16_memory_mapped_index(config, db):
+    from core.embedding_index import EmbeddingIndex
+
+    index, originals = build_index(config, db, 4)
+    text = sentences(edited(originals[11][:40], 0.1, 11))
+    reopened = EmbeddingIndex(config, db)
+
+    assert reopened.sync(build=False)
+    assert reopened.model_id == index.model_id
+    assert isinstance(reopened._rows['vectors'], np.memmap)
+    assert reopened._rows['vectors'].dtype == np.float16
+    assert reopened.search(text) == index.search(text)
+    assert reopened.candidates(text, 1) == [db.list_documents(limit=100)[11]['id']]
@@ -0,0 +1,36 @@
+import ast
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from main import measure_startup
+
+COLD_START_BUDGET_MS = 1500
+DEFERRED_GUI_MODULES = {'core.batch', 'core.ingest', 'core.collusion'}
+
+
+def test_cold_start_does_not_load_heavy_dependencies():
+    report = measure_startup()
+    assert report['heavy_modules_loaded'] == []
+
+
+def test_cold_start_within_budget():
+    report = measure_startup()
+    assert report['import_ms'] < COLD_START_BUDGET_MS, report['slowest_imports']
+
+
+def test_gui_defers_batch_import_and_collusion_modules():
+    source = Path(__file__).resolve().parent.parent / 'ui' / 'ultimate_gui.py'
+    tree = ast.parse(source.read_text(encoding='utf-8'))
+    imported = {node.module for node in tree.body if isinstance(node, ast.ImportFrom)}
+    assert not imported & DEFERRED_GUI_MODULES
+
+
+def test_lazy_module_loads_on_first_attribute_access():
+    from core.lazy import lazy_import, load_times
+
+    module = lazy_import('colorsys')
+    assert 'not loaded' in repr(module)
+    assert module.rgb_to_hsv(0, 0, 0) == (0.0, 0.0, 0.0)
+    assert 'colorsys' in load_times()
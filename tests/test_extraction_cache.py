@@ -0,0 +1,44 @@
+from file_handlers.extraction_cache import ExtractionCache
+
+
+def test_keys_follow_file_content_extractor_version_and_options(config, tmp_path):
+    cache = ExtractionCache(config)
+    first, copy, changed = tmp_path / 'a.txt', tmp_path / 'b.txt', tmp_path / 'c.txt'
+    first.write_text('the same words')
+    copy.write_text('the same words')
+    changed.write_text('other words')
+
+    key = cache.make_key(str(first), 'txt', '1', {'encoding': 'utf-8'})
+    assert cache.make_key(str(copy), 'txt', '1', {'encoding': 'utf-8'}) == key
+    variants = [cache.make_key(str(changed), 'txt', '1', {'encoding': 'utf-8'}),
+                cache.make_key(str(first), 'pdf', '1', {'encoding': 'utf-8'}),
+                cache.make_key(str(first), 'txt', '2', {'encoding': 'utf-8'}),
+                cache.make_key(str(first), 'txt', '1', {'encoding': 'latin-1'})]
+    assert len({key, *variants}) == 5
+
+    calls = []
+
+    def extract():
+        calls.append(first)
+        return 'extracted text'
+
+    assert cache.get_or_extract(str(first), 'txt', '1', None, extract) == 'extracted text'
+    assert cache.get_or_extract(str(copy), 'txt', '1', None, extract) == 'extracted text'
+    assert len(calls) == 1
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+def test_least_recently_used_entries_are_evicted_over_the_size_limit(config):
+    config.values['performance.cache_size_mb'] = 2500 / (1024 * 1024)
+    cache = ExtractionCache(config)
+    cache.put('a', 'a' * 1000)
+    cache.put('b', 'b' * 1000)
+    assert cache.get('a') == 'a' * 1000
+    cache.put('c', 'c' * 1000)
+
+    assert cache.get('b') is None
+    assert cache.get('a') == 'a' * 1000
+    assert cache.get('c') == 'c' * 1000
+    cache.put('huge', 'x' * 3000)
+    assert cache.get('huge') is None
+    assert cache.get_statistics()['entries'] == 2
@@ -0,0 +1,56 @@
+import json
+import zipfile
+
+from helpers import random_words
+
+
+def text(seed):
+    return ' '.join(random_words(60, seed))
+
+
+def test_import_continues_past_bad_items_and_indexes_everything(tmp_path, config, db):
+    from core.ingest import BulkImporter
+
+    folder = tmp_path / 'corpus'
+    folder.mkdir()
+    (folder / 'essay.txt').write_text(text(1), encoding='utf-8')
+    lines = [json.dumps({'source': 'first', 'text': text(2)}), '{"source": "broken",', '',
+             json.dumps({'source': 'no-text'}), json.dumps({'source': 'last', 'text': text(3)})]
+    (folder / 'papers.jsonl').write_text('\n'.join(lines), encoding='utf-8')
+    (folder / 'list.json').write_text(json.dumps({'text': text(4)}), encoding='utf-8')
+    (folder / 'broken.zip').write_bytes(b'not a zip file')
+    with zipfile.ZipFile(folder / 'bundle.zip', 'w') as archive:
+        archive.writestr('inner.txt', text(5))
+        archive.writestr('more.jsonl', json.dumps({'text': text(6)}) + '\n[1, 2]\n')
+    unindexed = db.insert_documents([{'source': 'interrupted', 'text': text(7)}])['doc_ids']
+
+    summary = BulkImporter(config, db, chunk_size=2).run([str(folder)])
+
+    assert summary['recovered'] == len(unindexed) == 1
+    assert (summary['added'], summary['failed'], summary['skipped']) == (5, 5, 0)
+    errors = {(error['source'], error.get('line')) for error in summary['errors']}
+    assert errors == {('papers.jsonl', 2), ('papers.jsonl', 4), ('list.json', None), ('broken.zip', None),
+                      ('bundle.zip/more.jsonl', 2)}
+    assert db.unindexed_document_ids() == []
+    assert {document['source'] for document in db.get_all_documents()} == {
+        'interrupted', 'essay.txt', 'first', 'last', 'bundle.zip/inner.txt', 'bundle.zip/more.jsonl:1'}
+
+    again = BulkImporter(config, db).run([str(folder / 'papers.jsonl')])
+    assert (again['added'], again['skipped'], again['recovered']) == (0, 2, 0)
+
+
+def test_documents_are_stored_in_input_order_whatever_order_workers_finish(tmp_path, config, db):
+    from core.ingest import BulkImporter
+
+    lines = [json.dumps({'source': 'huge', 'text': ' '.join(random_words(100000, 0))})]
+    lines += [json.dumps({'source': f"small-{i}", 'text': text(i + 1)}) for i in range(30)]
+    lines.insert(10, 'not json')
+    (tmp_path / 'papers.jsonl').write_text('\n'.join(lines), encoding='utf-8')
+
+    summary = BulkImporter(config, db, max_workers=2, chunk_size=7).run([str(tmp_path / 'papers.jsonl')])
+
+    assert (summary['added'], summary['failed']) == (31, 1)
+    assert summary['errors'][0]['line'] == 11
+    documents = db.list_documents(limit=100)
+    assert [doc['source'] for doc in documents] == ['huge'] + [f"small-{i}" for i in range(30)]
+    assert [doc['id'] for doc in documents] == sorted(doc['id'] for doc in documents)
@@ -0,0 +1,58 @@
+import pytest
+
+from file_handlers.pdf_handler import PDFHandler
+
+
+def write_pdf(path, pages):
+    objects = ['<< /Type /Catalog /Pages 2 0 R >>',
+               f"<< /Type /Pages /Kids [{' '.join(f'{4 + 2 * i} 0 R' for i in range(len(pages)))}] "
+               f"/Count {len(pages)} >>",
+               '<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>']
+    for i, text in enumerate(pages):
+        stream = f"BT /F1 12 Tf 72 720 Td ({text}) Tj ET"
+        objects.append(f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] /Contents {5 + 2 * i} 0 R "
+                       f"/Resources << /Font << /F1 3 0 R >> >> >>")
+        objects.append(f"<< /Length {len(stream)} >>\nstream\n{stream}\nendstream")
+    data, offsets = b'%PDF-1.4\n', []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(len(data))
+        data += f"{number} 0 obj\n{body}\nendobj\n".encode('latin-1')
+    xref = len(data)
+    data += f"xref\n0 {len(objects) + 1}\n0000000000 65535 f \n".encode('latin-1')
+    data += ''.join(f"{offset:010d} 00000 n \n" for offset in offsets).encode('latin-1')
+    data += f"trailer\n<< /Size {len(objects) + 1} /Root 1 0 R >>\nstartxref\n{xref}\n%%EOF\n".encode('latin-1')
+    path.write_bytes(data)
+    return str(path)
+
+
+def test_page_ranges_cover_every_page_once_in_order():
+    handler = PDFHandler({'performance.max_threads': 3, 'performance.cache_enabled': False})
+    for page_count in (1, 5, 6, 7, 40, 101):
+        ranges = handler._page_ranges(page_count)
+        assert [page for start, end in ranges for page in range(start, end)] == list(range(page_count))
+        assert len(ranges) <= 6
+
+
+def test_parallel_extraction_keeps_page_order(config, tmp_path):
+    pytest.importorskip('pypdf')
+    config.values.update({'file_handling.pdf.parallel_min_pages': 4, 'performance.cache_enabled': False})
+    filepath = write_pdf(tmp_path / 'pages.pdf', [f"Page {i} marker{i}" for i in range(1, 25)])
+
+    text = PDFHandler(config).extract_text(filepath, method='pypdf')
+
+    positions = [text.index(f"marker{i}") for i in range(1, 25)]
+    assert positions == sorted(positions)
+
+
+def test_pages_stream_in_order_and_the_joined_text_is_cached(config, tmp_path):
+    pytest.importorskip('pypdf')
+    config.values['file_handling.pdf.parallel_min_pages'] = 4
+    filepath = write_pdf(tmp_path / 'pages.pdf', [f"Page {i} marker{i}" for i in range(1, 13)])
+    handler = PDFHandler(config)
+
+    pages = list(handler.iter_pages(filepath, method='pypdf'))
+
+    assert [number for number, _ in pages] == list(range(1, 13))
+    assert all(f"marker{number}" in text for number, text in pages)
+    assert list(handler.iter_pages(filepath, method='pypdf')) == [(1, '\n'.join(text for _, text in pages))]
+    assert handler.cache.hits == 1
@@ -0,0 +1,97 @@
+import pytest
+
+from helpers import add_corpus, random_words
+
+
+def best_match(scores):
+    return max(scores, key=scores.get)
+
+
+def test_lsi_folds_in_new_documents_and_rebuilds_after_deletions(config, db):
+    from core.lsi_index import LSIIndex
+
+    config.values['indexing.lsi_components'] = 10
+    texts = [' '.join(random_words(300, seed)) for seed in range(40)]
+    doc_ids = add_corpus(db, texts)
+    index = LSIIndex(config, db)
+
+    assert index.sync()
+    built = index.get_statistics()
+    assert (built['documents'], built['folded_in'], built['components']) == (40, 0, 10)
+    assert best_match(index.score(texts[3], doc_ids)) == doc_ids[3]
+
+    late = [' '.join(random_words(300, 100 + seed)) for seed in range(5)]
+    late_ids = add_corpus(db, late, prefix='late')
+    assert index.sync()
+    folded = index.get_statistics()
+    assert (folded['model_id'], folded['documents'], folded['folded_in']) == (built['model_id'], 45, 5)
+    assert not folded['needs_rebuild']
+    assert best_match(index.score(late[2], doc_ids + late_ids)) == late_ids[2]
+
+    for i in range(6):
+        db.delete_document(f"doc-{i}")
+    assert index.get_statistics()['removed'] == 6
+    assert index.sync()
+    rebuilt = index.get_statistics()
+    assert rebuilt['model_id'] != built['model_id']
+    assert (rebuilt['documents'], rebuilt['folded_in'], rebuilt['removed']) == (39, 0, 0)
+
+
+def test_read_only_index_keeps_fold_ins_in_memory(config, db):
+    from core.database import DatabaseManager
+    from core.lsi_index import LSIIndex
+
+    config.values['indexing.lsi_components'] = 10
+    add_corpus(db, [' '.join(random_words(300, seed)) for seed in range(40)])
+    writer = LSIIndex(config, db)
+    assert writer.sync()
+    reader = LSIIndex(config, DatabaseManager(config, read_only=True))
+    assert reader.sync()
+
+    late = ' '.join(random_words(300, 500))
+    late_id = add_corpus(db, [late], prefix='late')[0]
+    assert reader.sync(background=True)
+    assert not reader.building
+    assert reader.get_statistics()['folded_in'] == 1
+    assert writer.get_statistics()['folded_in'] == 0
+    assert reader.score(late, [late_id])[late_id] > 90
+
+
+def test_embedding_search_builds_in_background_and_drops_deleted_documents(config, db):
+    from core.embedding_index import EmbeddingIndex
+
+    config.values.update({'indexing.embedding_model': 'hashing', 'indexing.embedding_passage_words': 20})
+    texts = [' '.join(random_words(200, seed)) for seed in range(30)]
+    doc_ids = add_corpus(db, texts)
+    index = EmbeddingIndex(config, db)
+
+    assert not index.sync(background=True)
+    index._builder.join()
+    assert index.sync()
+    assert index.get_statistics()['passages'] == 150
+    assert index.candidates(texts[7][:400], 3)[0] == doc_ids[7]
+
+    late = ' '.join(random_words(200, 900))
+    late_id = add_corpus(db, [late], prefix='late')[0]
+    assert index.sync()
+    assert index.get_statistics()['unindexed_passages'] == 5
+    assert index.search(late, 1)[0]['neighbours'][0]['doc_id'] == late_id
+
+    db.delete_document('late-0')
+    assert index.sync()
+    assert index.get_statistics()['removed'] == 1
+    assert all(neighbour['doc_id'] != late_id for passage in index.search(late) for neighbour in passage['neighbours'])
+
+
+def test_index_without_an_encoder_cannot_be_created(config, db):
+    from core.persisted_index import PersistedIndex
+
+    class Incomplete(PersistedIndex):
+        def _row_layout(self, meta):
+            return {}
+
+        def _fit(self, model_id):
+            return None
+
+    with pytest.raises(TypeError, match='_encode'):
+        Incomplete(config, db)
@@ -0,0 +1,106 @@
+from helpers import add_corpus, random_words
+
+
+def analyze(engine, db, text):
+    return engine.analyze_comprehensive(text, None, ['jaccard', 'cosine_tfidf'], candidate_index=db)
+
+
+def test_corpus_change_invalidates_results_but_keeps_corpus_independent_pair_scores(config, db):
+    from core.ultimate_engine import UltimatePlagiarismEngine
+
+    config.values['detection.ultimate.near_duplicate_shortcut'] = False
+    texts = [' '.join(random_words(200, seed)) for seed in range(20)]
+    add_corpus(db, texts)
+    engine = UltimatePlagiarismEngine(config)
+    query = texts[3] + ' ' + ' '.join(random_words(50, 99))
+
+    first = analyze(engine, db, query)
+    assert first['metadata']['result_cache']['hit'] is False
+    assert first['metadata']['score_cache']['jaccard']['hit_ratio'] == 0.0
+    hit = analyze(engine, db, query)
+    assert hit['metadata']['result_cache']['hit'] is True
+    assert all(entry['computed'] == 0 and entry['hit_ratio'] == 100.0
+               for entry in hit['metadata']['score_cache'].values())
+    assert all(perf['cache_hit_ratio'] == 100.0 for perf in hit['algorithm_scores'].values())
+
+    add_corpus(db, [' '.join(random_words(200, 500))], prefix='late')
+    after = analyze(engine, db, query)['metadata']
+    assert after['result_cache']['hit'] is False
+    assert after['result_cache']['algorithms_reused'] == ['jaccard']
+    assert after['result_cache']['algorithms_computed'] == ['cosine_tfidf']
+
+
+def test_results_for_older_corpus_versions_are_pruned(config):
+    from core.result_cache import ResultCache
+
+    cache = ResultCache(config)
+    text_hash = cache.text_hash('query')
+    old_key = cache.result_key(text_hash, ('corpus', 1), ['jaccard'], {})
+    new_key = cache.result_key(text_hash, ('corpus', 2), ['jaccard'], {})
+    cache.put_result(old_key, ('corpus', 1), {'overall_similarity': 10.0})
+    cache.put_result(new_key, ('corpus', 2), {'overall_similarity': 20.0})
+
+    assert cache.get_result(old_key) is None
+    assert cache.get_result(new_key) == {'overall_similarity': 20.0}
+
+
+def test_pair_scores_are_scoped(config):
+    from core.result_cache import ResultCache
+
+    cache = ResultCache(config)
+    settings = {'cosine_tfidf': 'settings'}
+    cache.put_pair_scores('text', settings, {'cosine_tfidf': 'corpus:1'}, [('cosine_tfidf', 7, 'hash', 42.0, None)])
+
+    assert cache.get_pair_scores('text', settings, {'cosine_tfidf': 'corpus:1'}, {7: 'hash'}) == \
+        {'cosine_tfidf': {7: (42.0, None)}}
+    assert cache.get_pair_scores('text', settings, {'cosine_tfidf': 'corpus:2'}, {7: 'hash'}) == {'cosine_tfidf': {}}
+    assert cache.get_pair_scores('text', settings, {'cosine_tfidf': 'corpus:1'}, {7: 'edited'}) == \
+        {'cosine_tfidf': {}}
+
+
+def test_least_recently_used_entries_are_evicted_across_tables(config):
+    from core.result_cache import ResultCache
+
+    config.values['performance.result_cache_size_mb'] = 2000 / (1024 * 1024)
+    cache = ResultCache(config)
+    settings, scopes = {'sequence': 's'}, {'sequence': ''}
+    cache.put_pair_scores('old', settings, scopes, [('sequence', 1, 'h', 10.0, [[0, 0, 5]])])
+    for number in range(4):
+        key = cache.result_key(f"text{number}", ('corpus', 1), ['sequence'], {})
+        cache.put_result(key, ('corpus', 1), {'payload': random_words(150, number)})
+        if number == 0:
+            assert cache.get_result(key) is not None
+
+    statistics = cache.get_statistics()
+    assert statistics['size_mb'] * 1024 * 1024 <= 2000
+    assert cache.get_pair_scores('old', settings, scopes, {1: 'h'}) == {'sequence': {}}
+    newest = cache.result_key('text3', ('corpus', 1), ['sequence'], {})
+    assert cache.get_result(newest) is not None
+    assert cache.clear() == statistics['results'] + statistics['pair_scores']
+
+
+def test_switching_presets_computes_only_the_newly_enabled_algorithms(config, db):
+    from core.ultimate_engine import UltimatePlagiarismEngine
+
+    config.values['detection.ultimate.near_duplicate_shortcut'] = False
+    texts = [' '.join(random_words(200, seed)) for seed in range(20)]
+    add_corpus(db, texts)
+    query = texts[6][:900] + ' ' + ' '.join(random_words(80, 77))
+    fast = ['cosine_tfidf', 'jaccard', 'ngram_3']
+    academic = ['cosine_tfidf', 'ngram_3', 'ngram_5', 'sequence']
+    engine = UltimatePlagiarismEngine(config)
+
+    engine.analyze_comprehensive(query, None, fast, candidate_index=db)
+    switched = engine.analyze_comprehensive(query, None, academic, candidate_index=db)
+
+    usage = switched['metadata']['score_cache']
+    assert switched['metadata']['result_cache'] == {'hit': False, 'algorithms_reused': ['cosine_tfidf', 'ngram_3'],
+                                                    'algorithms_computed': ['ngram_5', 'sequence']}
+    assert [usage[algo]['hit_ratio'] for algo in academic] == [100.0, 100.0, 0.0, 0.0]
+    assert [switched['algorithm_scores'][algo]['cache_hit_ratio'] for algo in academic] == [100.0, 100.0, 0.0, 0.0]
+
+    config.values['performance.result_cache_enabled'] = False
+    fresh = UltimatePlagiarismEngine(config).analyze_comprehensive(query, None, academic, candidate_index=db)
+    assert switched['matches'][0]['source'] == 'doc-6'
+    assert [match['algorithm_scores'] for match in switched['matches']] == \
+        [match['algorithm_scores'] for match in fresh['matches']]
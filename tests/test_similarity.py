@@ -0,0 +1,71 @@
+import random
+
+from algorithms import similarity
+
+
+def brute_force_match_lengths(tokens_a, tokens_b):
+    substrings = {tuple(tokens_a[i:j]) for i in range(len(tokens_a)) for j in range(i + 1, len(tokens_a) + 1)}
+    lengths = []
+    for end in range(len(tokens_b)):
+        length = 0
+        while length < end + 1 and tuple(tokens_b[end - length:end + 1]) in substrings:
+            length += 1
+        lengths.append(length)
+    return lengths
+
+
+def test_suffix_automaton_matches_brute_force():
+    generator = random.Random(3)
+    for _ in range(200):
+        alphabet = 'abcd'[:generator.randint(2, 4)]
+        tokens_a = generator.choices(alphabet, k=generator.randint(0, 30))
+        tokens_b = generator.choices(alphabet, k=generator.randint(0, 30))
+        min_length = generator.randint(1, 4)
+        lengths = brute_force_match_lengths(tokens_a, tokens_b) + [0]
+        expected = {(end - lengths[end] + 1, lengths[end]) for end in range(len(tokens_b))
+                    if lengths[end] >= min_length and lengths[end + 1] != lengths[end] + 1}
+
+        matches = similarity.SuffixAutomaton(tokens_a).maximal_matches(tokens_b, min_length)
+
+        assert {(position_b, length) for _, position_b, length in matches} == expected
+        for position_a, position_b, length in matches:
+            assert tokens_a[position_a:position_a + length] == tokens_b[position_b:position_b + length]
+
+
+def test_find_matching_sequences_covers_every_common_run():
+    tokens_a = 'the quick brown fox jumps over the lazy dog near the river bank'.split()
+    tokens_b = 'a lazy dog near the river saw the quick brown fox'.split()
+    sequences = similarity.find_matching_sequences(tokens_a, tokens_b, 3)
+    assert [seq['text'] for seq in sequences] == ['lazy dog near the river', 'the quick brown fox']
+    assert similarity.sequence_similarity(tokens_a, sequences) == round(9 / 13 * 100, 2)
+
+
+def test_winnowing_selects_a_fingerprint_in_every_window():
+    generator = random.Random(5)
+    k, window = 5, 4
+    for _ in range(50):
+        tokens = [generator.choice('abcdefgh') for _ in range(generator.randint(k + window, 120))]
+        selected = {position for _, position in similarity.winnowing_fingerprints(tokens, k, window)}
+        for start in range(len(tokens) - k + 1 - window + 1):
+            assert selected & set(range(start, start + window))
+
+
+def test_winnowing_detects_every_shared_run_of_guarantee_length():
+    generator = random.Random(11)
+    k, window = 5, 4
+    guarantee = window + k - 1
+    for trial in range(50):
+        shared = [f"shared{trial}_{i}" for i in range(guarantee)]
+        query = [f"q{generator.randint(0, 10 ** 6)}" for _ in range(40)]
+        reference = [f"r{generator.randint(0, 10 ** 6)}" for _ in range(40)]
+        query[10:10] = shared
+        reference[25:25] = shared
+
+        matched = similarity.winnowing_matches(similarity.winnowing_fingerprints(query, k, window),
+                                               similarity.winnowing_fingerprints(reference, k, window),
+                                               k, window)
+
+        assert matched['score'] > 0
+        region = matched['regions'][0]
+        assert region['position_b'] - region['position_a'] == 15
+        assert 10 <= region['position_a'] and region['position_a'] + region['length'] <= 10 + guarantee
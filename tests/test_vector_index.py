@@ -0,0 +1,106 @@
+import math
+import random
+import threading
+from collections import Counter
+
+import pytest
+
+from helpers import VOCABULARY, add_corpus, random_words
+
+
+def small_vocabulary_text(count, seed):
+    return ' '.join(random.Random(seed).choices(VOCABULARY[:300], k=count))
+
+
+def pairwise_cosines(query, texts, kind):
+    counts = [Counter(text.split()) for text in texts]
+    df = Counter(term for count in counts for term in count)
+    if kind == 'tfidf':
+        idf = {term: math.log((1 + len(texts)) / (1 + df[term])) + 1 for term in df}
+    else:
+        idf = {term: 1.0 for term in df}
+    query_weights = {term: count * idf.get(term, 0.0) for term, count in Counter(query.split()).items()}
+    query_norm = math.sqrt(sum(weight * weight for weight in query_weights.values()))
+    scores = []
+    for count in counts:
+        weights = {term: value * idf[term] for term, value in count.items()}
+        norm = math.sqrt(sum(weight * weight for weight in weights.values()))
+        dot = sum(weight * query_weights.get(term, 0.0) for term, weight in weights.items())
+        scores.append(round(dot / (norm * query_norm) * 100, 2))
+    return scores
+
+
+@pytest.mark.parametrize('kind', ['tfidf', 'count'])
+def test_sparse_scores_match_pairwise_cosine(config, kind):
+    from core.vector_index import CorpusVectorIndex
+
+    texts = [small_vocabulary_text(200, seed) for seed in range(40)]
+    index = CorpusVectorIndex(config)
+    index.build(enumerate(texts))
+    query = texts[3] + ' ' + small_vocabulary_text(100, 99)
+
+    expected = pairwise_cosines(query, texts, kind)
+    scores = index.score(query, kind, doc_ids=range(40))
+    assert scores == pytest.approx(dict(enumerate(expected)), abs=0.02)
+    top = index.score(query, kind, top_k=3)
+    assert list(top) == sorted(range(40), key=lambda i: -expected[i])[:3]
+
+    index.on_document_removed(7)
+    index.on_document_added(40, texts[3])
+    expected = pairwise_cosines(query, texts[:7] + texts[8:] + [texts[3]], kind)
+    scores = index.score(query, kind)
+    assert 7 not in scores and scores[40] == scores[3]
+    assert scores[40] == pytest.approx(expected[-1], abs=0.02)
+
+
+def test_engine_scores_pairwise_until_the_background_build_finishes(config, db):
+    from core.ultimate_engine import UltimatePlagiarismEngine
+    from core.vector_index import CorpusVectorIndex
+
+    config.values.update({'indexing.candidate_strategy': 'cosine',
+                          'detection.ultimate.near_duplicate_shortcut': False})
+    texts = [' '.join(random_words(200, seed)) for seed in range(30)]
+    add_corpus(db, texts)
+    engine = UltimatePlagiarismEngine(config)
+    engine.attach_database(db)
+    engine.vector_index._builder.join()
+    assert engine.vector_index_ready and len(engine.vector_index) == 30
+
+    release = threading.Event()
+
+    def documents():
+        release.wait()
+        yield from db.iter_document_texts()
+
+    engine.vector_index = CorpusVectorIndex(config)
+    engine.vector_index.build_in_background(documents())
+    query = ' '.join(random_words(150, 4) + random_words(50, 99))
+    building = engine.analyze_comprehensive(query, None, ['cosine_tfidf'], candidate_index=db)
+    assert building['metadata']['candidate_retrieval']['cosine'] == {'fallback': 'shingles'}
+
+    release.set()
+    engine.vector_index._builder.join()
+    ready = engine.analyze_comprehensive(query, None, ['cosine_tfidf'], candidate_index=db)
+    assert 'retrieval_ms' in ready['metadata']['candidate_retrieval']['cosine']
+    assert ready['matches'][0]['source'] == building['matches'][0]['source'] == 'doc-4'
+
+
+def test_documents_changed_during_a_build_are_indexed_once(config):
+    from core.vector_index import CorpusVectorIndex
+
+    index = CorpusVectorIndex(config)
+    texts = {doc_id: ' '.join(random_words(50, doc_id)) for doc_id in range(10)}
+
+    def documents():
+        for doc_id, text in texts.items():
+            if doc_id == 5:
+                index.on_document_added(9, texts[9])
+                index.on_document_removed(8)
+            yield doc_id, text
+
+    index.build_in_background(documents())
+    index._builder.join()
+
+    assert index.ready and len(index) == 9
+    assert set(index.score(texts[8], doc_ids=range(10))) == set(range(8)) | {9}
+    assert index.score(texts[9], top_k=1) == {9: 100.0}
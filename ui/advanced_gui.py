@@ -19,7 +19,10 @@ class AdvancedPlagiarismChecker:
         self.config = config
         self.engine = AdvancedPlagiarismEngine(config)
         self.db_manager = DatabaseManager(config)
-        self.database = self.db_manager.get_all_documents()
+        self.db_page_size = 200
+        self._db_last_id = 0
+        self._db_rows = 0
+        self._db_exhausted = True
         self.root = None
         self.current_file = None
         self.current_text = None
@@ -71,7 +74,7 @@ class AdvancedPlagiarismChecker:
         self.create_database_tab()
         self.create_analytics_tab()
         self.status_bar = tk.Label(self.root, 
-                                  text=f"Ready | Database: {len(self.database)} documents loaded", 
+                                  text=f"Ready | Database: {self.db_manager.count_documents()} documents", 
                                   bd=1, relief='sunken', anchor='w', 
                                   bg='#e2e8f0', font=('Arial', 9))
         self.status_bar.pack(side='bottom', fill='x')
@@ -240,7 +243,7 @@ class AdvancedPlagiarismChecker:
         
         scrollbar = tk.Scrollbar(list_frame, command=self.db_tree.yview)
         scrollbar.pack(side='right', fill='y')
-        self.db_tree.config(yscrollcommand=scrollbar.set)
+        self.db_tree.config(yscrollcommand=lambda first, last: self._on_db_scroll(scrollbar, first, last))
         self.refresh_database_view()
         btn_frame = tk.Frame(tab)
         btn_frame.pack(pady=10)
@@ -344,7 +347,7 @@ class AdvancedPlagiarismChecker:
         try:
             results = self.engine.analyze_text(
                 self.current_text, 
-                self.database,
+                self._reference_documents(),
                 self.selected_algorithms
             )
             self.results = results
@@ -412,7 +415,11 @@ class AdvancedPlagiarismChecker:
                     self.results_text.insert(tk.END, f"\nMatched Sequences ({len(match['matched_sequences'])}):\n")
                     for seq in match['matched_sequences'][:3]:
                         text = seq['text'][:120] + '...' if len(seq['text']) > 120 else seq['text']
-                        self.results_text.insert(tk.END, f"• \"{text}\" ({seq['length']} words)\n")
+                        if 'start_char' in seq:
+                            self.results_text.insert(tk.END, f"• \"{text}\" ({seq['length']} words, "
+                                                             f"chars {seq['start_char']}-{seq['end_char']})\n")
+                        else:
+                            self.results_text.insert(tk.END, f"• \"{text}\" ({seq['length']} words)\n")
                 
                 self.results_text.insert(tk.END, "\n")
         else:
@@ -492,16 +499,32 @@ Algorithm Performance:
                     f.write(report)
                 messagebox.showinfo("Success", f"HTML report exported to:\n{filepath}")   
     
+    def _reference_documents(self):
+        return self.db_manager.stream_documents()
+    
     def refresh_database_view(self):
         self.db_tree.delete(*self.db_tree.get_children())
-        self.database = self.db_manager.get_all_documents()
-        
-        for idx, doc in enumerate(self.database, 1):
-            word_count = len(self.engine.tokenize(doc['text']))
-            self.db_tree.insert('', 'end', text=str(idx),
-                               values=(doc['source'], doc.get('category', 'General'), word_count))
-        
-        self.status_bar.config(text=f"Database: {len(self.database)} documents loaded")
+        self._db_last_id = 0
+        self._db_rows = 0
+        self._db_exhausted = False
+        self._load_database_page()
+        self.status_bar.config(text=f"Database: {self.db_manager.count_documents()} documents")
+    
+    def _load_database_page(self):
+        if self._db_exhausted:
+            return
+        page = self.db_manager.list_documents(after_id=self._db_last_id, limit=self.db_page_size)
+        self._db_exhausted = len(page) < self.db_page_size
+        for doc in page:
+            self._db_rows += 1
+            self.db_tree.insert('', 'end', text=str(self._db_rows),
+                               values=(doc['source'], doc.get('category', 'General'), doc.get('word_count', 0)))
+            self._db_last_id = doc['id']
+    
+    def _on_db_scroll(self, scrollbar, first, last):
+        scrollbar.set(first, last)
+        if not self._db_exhausted and float(last) > 0.9:
+            self.root.after_idle(self._load_database_page)
     
     def add_to_database(self):
         dialog = tk.Toplevel(self.root)
@@ -606,7 +629,7 @@ Algorithm Performance:
             
             try:
                 text = self.engine.extract_text(filepath)
-                results = self.engine.analyze_text(text, self.database, self.selected_algorithms)
+                results = self.engine.analyze_text(text, self._reference_documents(), self.selected_algorithms)
                 filename = Path(filepath).stem
                 report_path = f"batch_report_{filename}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.txt"
                 document_name = Path(filepath).name
@@ -632,8 +655,9 @@ Algorithm Performance:
         self.notebook.select(2)
     
     def show_db_stats(self):
-        total_docs = len(self.database)
-        total_words = sum(len(self.engine.tokenize(doc['text'])) for doc in self.database)
+        stats = self.db_manager.get_statistics()
+        total_docs = stats['total_documents']
+        total_words = stats['total_words']
         
         stats_msg = f"""Database Statistics:
         
@@ -643,13 +667,8 @@ Average Words per Document: {total_words // total_docs if total_docs > 0 else 0:
 
 Categories:"""
 
-        categories = {}
-        for doc in self.database:
-            cat = doc.get('category', 'General')
-            categories[cat] = categories.get(cat, 0) + 1
-        
-        for cat, count in categories.items():
-            stats_msg += f"\n  {cat}: {count}"
+        for entry in stats['category_stats']:
+            stats_msg += f"\n  {entry['category']}: {entry['count']}"
         
         messagebox.showinfo("Database Statistics", stats_msg)
     
@@ -1,3 +1,9 @@
+import tkinter as tk
+from collections import OrderedDict
+from tkinter import ttk
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+
 class Breadcrumb(tk.Frame):
     
     def __init__(self, parent, items: List[Tuple[str, Callable]] = None,
@@ -159,21 +165,25 @@ class NotificationBar(tk.Frame):
         
     
 class DataTable(tk.Frame):
-    self.tree = ttk.Treeview(self, columns=[col['id'] for col in self.columns],
+    def __init__(self, parent, columns: List[Dict], data: List[List] = None, height: int = 10, **kwargs):
+        super().__init__(parent, **kwargs)
+        self.columns = columns
+        self.data = data or []
+        self.tree = ttk.Treeview(self, columns=[col['id'] for col in self.columns],
                                  show='headings', height=height)
-    for col in self.columns:
+        for col in self.columns:
             self.tree.heading(col['id'], text=col['text'])
             self.tree.column(col['id'], width=col.get('width', 100),
                             anchor=col.get('anchor', 'w'))
-    vsb = ttk.Scrollbar(self, orient="vertical", command=self.tree.yview)
-    hsb = ttk.Scrollbar(self, orient="horizontal", command=self.tree.xview)
-    self.tree.configure(yscrollcommand=vsb.set, xscrollcommand=hsb.set)
-    self.tree.grid(row=0, column=0, sticky='nsew')
-    vsb.grid(row=0, column=1, sticky='ns')
-    hsb.grid(row=1, column=0, sticky='ew')
-    self.grid_rowconfigure(0, weight=1)
-    self.grid_columnconfigure(0, weight=1)
-    self._populate_data()
+        vsb = ttk.Scrollbar(self, orient="vertical", command=self.tree.yview)
+        hsb = ttk.Scrollbar(self, orient="horizontal", command=self.tree.xview)
+        self.tree.configure(yscrollcommand=vsb.set, xscrollcommand=hsb.set)
+        self.tree.grid(row=0, column=0, sticky='nsew')
+        vsb.grid(row=0, column=1, sticky='ns')
+        hsb.grid(row=1, column=0, sticky='ew')
+        self.grid_rowconfigure(0, weight=1)
+        self.grid_columnconfigure(0, weight=1)
+        self._populate_data()
     
     def _populate_data(self):
         for item in self.tree.get_children():
@@ -196,6 +206,187 @@ class DataTable(tk.Frame):
             return self.tree.item(selection[0])['values']
         return None
 
+
+class VirtualTable(tk.Frame):
+    def __init__(self, parent, columns: List[Dict], fetch: Callable, count: Callable,
+                 sort_key: Optional[str] = None, descending: bool = False, block_size: int = 200,
+                 cache_blocks: int = 32, height: int = 20, **kwargs):
+        super().__init__(parent, **kwargs)
+        self.columns = columns
+        self.fetch = fetch
+        self.count = count
+        self.sort_key = sort_key
+        self.descending = descending
+        self.block_size = block_size
+        self.cache_blocks = cache_blocks
+        self.filters: Dict[str, Any] = {}
+        self.total = 0
+        self.top = 0
+        self.visible_rows = height
+        self.selected_index: Optional[int] = None
+        self._notified_index: Optional[int] = None
+        self._select_callbacks: List[Callable] = []
+        self._blocks = OrderedDict()
+
+        self.tree = ttk.Treeview(self, columns=[col['id'] for col in columns], show='headings',
+                                 height=height, selectmode='browse')
+        for col in columns:
+            self.tree.heading(col['id'], text=col['text'])
+            if col.get('sortable', True):
+                self.tree.heading(col['id'], command=lambda key=col['id']: self.sort_by(key))
+            self.tree.column(col['id'], width=col.get('width', 100), anchor=col.get('anchor', 'w'))
+        self.vsb = ttk.Scrollbar(self, orient='vertical', command=self._on_scrollbar)
+        self.tree.grid(row=0, column=0, sticky='nsew')
+        self.vsb.grid(row=0, column=1, sticky='ns')
+        self.grid_rowconfigure(0, weight=1)
+        self.grid_columnconfigure(0, weight=1)
+
+        self.tree.bind('<Configure>', self._on_resize)
+        self.tree.bind('<MouseWheel>', self._on_wheel)
+        self.tree.bind('<Button-4>', lambda e: self.scroll(-3))
+        self.tree.bind('<Button-5>', lambda e: self.scroll(3))
+        self.tree.bind('<Up>', lambda e: self._move_selection(-1))
+        self.tree.bind('<Down>', lambda e: self._move_selection(1))
+        self.tree.bind('<Prior>', lambda e: self._move_selection(-self.visible_rows))
+        self.tree.bind('<Next>', lambda e: self._move_selection(self.visible_rows))
+        self.tree.bind('<Home>', lambda e: self._move_selection(-self.total))
+        self.tree.bind('<End>', lambda e: self._move_selection(self.total))
+        self.tree.bind('<<TreeviewSelect>>', self._on_select)
+        self._update_headings()
+
+    def bind_select(self, callback: Callable):
+        self._select_callbacks.append(callback)
+
+    def refresh(self, reset: bool = False):
+        self._blocks.clear()
+        self.total = self.count(self.filters)
+        if reset:
+            self.top = 0
+            self.selected_index = None
+            self._notified_index = None
+        self._render()
+
+    def set_filters(self, **filters):
+        self.filters = {key: value for key, value in filters.items() if value is not None}
+        self.refresh(reset=True)
+
+    def sort_by(self, key: str):
+        if self.sort_key == key:
+            self.descending = not self.descending
+        else:
+            self.sort_key = key
+            self.descending = False
+        self._update_headings()
+        self.refresh(reset=True)
+
+    def row(self, index: int) -> Optional[Dict]:
+        if index < 0 or index >= self.total:
+            return None
+        block = self._block(index // self.block_size)
+        offset = index % self.block_size
+        return block[offset] if offset < len(block) else None
+
+    def selected_row(self) -> Optional[Dict]:
+        return self.row(self.selected_index) if self.selected_index is not None else None
+
+    def scroll(self, delta: int):
+        self.top += delta
+        self._render()
+        return 'break'
+
+    def _block(self, number: int) -> List[Dict]:
+        block = self._blocks.get(number)
+        if block is None:
+            block = list(self.fetch(number * self.block_size, self.block_size, self.sort_key,
+                                    self.descending, self.filters))
+            self._blocks[number] = block
+            if len(self._blocks) > self.cache_blocks:
+                self._blocks.popitem(last=False)
+        else:
+            self._blocks.move_to_end(number)
+        return block
+
+    def _values(self, row: Dict) -> Tuple:
+        return tuple(col['format'](row) if 'format' in col else row.get(col['id'], '') for col in self.columns)
+
+    def _render(self):
+        self.top = max(0, min(self.top, self.total - self.visible_rows))
+        rows = []
+        for index in range(self.top, min(self.top + self.visible_rows, self.total)):
+            row = self.row(index)
+            if row is None:
+                break
+            rows.append(row)
+        existing = self.tree.get_children()
+        for position, row in enumerate(rows):
+            if position < len(existing):
+                self.tree.item(str(position), values=self._values(row))
+            else:
+                self.tree.insert('', 'end', iid=str(position), values=self._values(row))
+        if len(existing) > len(rows):
+            self.tree.delete(*existing[len(rows):])
+
+        selected = self.selected_index
+        if selected is not None and self.top <= selected < self.top + len(rows):
+            iid = str(selected - self.top)
+            if self.tree.selection() != (iid,):
+                self.tree.selection_set(iid)
+        elif self.tree.selection():
+            self.tree.selection_remove(*self.tree.selection())
+
+        if self.total:
+            self.vsb.set(self.top / self.total, min(1.0, (self.top + len(rows)) / self.total))
+        else:
+            self.vsb.set(0.0, 1.0)
+
+    def _update_headings(self):
+        for col in self.columns:
+            arrow = ''
+            if col['id'] == self.sort_key:
+                arrow = ' ▼' if self.descending else ' ▲'
+            self.tree.heading(col['id'], text=col['text'] + arrow)
+
+    def _on_scrollbar(self, action: str, value: str, unit: Optional[str] = None):
+        if action == 'moveto':
+            self.top = int(float(value) * self.total)
+            self._render()
+        elif action == 'scroll':
+            self.scroll(int(value) * (self.visible_rows if unit == 'pages' else 1))
+
+    def _on_wheel(self, event):
+        steps = int(-event.delta / 120) or (-1 if event.delta > 0 else 1)
+        return self.scroll(steps * 3)
+
+    def _on_resize(self, event):
+        row_height = int(ttk.Style().lookup('Treeview', 'rowheight') or 20)
+        visible_rows = max(1, event.height // row_height - 1)
+        if visible_rows != self.visible_rows:
+            self.visible_rows = visible_rows
+            self._render()
+
+    def _on_select(self, event):
+        selection = self.tree.selection()
+        if not selection:
+            return
+        self.selected_index = self.top + int(selection[0])
+        if self.selected_index == self._notified_index:
+            return
+        self._notified_index = self.selected_index
+        for callback in self._select_callbacks:
+            callback(event)
+
+    def _move_selection(self, delta: int):
+        if not self.total:
+            return 'break'
+        current = self.selected_index if self.selected_index is not None else self.top - 1
+        self.selected_index = max(0, min(self.total - 1, current + delta))
+        if self.selected_index < self.top:
+            self.top = self.selected_index
+        elif self.selected_index >= self.top + self.visible_rows:
+            self.top = self.selected_index - self.visible_rows + 1
+        self._render()
+        return 'break'
+
 class Badge(tk.Frame):
     def __init__(self, parent, text: str = "", color: str = '#4299e1',
                  size: str = 'medium', **kwargs):
@@ -10,6 +10,7 @@ from typing import List, Dict, Optional
 from ..core.ultimate_engine import UltimatePlagiarismEngine
 from ..core.database import DatabaseManager
 from ..core.analyzer import AdvancedTextAnalyzer
+from .components import VirtualTable
 from ..reports.advanced_report import generate_advanced_report, generate_html_report, generate_json_report
 from ..reports.pdf_report import generate_pdf_report
 from ..utils import ProgressTracker, format_file_size, format_percentage
@@ -20,7 +21,7 @@ class UltimatePlagiarismChecker:
         self.engine = UltimatePlagiarismEngine(config)
         self.analyzer = AdvancedTextAnalyzer(config)
         self.db_manager = DatabaseManager(config)
-        self.database = self.db_manager.get_all_documents()
+        self.engine.attach_database(self.db_manager)
         self.root = None
         self.current_file = None
         self.current_text = None
@@ -231,7 +232,7 @@ class UltimatePlagiarismChecker:
         
         self.stats_labels = {}
         stats = [
-            ("Documents", f"{len(self.database):,}"),
+            ("Documents", f"{self.db_manager.count_documents():,}"),
             ("Checks Today", "0"),
             ("Avg Similarity", "0%"),
             ("High Risk", "0")
@@ -277,7 +278,7 @@ class UltimatePlagiarismChecker:
             ("Total Checks", "0", "#4c51bf"),
             ("Avg Similarity", "0%", "#38a169"),
             ("High Risk", "0", "#e53e3e"),
-            ("Database Size", f"{len(self.database)}", "#d69e2e"),
+            ("Database Size", f"{self.db_manager.count_documents()}", "#d69e2e"),
             ("Files Today", "0", "#3182ce"),
             ("Citations", "0", "#805ad5")
         ]
@@ -457,6 +458,7 @@ class UltimatePlagiarismChecker:
             ('ngram_3', '3-gram Analysis', 'Pattern matching'),
             ('ngram_5', '5-gram Analysis', 'Detailed patterns'),
             ('sequence', 'Sequence Matching', 'Exact phrase detection'),
+            ('winnowing', 'Winnowing Fingerprints', 'Position-aware exact copies'),
             ('semantic', 'Semantic Similarity', 'Meaning-based (ML)'),
             ('lsi', 'LSI Analysis', 'Latent semantic indexing')
         ]
@@ -757,7 +759,8 @@ class UltimatePlagiarismChecker:
             'skip_errors': tk.BooleanVar(value=True),
             'generate_summary': tk.BooleanVar(value=True),
             'save_to_history': tk.BooleanVar(value=True),
-            'use_multithreading': tk.BooleanVar(value=True)
+            'use_multithreading': tk.BooleanVar(value=True),
+            'detect_collusion': tk.BooleanVar(value=False)
         }
         
         for option, var in self.batch_options.items():
@@ -827,25 +830,26 @@ class UltimatePlagiarismChecker:
                  relief='flat', cursor='hand2').pack(side='right')
         tree_frame = tk.Frame(left_panel, bg='white')
         tree_frame.pack(fill='both', expand=True, padx=15, pady=(0, 15))
-        columns = ('ID', 'Source', 'Category', 'Words', 'Added', 'URL')
-        self.db_tree = ttk.Treeview(tree_frame, columns=columns, show='headings', height=20)
-        
-        for col in columns:
-            self.db_tree.heading(col, text=col)
-            self.db_tree.column(col, width=100)
-        
-        self.db_tree.column('ID', width=50)
-        self.db_tree.column('Source', width=200)
-        self.db_tree.column('Category', width=100)
-        self.db_tree.column('Words', width=80)
-        self.db_tree.column('Added', width=120)
-        self.db_tree.column('URL', width=150)
-        
-        self.db_tree.pack(side='left', fill='both', expand=True)
-        
-        tree_scrollbar = tk.Scrollbar(tree_frame, command=self.db_tree.yview)
-        tree_scrollbar.pack(side='right', fill='y')
-        self.db_tree.config(yscrollcommand=tree_scrollbar.set)
+        columns = [
+            {'id': 'id', 'text': 'ID', 'width': 50},
+            {'id': 'source', 'text': 'Source', 'width': 200,
+             'format': lambda doc: doc['source'][:50] + '...' if len(doc['source']) > 50 else doc['source']},
+            {'id': 'category', 'text': 'Category', 'width': 100},
+            {'id': 'word_count', 'text': 'Words', 'width': 80},
+            {'id': 'added_date', 'text': 'Added', 'width': 120,
+             'format': lambda doc: (doc.get('added_date') or 'Unknown')[:10]},
+            {'id': 'url', 'text': 'URL', 'width': 150,
+             'format': lambda doc: doc['url'][:30] + '...' if doc.get('url') and len(doc['url']) > 30 else doc.get('url', '')}
+        ]
+        self.db_table = VirtualTable(
+            tree_frame, columns,
+            fetch=lambda offset, limit, sort, descending, filters: self.db_manager.query_documents(
+                offset, limit, sort, descending, filters.get('category'), filters.get('query')),
+            count=lambda filters: self.db_manager.count_documents_matching(
+                filters.get('category'), filters.get('query')),
+            height=20, bg='white')
+        self.db_table.pack(fill='both', expand=True)
+        self.db_tree = self.db_table.tree
         right_panel = tk.Frame(db_container, bg='white', relief='raised', bd=1)
         db_container.add(right_panel, width=400)
         tk.Label(right_panel, text="Document Details", font=self.fonts['header'],
@@ -897,7 +901,7 @@ class UltimatePlagiarismChecker:
                  bg='#ed8936', fg='white', font=('Segoe UI', 10),
                  relief='flat', cursor='hand2').pack(fill='x', pady=2)
         self.refresh_database_view()
-        self.db_tree.bind('<<TreeviewSelect>>', self.on_document_select)
+        self.db_table.bind_select(self.on_document_select)
     
     def create_history_tab(self):
         tab = ttk.Frame(self.notebook)
@@ -931,25 +935,27 @@ class UltimatePlagiarismChecker:
         tree_frame = tk.Frame(left_panel, bg='white')
         tree_frame.pack(fill='both', expand=True, padx=15, pady=(0, 15))
         
-        columns = ('Date', 'File', 'Score', 'Words', 'Sources', 'Risk', 'Report')
-        self.history_tree = ttk.Treeview(tree_frame, columns=columns, show='headings', height=20)
-        
-        for col in columns:
-            self.history_tree.heading(col, text=col)
-        
-        self.history_tree.column('Date', width=150)
-        self.history_tree.column('File', width=200)
-        self.history_tree.column('Score', width=80)
-        self.history_tree.column('Words', width=80)
-        self.history_tree.column('Sources', width=80)
-        self.history_tree.column('Risk', width=80)
-        self.history_tree.column('Report', width=100)
-        
-        self.history_tree.pack(side='left', fill='both', expand=True)
-        
-        tree_scrollbar = tk.Scrollbar(tree_frame, command=self.history_tree.yview)
-        tree_scrollbar.pack(side='right', fill='y')
-        self.history_tree.config(yscrollcommand=tree_scrollbar.set)
+        columns = [
+            {'id': 'date', 'text': 'Date', 'width': 150,
+             'format': lambda entry: datetime.fromisoformat(entry['date']).strftime('%Y-%m-%d %H:%M')},
+            {'id': 'filename', 'text': 'File', 'width': 200,
+             'format': lambda entry: entry['filename'][:30] + '...' if len(entry['filename']) > 30 else entry['filename']},
+            {'id': 'similarity', 'text': 'Score', 'width': 80, 'format': lambda entry: f"{entry['similarity']}%"},
+            {'id': 'words', 'text': 'Words', 'width': 80},
+            {'id': 'sources', 'text': 'Sources', 'width': 80},
+            {'id': 'risk', 'text': 'Risk', 'width': 80, 'sortable': False,
+             'format': lambda entry: self._get_risk_level(entry['similarity'])},
+            {'id': 'report', 'text': 'Report', 'width': 100, 'sortable': False,
+             'format': lambda entry: "📄" if entry['report'] else "--"}
+        ]
+        self.history_table = VirtualTable(
+            tree_frame, columns,
+            fetch=lambda offset, limit, sort, descending, filters: self.db_manager.query_check_history(
+                offset, limit, sort or 'date', descending, **filters),
+            count=lambda filters: self.db_manager.count_check_history(**filters),
+            sort_key='date', descending=True, height=20, bg='white')
+        self.history_table.pack(fill='both', expand=True)
+        self.history_tree = self.history_table.tree
         self.history_tree.bind('<Double-Button-1>', self.open_history_report)
         right_panel = tk.Frame(history_container, bg='white', relief='raised', bd=1)
         history_container.add(right_panel, width=400)
@@ -1017,7 +1023,7 @@ class UltimatePlagiarismChecker:
                  bg='#e53e3e', fg='white', font=('Segoe UI', 10),
                  relief='flat', cursor='hand2').pack(fill='x', pady=2)
         self.refresh_history()
-        self.history_tree.bind('<<TreeviewSelect>>', self.on_history_select)
+        self.history_table.bind_select(self.on_history_select)
     
     def create_analytics_tab(self):
         tab = ttk.Frame(self.notebook)
@@ -1066,7 +1072,7 @@ class UltimatePlagiarismChecker:
         self.status_label.pack(side='left', padx=10)
         sysinfo_frame = tk.Frame(self.status_bar, bg='#2d3748')
         sysinfo_frame.pack(side='right', padx=10)
-        self.db_label = tk.Label(sysinfo_frame, text=f"DB: {len(self.database)} docs", 
+        self.db_label = tk.Label(sysinfo_frame, text=f"DB: {self.db_manager.count_documents()} docs", 
                                 font=self.fonts['small'], bg='#2d3748', fg='#a0aec0')
         self.db_label.pack(side='right', padx=5)
         self.memory_label = tk.Label(sysinfo_frame, text="Memory: --", 
@@ -1197,8 +1203,9 @@ class UltimatePlagiarismChecker:
                                          self.analysis_vars['paraphrasing'].get()])
             results = self.engine.analyze_comprehensive(
                 self.current_text, 
-                self.database,
-                self.selected_algorithms
+                None,
+                self.selected_algorithms,
+                candidate_index=self.db_manager
             )
             self.results = results
             self.root.after(0, self.display_ultimate_results)
@@ -1235,7 +1242,14 @@ class UltimatePlagiarismChecker:
         self.update_statistics_tabs()
         self.update_details_tabs()
         self.analyze_button.config(state='normal', text="🚀 Run Ultimate Analysis")
-        self.status_label.config(text=f"Analysis complete - {score}% similarity | {len(self.results['matches'])} sources matched")
+        status = f"Analysis complete - {score}% similarity | {len(self.results['matches'])} sources matched"
+        retrieval = self.results.get('metadata', {}).get('candidate_retrieval')
+        if retrieval:
+            status += f" | {retrieval['candidates_selected']}/{retrieval['corpus_size']} candidates"
+            if 'shingle_recall' in retrieval:
+                status += f", recall {retrieval['shingle_recall']}%"
+            status += f", {retrieval['retrieval_ms']} ms"
+        self.status_label.config(text=status)
         self.notebook.select(1)
     
     def update_matches_tree(self):
@@ -1326,8 +1340,17 @@ Algorithms Used: {', '.join(self.results.get('metadata', {}).get('algorithms_use
 
 Performance Summary:
 """
+            if self.results.get('metadata', {}).get('near_duplicates', {}).get('short_circuit'):
+                algo_stats += (f"  Near-duplicate shortcut: scored against "
+                               f"{self.results['metadata']['documents_scored']} near-duplicate document(s) only\n")
+            if self.results.get('metadata', {}).get('model_fallbacks'):
+                algo_stats += (f"  Model index not built yet, scored per check: "
+                               f"{', '.join(self.results['metadata']['model_fallbacks'])}\n")
             for algo, perf in self.results['algorithm_scores'].items():
-                algo_stats += f"  {algo.upper()}: {perf.get('average', 0):.2f}% (avg), {perf.get('max', 0):.2f}% (max), {perf.get('min', 0):.2f}% (min)\n"
+                algo_stats += f"  {algo.upper()}: {perf.get('average', 0):.2f}% (avg), {perf.get('max', 0):.2f}% (max), {perf.get('min', 0):.2f}% (min)"
+                if 'cache_hit_ratio' in perf:
+                    algo_stats += f", {perf['cache_hit_ratio']:.0f}% cached"
+                algo_stats += "\n"
             
             self.algorithm_text.insert(1.0, algo_stats)
             self.algorithm_text.config(state='disabled')
@@ -1580,39 +1603,21 @@ Top Key Phrases:
         self.status_label.config(text="Thorough preset applied")
         
     def refresh_database_view(self):
-        self.db_tree.delete(*self.db_tree.get_children())
-        self.database = self.db_manager.get_all_documents()
-        
-        for idx, doc in enumerate(self.database, 1):
-            word_count = len(self.engine.tokenize(doc['text']))
-            added_date = datetime.fromisoformat(doc['added_date']).strftime('%Y-%m-%d') if doc['added_date'] else 'Unknown'
-            
-            values = (
-                idx,
-                doc['source'][:50] + '...' if len(doc['source']) > 50 else doc['source'],
-                doc.get('category', 'General'),
-                word_count,
-                added_date,
-                doc.get('url', '')[:30] + '...' if doc.get('url') and len(doc['url']) > 30 else doc.get('url', '')
-            )
-            self.db_tree.insert('', 'end', values=values, iid=str(idx))
-        
-        self.db_label.config(text=f"DB: {len(self.database)} docs")
-        self.status_label.config(text=f"Database loaded: {len(self.database)} documents")
+        self.db_table.set_filters()
+        total = self.db_table.total
+        self.db_label.config(text=f"DB: {total} docs")
+        self.status_label.config(text=f"Database loaded: {total} documents")
     
     def on_document_select(self, event):
-        selected = self.db_tree.selection()
-        if not selected:
-            return
-        
-        idx = int(selected[0]) - 1
-        if 0 <= idx < len(self.database):
-            doc = self.database[idx]
+        doc = self.db_table.selected_row()
+        if doc is not None:
+            if 'text' not in doc:
+                doc['text'] = self.db_manager.get_document_text(doc['id']) or ''
             
             self.doc_details['Source'].config(text=doc['source'])
             self.doc_details['Category'].config(text=doc.get('category', 'General'))
             self.doc_details['URL'].config(text=doc.get('url', 'None'))
-            self.doc_details['Words'].config(text=str(len(self.engine.tokenize(doc['text']))))
+            self.doc_details['Words'].config(text=str(doc.get('word_count', 0)))
             self.doc_details['Added'].config(text=doc.get('added_date', 'Unknown'))
             self.doc_details['Content'].config(state='normal')
             self.doc_details['Content'].delete(1.0, tk.END)
@@ -1694,13 +1699,12 @@ Top Key Phrases:
         messagebox.showinfo("Info", "Edit feature coming soon!")
     
     def delete_from_database(self):
-        selected = self.db_tree.selection()
-        if not selected:
+        doc = self.db_table.selected_row()
+        if doc is None:
             messagebox.showwarning("Warning", "Please select a document to delete")
             return
         
-        item = self.db_tree.item(selected[0])
-        source = item['values'][1] 
+        source = doc['source']
         
         if messagebox.askyesno("Confirm", f"Delete '{source}' from database?"):
             if self.db_manager.delete_document(source):
@@ -1715,57 +1719,34 @@ Top Key Phrases:
             self.refresh_database_view()
             return
         
-        results = self.db_manager.search_documents(query)
-        self.db_tree.delete(*self.db_tree.get_children())
-        
-        for idx, doc in enumerate(results, 1):
-            word_count = len(self.engine.tokenize(doc['text']))
-            values = (
-                idx,
-                doc['source'][:50] + '...' if len(doc['source']) > 50 else doc['source'],
-                doc.get('category', 'General'),
-                word_count,
-                doc.get('added_date', 'Unknown'),
-                doc.get('url', '')[:30] + '...' if doc.get('url') and len(doc.get('url')) > 30 else doc.get('url', '')
-            )
-            self.db_tree.insert('', 'end', values=values)
-        
-        self.status_label.config(text=f"Found {len(results)} documents matching '{query}'")
+        self.db_table.set_filters(query=query)
+        total = self.db_table.total
+        self.status_label.config(text=f"Found {total} documents matching '{query}'")
     
     def import_documents(self):
-        filepath = filedialog.askopenfilename(
+        filepaths = filedialog.askopenfilenames(
             title="Import Documents",
-            filetypes=[("JSON Files", "*.json"), ("Text Files", "*.txt"), ("All Files", "*.*")]
+            filetypes=[("Document Lists", "*.json *.jsonl"), ("Zip Archives", "*.zip"),
+                       ("Documents", "*.txt *.pdf *.docx *.md *.html *.htm *.tex *.rtf"), ("All Files", "*.*")]
         )
         
-        if filepath:
-            try:
-                with open(filepath, 'r', encoding='utf-8') as f:
-                    if filepath.endswith('.json'):
-                        data = json.load(f)
-                        if isinstance(data, list):
-                            count = 0
-                            for doc in data:
-                                if self.db_manager.add_document(
-                                    doc.get('source', 'Imported'),
-                                    doc.get('text', ''),
-                                    doc.get('url', ''),
-                                    doc.get('category', 'General')
-                                ):
-                                    count += 1
-                            messagebox.showinfo("Success", f"Imported {count} documents from JSON")
-                        else:
-                            messagebox.showerror("Error", "Invalid JSON format")
-                    else:
-                        text = f.read()
-                        source = Path(filepath).name
-                        if self.db_manager.add_document(source, text, '', 'General'):
-                            messagebox.showinfo("Success", "Document imported successfully")
-                
-                self.refresh_database_view()
-                
-            except Exception as e:
-                messagebox.showerror("Error", f"Failed to import: {str(e)}")
+        if filepaths:
+            threading.Thread(target=self._import_documents_thread, args=(list(filepaths),), daemon=True).start()
+    
+    def _import_documents_thread(self, filepaths: List[str]):
+        from ..core.ingest import BulkImporter
+        try:
+            importer = BulkImporter(self.config, self.db_manager)
+            summary = importer.run(filepaths)
+        except Exception as e:
+            self.root.after(0, lambda: messagebox.showerror("Error", f"Failed to import: {str(e)}"))
+            return
+        
+        message = (f"Imported {summary['added']} documents "
+                   f"({summary['docs_per_second']} docs/sec)\n"
+                   f"Skipped: {summary['skipped']}  Failed: {summary['failed']}")
+        self.root.after(0, self.refresh_database_view)
+        self.root.after(0, lambda: messagebox.showinfo("Import Complete", message))
     
     def export_database(self):
         filepath = filedialog.asksaveasfilename(
@@ -1778,7 +1759,7 @@ Top Key Phrases:
             try:
                 if filepath.endswith('.json'):
                     data = []
-                    for doc in self.database:
+                    for doc in self.db_manager.iter_documents():
                         data.append({
                             'source': doc['source'],
                             'url': doc.get('url', ''),
@@ -1792,7 +1773,7 @@ Top Key Phrases:
                 
                 elif filepath.endswith('.txt'):
                     with open(filepath, 'w', encoding='utf-8') as f:
-                        for doc in self.database:
+                        for doc in self.db_manager.iter_documents():
                             f.write(f"Source: {doc['source']}\n")
                             f.write(f"Category: {doc.get('category', 'General')}\n")
                             f.write(f"URL: {doc.get('url', '')}\n")
@@ -1840,83 +1821,40 @@ Categories:
             messagebox.showerror("Error", "Failed to create database backup")
     
     def refresh_history(self):
-        self.history_tree.delete(*self.history_tree.get_children())
-        history = self.db_manager.get_check_history(limit=100)
-        
-        for idx, entry in enumerate(history, 1):
-            date_str = datetime.fromisoformat(entry['date']).strftime('%Y-%m-%d %H:%M')
-            risk = self._get_risk_level(entry['similarity'])
-            
-            values = (
-                date_str,
-                entry['filename'][:30] + '...' if len(entry['filename']) > 30 else entry['filename'],
-                f"{entry['similarity']}%",
-                entry['words'],
-                entry['sources'],
-                risk,
-                "📄" if entry['report'] else "--"
-            )
-            self.history_tree.insert('', 'end', values=values, iid=str(idx))
+        self.history_table.refresh()
     
     def filter_history(self):
         filter_type = self.filter_var.get()
         
         if filter_type == "All":
-            self.refresh_history()
+            self.history_table.set_filters()
         elif filter_type == "Today":
-            today = datetime.now().strftime('%Y-%m-%d')
-            history = self.db_manager.get_check_history(start_date=today)
-            self._update_history_tree(history)
+            self.history_table.set_filters(start_date=datetime.now().strftime('%Y-%m-%d'))
         elif filter_type == "High Risk":
-            history = self.db_manager.get_check_history(limit=200)
-            high_risk = [h for h in history if h['similarity'] >= 30]
-            self._update_history_tree(high_risk)
-    
-    def _update_history_tree(self, history):
-        self.history_tree.delete(*self.history_tree.get_children())
-        
-        for idx, entry in enumerate(history, 1):
-            date_str = datetime.fromisoformat(entry['date']).strftime('%Y-%m-%d %H:%M')
-            risk = self._get_risk_level(entry['similarity'])
-            
-            values = (
-                date_str,
-                entry['filename'][:30] + '...' if len(entry['filename']) > 30 else entry['filename'],
-                f"{entry['similarity']}%",
-                entry['words'],
-                entry['sources'],
-                risk,
-                "📄" if entry['report'] else "--"
-            )
-            self.history_tree.insert('', 'end', values=values, iid=str(idx))
+            self.history_table.set_filters(min_similarity=30)
     
     def on_history_select(self, event):
-        selected = self.history_tree.selection()
-        if not selected:
+        entry = self.history_table.selected_row()
+        if entry is None:
             return
-        item = self.history_tree.item(selected[0])
-        values = item['values']
-        self.history_details['Date'].config(text=values[0])
-        self.history_details['File'].config(text=values[1])
-        self.history_details['Score'].config(text=values[2])
-        self.history_details['Words'].config(text=values[3])
-        self.history_details['Sources'].config(text=values[4])
-        self.history_details['Risk'].config(text=values[5])
-        self.history_details['Algorithms'].config(text="Multiple")
+        self.history_details['Date'].config(text=datetime.fromisoformat(entry['date']).strftime('%Y-%m-%d %H:%M'))
+        self.history_details['File'].config(text=entry['filename'])
+        self.history_details['Score'].config(text=f"{entry['similarity']}%")
+        self.history_details['Words'].config(text=entry['words'])
+        self.history_details['Sources'].config(text=entry['sources'])
+        self.history_details['Risk'].config(text=self._get_risk_level(entry['similarity']))
+        self.history_details['Algorithms'].config(text=', '.join(entry['algorithms']) or "Multiple")
     
     def open_history_report(self, event):
-        selected = self.history_tree.selection()
-        if not selected:
+        entry = self.history_table.selected_row()
+        if entry is None:
             return
         
-        item = self.history_tree.item(selected[0])
-        report_path = item['values'][6]
-        if report_path and report_path != "--":
-            try:
-                if report_path.startswith("📄"):
-                    report_path = report_path[1:]
-                webbrowser.open(f"file://{os.path.abspath(report_path)}")
-            except:
+        report_path = entry['report']
+        if report_path:
+            if Path(report_path).exists():
+                webbrowser.open(Path(report_path).resolve().as_uri())
+            else:
                 messagebox.showinfo("Info", "Report file not found")
     
     def show_history_analytics(self):
@@ -2038,54 +1976,97 @@ Daily Activity (Last 30 days):
             return
         output_dir = Path(self.output_dir_var.get())
         output_dir.mkdir(parents=True, exist_ok=True)
+        job_id = self._find_resumable_batch_job(files, output_dir)
         self.batch_processing = True
-        thread = threading.Thread(target=self._batch_process_thread, args=(files, output_dir))
+        thread = threading.Thread(target=self._batch_process_thread, args=(files, output_dir, job_id))
         thread.daemon = True
         thread.start()
     
-    def _batch_process_thread(self, files, output_dir):
+    def _find_resumable_batch_job(self, files, output_dir):
+        files = [str(filepath) for filepath in files]
+        for job in self.db_manager.list_batch_jobs(['pending', 'running', 'paused', 'stopped', 'incomplete']):
+            if job['output_dir'] != str(output_dir):
+                continue
+            if [entry['filepath'] for entry in self.db_manager.get_batch_files(job['id'])] != files:
+                continue
+            completed = job['counts'].get('done', 0)
+            if messagebox.askyesno("Resume Batch",
+                                   f"An unfinished batch job for these files was found "
+                                   f"({completed}/{job['total']} completed).\n\nResume it?"):
+                return job['id']
+            return None
+        return None
+    
+    def _batch_process_thread(self, files, output_dir, job_id=None):
+        from ..core.batch import BatchPipeline
         total = len(files)
         self.batch_progress['maximum'] = total
-        
-        successful = 0
-        failed = 0
-        
-        for idx, filepath in enumerate(files, 1):
-            if not self.batch_processing:
-                break
+        report_format = self.report_format_var.get()
+        save_to_history = self.batch_options['save_to_history'].get()
+        
+        def write_reports(filepath, results):
+            filename = Path(filepath).stem
+            report_filename = f"batch_report_{filename}_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
+            report_path = None
+            if report_format == 'txt' or report_format == 'all':
+                report_path = output_dir / f"{report_filename}.txt"
+                report = generate_advanced_report(results, Path(filepath).name, self.selected_algorithms)
+                report_path.write_text(report, encoding='utf-8')
             
-            self.root.after(0, lambda i=idx: self.progress_label.config(text=f"Processing {i}/{total}..."))
-            try:
-                text = self.engine.extract_text(filepath)
-                results = self.engine.analyze_comprehensive(text, self.database, self.selected_algorithms)
-                filename = Path(filepath).stem
-                report_filename = f"batch_report_{filename}_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
-                report_format = self.report_format_var.get()
-                if report_format == 'txt' or report_format == 'all':
-                    report_path = output_dir / f"{report_filename}.txt"
-                    report = generate_advanced_report(results, Path(filepath).name, self.selected_algorithms)
-                    report_path.write_text(report, encoding='utf-8')
-                
-                if report_format == 'html' or report_format == 'all':
-                    report_path = output_dir / f"{report_filename}.html"
-                    report = generate_html_report(results, Path(filepath).name, self.selected_algorithms)
-                    report_path.write_text(report, encoding='utf-8')
-                if self.batch_options['save_to_history'].get():
-                    self.db_manager.save_check_history(Path(filepath).name, results, str(report_path))
-                
-                successful += 1
-            except:
-                failed += 1
-                print(f"Error processing {filepath}: {e}")
-            self.root.after(0, lambda v=idx: self.batch_progress.config(value=v))
+            if report_format == 'html' or report_format == 'all':
+                report_path = output_dir / f"{report_filename}.html"
+                report = generate_html_report(results, Path(filepath).name, self.selected_algorithms)
+                report_path.write_text(report, encoding='utf-8')
+            if save_to_history:
+                self.db_manager.save_check_history(Path(filepath).name, results,
+                                                   str(report_path) if report_path else None)
+            return report_path
+        
+        def show_progress(done, filepath, error):
+            if error:
+                print(f"Error processing {filepath}: {error}")
+            done += self.batch_pipeline.skipped
+            self.root.after(0, lambda: self.progress_label.config(text=f"Processed {done}/{total}..."))
+            self.root.after(0, lambda: self.batch_progress.config(value=done))
+        
+        self.batch_pipeline = BatchPipeline(self.config, self.selected_algorithms, journal=self.db_manager)
+        if job_id is None:
+            job_id = self.batch_pipeline.create_job(files, output_dir, {'algorithms': self.selected_algorithms,
+                                                                        'report_format': report_format})
+        summary = self.batch_pipeline.run_job(job_id, write_reports, show_progress)
+        if self.batch_options['detect_collusion'].get() and not summary['stopped']:
+            self.root.after(0, lambda: self.progress_label.config(text="Comparing submissions for collusion..."))
+            summary['collusion_report'] = self._run_collusion_check(files, output_dir)
+        self.batch_processing = False
+        successful, failed = summary['successful'], summary['failed']
         self.root.after(0, lambda: self.progress_label.config(text=f"Complete! Processed {successful} files, {failed} failed"))
-        self.root.after(0, lambda: self.batch_processing_message(successful, failed, output_dir))
-    
-    def batch_processing_message(self, successful, failed, output_dir):
+        self.root.after(0, lambda: self.batch_processing_message(successful, failed, output_dir, summary))
+    
+    def _run_collusion_check(self, files, output_dir):
+        from ..core.collusion import CollusionDetector, format_collusion_report
+        detector = CollusionDetector(self.config)
+        detector.add_files(files, self.engine.extract_text,
+                           lambda filepath, e: print(f"Error reading {filepath} for collusion check: {e}"))
+        report = detector.detect()
+        report_name = f"collusion_report_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
+        (output_dir / f"{report_name}.json").write_text(json.dumps(report, indent=2), encoding='utf-8')
+        report_path = output_dir / f"{report_name}.txt"
+        report_path.write_text(format_collusion_report(report), encoding='utf-8')
+        return {'path': str(report_path), 'pairs': len(report['pairs']), 'clusters': len(report['clusters']),
+                'skipped_buckets': report['stats']['skipped_buckets'],
+                'skipped_submissions': report['stats']['skipped_submissions']}
+    
+    def batch_processing_message(self, successful, failed, output_dir, summary=None):
+        timings = (summary or {}).get('timings', {})
         message = f"""Batch Processing Complete!
 
 Processed: {successful} files successfully
 Failed: {failed} files
+Skipped (already completed): {(summary or {}).get('skipped', 0)} files
+
+Stage timings: extract {timings.get('extract_s', 0)}s, analyze {timings.get('analyze_s', 0)}s, report {timings.get('report_s', 0)}s
+Wall time: {timings.get('wall_s', 0)}s ({(summary or {}).get('files_per_second', 0)} files/s)
+{self._collusion_summary(summary)}
 
 Reports saved to: {output_dir.absolute()}
 
@@ -2095,12 +2076,32 @@ Would you like to open the output directory?"""
             import os
             os.startfile(str(output_dir.absolute())) if os.name == 'nt' else os.system(f'open "{output_dir.absolute()}"')
 
+    def _collusion_summary(self, summary):
+        collusion = (summary or {}).get('collusion_report')
+        if not collusion:
+            return ''
+        message = (f"\nCollusion check: {collusion['pairs']} suspicious pairs in "
+                   f"{collusion['clusters']} clusters ({Path(collusion['path']).name})")
+        if collusion.get('skipped_buckets'):
+            message += (f"\nWarning: {collusion['skipped_buckets']} oversized buckets skipped, "
+                        f"{collusion['skipped_submissions']} submissions not fully compared")
+        return message
+    
     def pause_batch(self):
-        self.batch_processing = False
-        self.progress_label.config(text="Paused")
+        pipeline = getattr(self, 'batch_pipeline', None)
+        if pipeline is None or not self.batch_processing:
+            return
+        if pipeline.paused:
+            pipeline.resume()
+            self.progress_label.config(text="Resumed")
+        else:
+            pipeline.pause()
+            self.progress_label.config(text="Paused - press Pause again to resume")
     
     def stop_batch(self):
         self.batch_processing = False
+        if getattr(self, 'batch_pipeline', None):
+            self.batch_pipeline.stop()
         self.progress_label.config(text="Stopped")
         self.batch_progress.config(value=0)
         
@@ -2261,7 +2262,8 @@ ALGORITHM SCORES:
             
             details += f"\nMATCHED SEQUENCES ({len(match.get('matched_sequences', []))}):\n"
             for seq in match.get('matched_sequences', [])[:5]:
-                details += f"\n• {seq['text']}\n  ({seq['length']} words, position: {seq.get('position', 0)})\n"
+                details += (f"\n• {seq['text']}\n  ({seq['length']} words, position: {seq.get('position_a', 0)}, "
+                            f"chars {seq.get('start_char', 0)}-{seq.get('end_char', 0)})\n")
             
             text_widget.insert(1.0, details)
             text_widget.config(state='disabled')
@@ -2361,12 +2363,17 @@ For more help, see the full documentation."""
    - Best for direct copying detection
    - Configurable minimum length
 
-8. SEMANTIC SIMILARITY (ML):
+8. WINNOWING FINGERPRINTS:
+   - Selects k-gram hashes with a sliding window (MOSS-style)
+   - Reports copied passages with exact offsets
+   - Scales to very large reference databases
+
+9. SEMANTIC SIMILARITY (ML):
    - Uses machine learning for meaning comparison
    - Detects paraphrased content
    - Requires additional dependencies
 
-9. LSI ANALYSIS:
+10. LSI ANALYSIS:
    - Latent Semantic Indexing
    - Finds hidden semantic relationships
    - Advanced NLP technique
@@ -2393,7 +2400,7 @@ System:
   Processor: {platform.processor()}
 
 Resources:
-  Database: {len(self.database)} documents
+  Database: {self.db_manager.count_documents()} documents
   History: {self.db_manager.get_check_history(limit=1)[0]['total'] if self.db_manager.get_check_history(limit=1) else 0} checks
   Memory: -- (updates every 10s)
 